@@ -7,6 +7,8 @@ from bs4 import BeautifulSoup
 from langchain_ollama import ChatOllama
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
+import django_path  # noqa: F401  (3.Django의 chatbot.llm.route_type 사용)
+from chatbot.llm.route_type import classify_route
 from pathlib import Path
 from functools import lru_cache
 from langchain_chroma import Chroma
@@ -297,31 +299,8 @@ class FlightAgent:
         # [수정] 리스트가 아닌 '단일 코드'가 들어가도록 우선순위 조정
         dep = scraped_dep if scraped_dep else (self.current_info.get("departure")[0] if self.current_info.get("departure") else "N/A")
         dest = scraped_arr if scraped_arr else (self.current_info.get("destination")[0] if self.current_info.get("destination") else "N/A")
-        f_no = self.current_info.get("flight_no", "N/A")
-        
-        prompt = ChatPromptTemplate.from_template("""
-        System: 당신은 항공 노선 판별기입니다. 입력된 공항 코드를 보고 '국내' 혹은 '국제' 노선인지 판별하세요.
-        
-        [데이터 정보]
-        - 출발 공항: {dep}
-        - 도착 공항: {dest}
-        - 편명: {f_no}
-
-        [판단 규칙]
-        1. 출발지와 도착지의 국가가 다르면 무조건 '국제'입니다. (예: ICN-CTS, ICN-NRT는 국제선)
-        2. 같은 국가 내 공항 이동(예: GMP-CJU)인 경우만 '국내'입니다.
-        
-        [출력 규칙]
-        1. 다른 설명 없이 오직 {{"type": "국내"}} 또는 {{"type": "국제"}} 형식의 JSON만 출력하세요.
-        2. 한글(Korean)만 사용하며, 한자나 영어는 절대 섞지 마세요.
-        """)
-        
-        chain = prompt | self.llm | self.parser
-        try:
-            res = chain.invoke({"dep": dep, "dest": dest, "f_no": f_no})
-            return res.get("type", "정보 없음")
-        except:
-            return "정보 없음"
+        # 공항→국가 표로 즉시 판별 (예전엔 여기서 LLM을 한 번 더 호출했음)
+        return classify_route(dep, dest)
         
 # # ==========================================================
 # # [구간 6] 메인 루프 및 인터페이스
@@ -0,0 +1,10 @@
+import sys
+from pathlib import Path
+
+# 3.Django 안의 Django 의존성 없는 모듈(chatbot.llm.entities, dashboard.airports 등)을 복사본 없이 그대로 import 하기 위한 경로 설정
+#  - import django_path 한 줄이면 3.Django가 sys.path 맨 앞에 들어감
+#  - 맨 앞이어야 2.RAG/chatbot.py 대신 3.Django/chatbot 패키지가 잡힘
+DJANGO_DIR = Path(__file__).resolve().parent.parent / "3.Django"
+
+if str(DJANGO_DIR) not in sys.path:
+    sys.path.insert(0, str(DJANGO_DIR))
@@ -10,7 +10,6 @@ import logging
 
 # 데이터 처리 및 로드
 import pandas as pd
-import joblib
 import requests
 from dotenv import load_dotenv
 
@@ -27,6 +26,21 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_chroma import Chroma
 from sentence_transformers import SentenceTransformer
 
+# 3.Django의 공용 모듈(chatbot.llm.*, dashboard.*)을 복사본 없이 import
+import django_path  # noqa: F401
+# 프롬프트용 문서 토큰 예산 조립
+from chatbot.llm.context_budget import assemble_context
+# 항공사/편명/공항 규칙 기반 추출 (LLM 호출 전 빠른 경로)
+from chatbot.llm.entities import extract_flight_query
+# 공항→국가 표 기반 국내/국제선 판별
+from chatbot.llm.route_type import classify_route
+# 지연 예측 모델 로더
+from dashboard.model_registry import ModelRegistry
+# 국내 공항 코드/한글명/격자 표
+from dashboard import airports
+# 단기예보 시계열 numpy 배열 + searchsorted 조회
+from dashboard.forecast_series import ForecastSeries
+
 import warnings
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 warnings.filterwarnings("ignore", message=".*X does not have valid feature names.*")
@@ -59,22 +73,19 @@ CHROMA_DIR = BASE_DIR / "chroma_db"                   # chatbot/chroma_db
 # 한국 시간
 KST = timezone(timedelta(hours=9))
 
-# 모델 경로
-CLASSIFIER_PATH = "모델_이진분류.joblib"
-REGRESSOR_PATH  = "모델_회기분석.joblib"   # ✅ 추가
-
-clf = joblib.load(CLASSIFIER_PATH)
-print("✅ 이진분류 모델 로드 완료")
+# 모델 경로 (실행 위치와 상관없이 이 파일 옆의 joblib)
+MODEL_DIR = Path(__file__).resolve().parent
+CLASSIFIER_PATH = MODEL_DIR / "모델_이진분류.joblib"
+REGRESSOR_PATH  = MODEL_DIR / "모델_회기분석.joblib"
+FAST_MODEL_PATH = MODEL_DIR / "delay_models.npz"      # fast 경로 캐시 (첫 로드 때 joblib에서 만듦, 해시가 이름에 붙음)
 
-reg = joblib.load(REGRESSOR_PATH)          # ✅ 이 줄이 빠졌던 것
-print("✅ 회귀 모델 로드 완료")
+# import 시점이 아니라 첫 예측 때 로드 (파일이 바뀌면 재시작 없이 교체)
+model_registry = ModelRegistry(CLASSIFIER_PATH, REGRESSOR_PATH, fast_path=FAST_MODEL_PATH)
 
 # 기상청 API
 BASE_URL = "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0"
 VILAGE_BASE_TIMES = ["0200","0500","0800","1100","1400","1700","2000","2300"]
 
-# 공항 격자 CSV (공항, nx, ny)
-AIRPORT_MAP_CSV = "airport_nxny_map.csv"
 
 def load_service_key():
     load_dotenv()
@@ -99,32 +110,19 @@ def pick_latest_vilage_base(now_kst=None):
     return ymd_yesterday, "2300"
 
 # [수정] IATA 코드와 기상청 격자 데이터용 한글 공항명 매핑
-IATA_TO_KOR = {
-    "ICN": "인천", "GMP": "김포", "CJU": "제주", "PUS": "김해",
-    "CJJ": "청주", "TAE": "대구", "KWJ": "광주", "RSU": "여수",
-    "USN": "울산", "KPO": "포항경주", "HIN": "사천", "KUV": "군산",
-    "WJU": "원주", "MWX": "무안", "YNY": "양양"
-}
-
 def get_nxny(airport_name):
-    
-    kor_name = IATA_TO_KOR.get(airport_name.upper(), airport_name)
-
-    df = pd.read_csv(AIRPORT_MAP_CSV)
-    row = df[df["공항"] == kor_name]
-    if row.empty:
-        raise ValueError(f"공항 '{kor_name}' 없음")
-    return int(row.iloc[0]["nx"]), int(row.iloc[0]["ny"])
-
-def get_weather(departure_airport, dep_dt):
-    service_key = load_service_key()
-    nx, ny = get_nxny(departure_airport)
-
-    now_kst = datetime.now(KST)
-    base_date, base_time = pick_latest_vilage_base(now_kst)
-
+    # IATA / 한글명 모두 가능 (3.Django/dashboard/data/airports.csv를 한 번만 읽어 둔 dict에서 조회)
+    nxny = airports.get_nxny(airport_name)
+    if nxny is None:
+        raise ValueError(f"공항 '{airport_name}' 없음")
+    return nxny
+
+@lru_cache(maxsize=64)
+def fetch_vilage_series(nx, ny, base_date, base_time):
+    # 단기예보는 발표시각(하루 8번)마다만 바뀌므로 (격자, 발표시각)별로 한 번만 API 호출하고
+    # TMP/WSD를 시간순 numpy 배열로 바꿔 둠
     params = {
-        "serviceKey": service_key,
+        "serviceKey": load_service_key(),
         "numOfRows": 500,
         "pageNo": 1,
         "dataType": "JSON",
@@ -136,29 +134,20 @@ def get_weather(departure_airport, dep_dt):
 
     r = requests.get(f"{BASE_URL}/getVilageFcst", params=params, timeout=20)
     r.raise_for_status()
-
     items = r.json()["response"]["body"]["items"]["item"]
-    df = pd.DataFrame(items)
+    return ForecastSeries.from_items(items, base=base_date + base_time)
 
-    df = df[df["category"].isin(["TMP", "WSD"])].copy()
-    df["fcst_datetime"] = pd.to_datetime(
-        df["fcstDate"] + df["fcstTime"],
-        format="%Y%m%d%H%M"
-    )
-
-    before = df[df["fcst_datetime"] <= dep_dt]
-    if before.empty:
-        return None
+def get_weather_many(departure_airport, dep_dts):
+    # 같은 공항 출발 시각 여러 개를 한 번에 (출발 시각 이전의 가장 최근 예보, 없으면 None)
+    nx, ny = get_nxny(departure_airport)
 
-    latest = before.sort_values("fcst_datetime").iloc[-1]
+    now_kst = datetime.now(KST)
+    base_date, base_time = pick_latest_vilage_base(now_kst)
 
-    temp = df[(df["category"]=="TMP") & (df["fcst_datetime"]==latest["fcst_datetime"])]["fcstValue"].values
-    wind = df[(df["category"]=="WSD") & (df["fcst_datetime"]==latest["fcst_datetime"])]["fcstValue"].values
+    return fetch_vilage_series(nx, ny, base_date, base_time).at_many(dep_dts)
 
-    return {
-        "기온(°C)": float(temp[0]) if len(temp)>0 else None,
-        "풍속_ms": float(wind[0]) if len(wind)>0 else None,
-    }
+def get_weather(departure_airport, dep_dt):
+    return get_weather_many(departure_airport, [dep_dt])[0]
 
 def predict_delay_binary(
     airline: str,
@@ -194,13 +183,14 @@ def predict_delay_binary(
         "arrival_code": arrival_code,
         "flight_type": flight_type,
     }])
-    X = X[clf.feature_name_] # clf와 reg의 feature_name_은 같아야 함
 
     for c in ["항공사","출발지","arrival_code","flight_type"]:
         X[c] = X[c].astype("category")
 
     # 4️⃣ 이진분류 (지연 여부)
-    prob = float(clf.predict_proba(X)[:,1][0])
+    models = model_registry.get()
+    clf, reg = models.pick(len(X))    # 한 편씩이라 fast 캐시가 있으면 numpy 버전으로
+    prob = float(clf.predict_proba(X[list(models.clf_features)])[:,1][0])
     is_delay = int(prob >= threshold)
 
     result = {
@@ -212,7 +202,7 @@ def predict_delay_binary(
 
     # 5️⃣ ✅ 지연일 때만 회귀 실행
     if is_delay == 1:
-        delay_minutes = float(reg.predict(X)[0])
+        delay_minutes = float(reg.predict(X[list(models.reg_features)])[0])
 
         # 음수 방지 (회귀 모델에서 가끔 발생)
         delay_minutes = max(0.0, delay_minutes)
@@ -258,6 +248,12 @@ class FlightAgent:
         tomorrow_str = (now_dt + timedelta(days=1)).strftime("%Y%m%d")
         self.current_info["flight_no"] = "N/A"
 
+        # 편명/노선이 분명한 입력은 사전 매칭(수십 µs)으로 끝내고, 애매할 때만 LLM 호출
+        fast = extract_flight_query(user_text, now_dt)
+        if fast.pop("confident"):
+            self._apply_analysis(fast)
+            return
+
         prompt = ChatPromptTemplate.from_template("""
         당신은 항공 노선 분석 전문가입니다. 오늘 날짜는 {today}입니다.
         사용자의 입력이 **이전 대화와 이어지는 추가 질문**인지, 아니면 **새로운 여정 검색**인지 판단하세요.
@@ -287,28 +283,30 @@ class FlightAgent:
         chain = prompt | self.llm | self.parser
         try:
             res = chain.invoke({"user_text": user_text, "today": today_str, "tomorrow": tomorrow_str, "current_info": self.current_info})
-            if res.get("is_new_search", True):
-                self.reset_current_info()
-            # 출발지 미지정 시 국내 주요 공항(ICN, GMP 등)으로 자동 보완
-            if not res.get("departure") or len(res["departure"]) == 0:
-                self.current_info["departure"] = ["ICN", "GMP", "PUS", "CJU"]
-            else:
-                self.current_info["departure"] = res["departure"]
-
-            if res.get("flight_no") and res.get("flight_no") != "N/A":
-                self.current_info["flight_no"] = str(res["flight_no"]).upper().replace(" ", "")
-            if res.get("date") and res.get("date") != "N/A":
-                self.current_info["date"] = str(res["date"])
-            if res.get("destination"):
-                self.current_info["destination"] = res["destination"]
-            if res.get("airline_code"): 
-                self.current_info["airline_code"] = res["airline_code"].upper()
-            if res.get("airline_name"): 
-                self.current_info["airline_name"] = res["airline_name"]
-
+            self._apply_analysis(res)
         except Exception as e:
             print(f"⚠️ 분석 오류: {e}")
 
+    def _apply_analysis(self, res):
+        if res.get("is_new_search", True):
+            self.reset_current_info()
+        # 출발지 미지정 시 국내 주요 공항(ICN, GMP 등)으로 자동 보완
+        if not res.get("departure") or len(res["departure"]) == 0:
+            self.current_info["departure"] = ["ICN", "GMP", "PUS", "CJU"]
+        else:
+            self.current_info["departure"] = res["departure"]
+
+        if res.get("flight_no") and res.get("flight_no") != "N/A":
+            self.current_info["flight_no"] = str(res["flight_no"]).upper().replace(" ", "")
+        if res.get("date") and res.get("date") != "N/A":
+            self.current_info["date"] = str(res["date"])
+        if res.get("destination"):
+            self.current_info["destination"] = res["destination"]
+        if res.get("airline_code"): 
+            self.current_info["airline_code"] = res["airline_code"].upper()
+        if res.get("airline_name"): 
+            self.current_info["airline_name"] = res["airline_name"]
+
     
     # ==========================================================
     # [구간 4] 노선 기반 항공편 검색 (Scraping)
@@ -491,31 +489,8 @@ class FlightAgent:
         # [수정] 리스트가 아닌 '단일 코드'가 들어가도록 우선순위 조정
         dep = scraped_dep if scraped_dep else (self.current_info.get("departure")[0] if self.current_info.get("departure") else "N/A")
         dest = scraped_arr if scraped_arr else (self.current_info.get("destination")[0] if self.current_info.get("destination") else "N/A")
-        f_no = self.current_info.get("flight_no", "N/A")
-        
-        prompt = ChatPromptTemplate.from_template("""
-        System: 당신은 항공 노선 판별기입니다. 입력된 공항 코드를 보고 '국내' 혹은 '국제' 노선인지 판별하세요.
-        
-        [데이터 정보]
-        - 출발 공항: {dep}
-        - 도착 공항: {dest}
-        - 편명: {f_no}
-
-        [판단 규칙]
-        1. 출발지와 도착지의 국가가 다르면 무조건 '국제'입니다. (예: ICN-CTS, ICN-NRT는 국제선)
-        2. 같은 국가 내 공항 이동(예: GMP-CJU)인 경우만 '국내'입니다.
-        
-        [출력 규칙]
-        1. 다른 설명 없이 오직 {{"type": "국내"}} 또는 {{"type": "국제"}} 형식의 JSON만 출력하세요.
-        2. 한글(Korean)만 사용하며, 한자나 영어는 절대 섞지 마세요.
-        """)
-        
-        chain = prompt | self.llm | self.parser
-        try:
-            res = chain.invoke({"dep": dep, "dest": dest, "f_no": f_no})
-            return res.get("type", "정보 없음")
-        except:
-            return "정보 없음"
+        # 공항→국가 표로 즉시 판별 (예전엔 여기서 LLM을 한 번 더 호출했음)
+        return classify_route(dep, dest)
 
 # ==========================================================
 # [구간 7] 결과 출력 포맷팅
@@ -639,7 +614,8 @@ def retrieve_context(query: str, summary: dict, k: int = 3) -> str:
         if not picked:
             return f"현재 {target_airline}의 해당 규정 데이터가 부족하여 일반적인 항공법 기준으로 답변해 드립니다."
             
-        return "\n\n".join(picked[:k])
+        # 1500토큰 청크를 통째로 넣지 않고, 중복 문장 제거 + 질문 관련 문장 위주로 토큰 예산 안에서 조립
+        return assemble_context(query, picked[:k])
         
     except Exception as e:
         print(f"⚠️ 필터링 로직 실행 중 오류: {e}")
@@ -647,6 +623,36 @@ def retrieve_context(query: str, summary: dict, k: int = 3) -> str:
 # ==========================================================
 # [구간 9] 최종 답변 생성 (추가)
 # ==========================================================
+RAG_SYSTEM_PROMPT = """
+당신은 항공 규정 및 실시간 운항 정보 전문가입니다. 
+사용자가 규정집을 뒤지는 수고를 덜어주는 '해결사' 역할을 수행해야 합니다.
+
+[핵심 답변 원칙]
+1. **회피 금지**: "고객센터에 문의하세요", "직접 확인하세요"라는 답변은 시스템의 실패입니다. 절대 금지합니다.
+2. **적극적 가이드**: 대상 항공사의 특정 문구가 항공사 규정 문서에 없더라도, 문서 내의 '일반 운송 약관'이나 '보상 지침'을 활용하여 사용자 질문의 상황에 대한 최선의 행동 지침을 제공하세요.
+3. **출처 명시**: 답변 서두에 반드시 "현재 확보된 (대상 항공사) 규정(또는 일반 항공 규정)에 근거하여 안내해 드립니다."라고 명기하세요.
+4. **언어 정제**: 한국어로만 작성하며, 불필요한 한자(国际, 际 등)나 기계적인 번역투를 지양하세요.
+
+[상황별 답변 로직]
+1. **지연/결항 상황**:
+   - 항공사 규정 문서에서 해당 시간(예: 4시간)에 따른 서비스(식사권, 숙박, 통신 등)를 즉시 나열하세요.
+   - 만약 기상 악화(천재지변)라면, '항공사 귀책 없음'을 설명하되 그럼에도 불구하고 제공받을 수 있는 '대기 서비스'가 있는지 항공사 규정 문서에서 찾아 안내하세요.
+2. **행동 지침 (Action Plan)**:
+   - 승객이 지금 당장 해야 할 일(예: "게이트 카운터 방문", "지연 증명서 발급 요청", "바우처 수령")을 번호 순서대로 명확히 제시하세요.
+
+[최종 미션]
+사용자가 이 답변을 듣고 "아, 이제 어떻게 해야 할지 알겠다"라고 확신하게 만드세요.
+""".strip()
+
+RAG_HUMAN_TEMPLATE = """
+[참고 데이터]
+- 대상 항공사: {airline}
+- 실시간 항공 정보: {flight_info}
+- 항공사 규정 문서(Context): {context}
+- 사용자 질문: {query}
+""".strip()
+
+
 def get_rag_answer(llm, query, context, flight_info, prediction_result=None):
     pred_text = "N/A"
     if prediction_result and prediction_result.get('ok'):
@@ -654,32 +660,9 @@ def get_rag_answer(llm, query, context, flight_info, prediction_result=None):
         delay_min = prediction_result.get('predicted_delay_minutes', 0)
         pred_text = f"{status} (예상 지연 시간: {delay_min:.1f}분)"
 
-    prompt = ChatPromptTemplate.from_template("""
-    당신은 항공 규정 및 실시간 운항 정보 전문가입니다. 
-    사용자가 규정집을 뒤지는 수고를 덜어주는 '해결사' 역할을 수행해야 합니다.
-
-    [핵심 답변 원칙]
-    1. **회피 금지**: "고객센터에 문의하세요", "직접 확인하세요"라는 답변은 시스템의 실패입니다. 절대 금지합니다.
-    2. **적극적 가이드**: {airline}의 특정 문구가 {context}에 없더라도, 문서 내의 '일반 운송 약관'이나 '보상 지침'을 활용하여 현재 상황(예: {query})에 대한 최선의 행동 지침을 제공하세요.
-    3. **출처 명시**: 답변 서두에 반드시 "현재 확보된 {airline} 규정(또는 일반 항공 규정)에 근거하여 안내해 드립니다."라고 명기하세요.
-    4. **언어 정제**: 한국어로만 작성하며, 불필요한 한자(国际, 际 등)나 기계적인 번역투를 지양하세요.
-
-    [상황별 답변 로직]
-    1. **지연/결항 상황**:
-       - {context}에서 해당 시간(예: 4시간)에 따른 서비스(식사권, 숙박, 통신 등)를 즉시 나열하세요.
-       - 만약 기상 악화(천재지변)라면, '항공사 귀책 없음'을 설명하되 그럼에도 불구하고 제공받을 수 있는 '대기 서비스'가 있는지 {context}에서 찾아 안내하세요.
-    2. **행동 지침 (Action Plan)**:
-       - 승객이 지금 당장 해야 할 일(예: "게이트 카운터 방문", "지연 증명서 발급 요청", "바우처 수령")을 번호 순서대로 명확히 제시하세요.
-
-    [참고 데이터]
-    - 대상 항공사: {airline}
-    - 실시간 항공 정보: {flight_info}
-    - 항공사 규정 문서(Context): {context}
-    - 사용자 질문: {query}
-
-    [최종 미션]
-    사용자가 이 답변을 듣고 "아, 이제 어떻게 해야 할지 알겠다"라고 확신하게 만드세요.
-    """)
+    # system: 매 호출 글자 하나까지 동일한 지시문 → Ollama가 keep_alive 동안 이 앞부분의 KV 캐시를 재사용
+    # human : 항공사/문서/질문처럼 매번 바뀌는 값은 전부 여기로 (system에 변수를 넣으면 캐시가 깨짐)
+    prompt = ChatPromptTemplate.from_messages([("system", RAG_SYSTEM_PROMPT), ("human", RAG_HUMAN_TEMPLATE)])
     
     target_airline = flight_info.get('airline_name', '해당 항공사')
     
@@ -696,7 +679,7 @@ def get_rag_answer(llm, query, context, flight_info, prediction_result=None):
     async def main():
         llm = ChatOllama(model='qwen2.5:14b', format="json", temperature=0)
         # RAG용 LLM은 JSON 형식이 아닐 수 있으므로 별도 생성하거나 설정을 유연하게 가져갑니다.
-        rag_llm = ChatOllama(model='qwen2.5:14b', temperature=0) 
+        rag_llm = ChatOllama(model='qwen2.5:14b', temperature=0, keep_alive="30m") 
         agent = FlightAgent(llm)
         print("🤖 항공 비서 가동 중...")
     
@@ -728,7 +711,7 @@ def get_rag_answer(llm, query, context, flight_info, prediction_result=None):
 async def main():
     # 1. 모델 초기화
     llm = ChatOllama(model='qwen2.5:32b', format="json", temperature=0)
-    rag_llm = ChatOllama(model='qwen2.5:32b', temperature=0.3) 
+    rag_llm = ChatOllama(model='qwen2.5:32b', temperature=0.3, keep_alive="30m")  # 모델이 내려가면 system prefix 캐시도 사라짐
     agent = FlightAgent(llm)
     
     print("🤖 항공 비서 가동 중... (종료하려면 'exit' 입력)")
@@ -1,29 +1,32 @@
 import os
-import joblib
 import pandas as pd
 import requests
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
 from dotenv import load_dotenv
 
+import django_path  # noqa: F401  (3.Django의 dashboard.* 사용)
+from dashboard import airports
+from dashboard.forecast_series import ForecastSeries
+from dashboard.model_registry import ModelRegistry
+
 # 한국 시간
 KST = timezone(timedelta(hours=9))
 
-# 모델 경로
-CLASSIFIER_PATH = "모델_이진분류.joblib"
-REGRESSOR_PATH  = "모델_회기분석.joblib"   # ✅ 추가
-
-clf = joblib.load(CLASSIFIER_PATH)
-print("✅ 이진분류 모델 로드 완료")
+# 모델 경로 (실행 위치와 상관없이 이 파일 옆의 joblib)
+MODEL_DIR = Path(__file__).resolve().parent
+CLASSIFIER_PATH = MODEL_DIR / "모델_이진분류.joblib"
+REGRESSOR_PATH  = MODEL_DIR / "모델_회기분석.joblib"
+FAST_MODEL_PATH = MODEL_DIR / "delay_models.npz"      # fast 경로 캐시 (첫 로드 때 joblib에서 만듦, 해시가 이름에 붙음)
 
-reg = joblib.load(REGRESSOR_PATH)          # ✅ 이 줄이 빠졌던 것
-print("✅ 회귀 모델 로드 완료")
+# import 시점이 아니라 첫 예측 때 로드 (파일이 바뀌면 재시작 없이 교체)
+model_registry = ModelRegistry(CLASSIFIER_PATH, REGRESSOR_PATH, fast_path=FAST_MODEL_PATH)
 
 # 기상청 API
 BASE_URL = "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0"
 VILAGE_BASE_TIMES = ["0200","0500","0800","1100","1400","1700","2000","2300"]
 
-# 공항 격자 CSV (공항, nx, ny)
-AIRPORT_MAP_CSV = "airport_nxny_map.csv"
 
 def load_service_key():
     load_dotenv()
@@ -48,21 +51,18 @@ def pick_latest_vilage_base(now_kst=None):
     return ymd_yesterday, "2300"
 
 def get_nxny(airport_name):
-    df = pd.read_csv(AIRPORT_MAP_CSV)
-    row = df[df["공항"] == airport_name]
-    if row.empty:
+    # 3.Django/dashboard/data/airports.csv를 한 번만 읽어 둔 dict에서 조회
+    nxny = airports.get_nxny(airport_name)
+    if nxny is None:
         raise ValueError(f"공항 '{airport_name}' 없음")
-    return int(row.iloc[0]["nx"]), int(row.iloc[0]["ny"])
-
-def get_weather(departure_airport, dep_dt):
-    service_key = load_service_key()
-    nx, ny = get_nxny(departure_airport)
-
-    now_kst = datetime.now(KST)
-    base_date, base_time = pick_latest_vilage_base(now_kst)
+    return nxny
 
+@lru_cache(maxsize=64)
+def fetch_vilage_series(nx, ny, base_date, base_time):
+    # 단기예보는 발표시각(하루 8번)마다만 바뀌므로 (격자, 발표시각)별로 한 번만 API 호출하고
+    # TMP/WSD를 시간순 numpy 배열로 바꿔 둠
     params = {
-        "serviceKey": service_key,
+        "serviceKey": load_service_key(),
         "numOfRows": 500,
         "pageNo": 1,
         "dataType": "JSON",
@@ -74,29 +74,20 @@ def get_weather(departure_airport, dep_dt):
 
     r = requests.get(f"{BASE_URL}/getVilageFcst", params=params, timeout=20)
     r.raise_for_status()
-
     items = r.json()["response"]["body"]["items"]["item"]
-    df = pd.DataFrame(items)
-
-    df = df[df["category"].isin(["TMP", "WSD"])].copy()
-    df["fcst_datetime"] = pd.to_datetime(
-        df["fcstDate"] + df["fcstTime"],
-        format="%Y%m%d%H%M"
-    )
+    return ForecastSeries.from_items(items, base=base_date + base_time)
 
-    before = df[df["fcst_datetime"] <= dep_dt]
-    if before.empty:
-        return None
+def get_weather_many(departure_airport, dep_dts):
+    # 같은 공항 출발 시각 여러 개를 한 번에 (출발 시각 이전의 가장 최근 예보, 없으면 None)
+    nx, ny = get_nxny(departure_airport)
 
-    latest = before.sort_values("fcst_datetime").iloc[-1]
+    now_kst = datetime.now(KST)
+    base_date, base_time = pick_latest_vilage_base(now_kst)
 
-    temp = df[(df["category"]=="TMP") & (df["fcst_datetime"]==latest["fcst_datetime"])]["fcstValue"].values
-    wind = df[(df["category"]=="WSD") & (df["fcst_datetime"]==latest["fcst_datetime"])]["fcstValue"].values
+    return fetch_vilage_series(nx, ny, base_date, base_time).at_many(dep_dts)
 
-    return {
-        "기온(°C)": float(temp[0]) if len(temp)>0 else None,
-        "풍속_ms": float(wind[0]) if len(wind)>0 else None,
-    }
+def get_weather(departure_airport, dep_dt):
+    return get_weather_many(departure_airport, [dep_dt])[0]
 
 def predict_delay_binary(
     airline: str,
@@ -137,7 +128,9 @@ def predict_delay_binary(
         X[c] = X[c].astype("category")
 
     # 4️⃣ 이진분류 (지연 여부)
-    prob = float(clf.predict_proba(X)[:,1][0])
+    models = model_registry.get()
+    clf, reg = models.pick(len(X))    # 한 편씩이라 fast 캐시가 있으면 numpy 버전으로
+    prob = float(clf.predict_proba(X[list(models.clf_features)])[:,1][0])
     is_delay = int(prob >= threshold)
 
     result = {
@@ -149,7 +142,7 @@ def predict_delay_binary(
 
     # 5️⃣ ✅ 지연일 때만 회귀 실행
     if is_delay == 1:
-        delay_minutes = float(reg.predict(X)[0])
+        delay_minutes = float(reg.predict(X[list(models.reg_features)])[0])
 
         # 음수 방지 (회귀 모델에서 가끔 발생)
         delay_minutes = max(0.0, delay_minutes)
@@ -1,6 +1,29 @@
+import os
+import sys
+
 from django.apps import AppConfig
 
 
+def _is_server_process() -> bool:
+    """
+    웹 서버 워커일 때만 True. (sync_weather 같은 관리 명령에서는 모델을 올리지 않음)
+    - runserver: 자동 리로더의 자식 프로세스(RUN_MAIN=true)에서만
+    - gunicorn/uvicorn 등 WSGI/ASGI 서버: manage.py를 거치지 않으므로 argv[0]이 manage.py가 아님
+    """
+    argv0 = os.path.basename(sys.argv[0]) if sys.argv else ""
+    if argv0 == "manage.py" or argv0 == "django-admin":
+        return len(sys.argv) > 1 and sys.argv[1] == "runserver" and os.environ.get("RUN_MAIN") == "true"
+    return any(name in argv0 for name in ("gunicorn", "uvicorn", "daphne", "uwsgi"))
+
+
 class ChatbotConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'chatbot'
+
+    def ready(self):
+        from django.conf import settings
+
+        if getattr(settings, "CHATBOT_WARMUP", False) and _is_server_process():
+            from .llm.warmup import start_background_warmup
+
+            start_background_warmup()
@@ -0,0 +1,219 @@
+import copy
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+import torch
+
+from .loader import load_model
+
+
+@dataclass
+class GenRequest:
+    prompt: str
+    max_new_tokens: int = 256
+    temperature: float = 0.3            # 0 이하면 greedy
+    stop: tuple[str, ...] = ()          # 이 문자열이 나오면 거기서 자르고 종료
+    prefix: str = ""                    # 고정 지시문 (KV 캐시를 prefix별로 한 번만 계산해서 재사용)
+    future: Future = field(default_factory=Future)
+    tokens: list[int] = field(default_factory=list)
+    text: str = ""
+
+
+class BatchGenerator:
+    """
+    HF causal LM용 배치 생성기. 여러 스레드(사이드카 요청 스레드 등)에서 들어온 프롬프트를
+    큐에 모았다가 한 번의 forward로 같이 디코딩한다.
+
+    - 왼쪽 패딩 + attention_mask/position_ids 로 길이가 다른 프롬프트를 한 배치로 prefill
+    - 매 스텝 past_key_values(KV 캐시)를 재사용해서 새 토큰 1개씩만 forward
+    - 같은 prefix(고정 지시문)를 쓰는 요청끼리 묶고, prefix의 KV 캐시는 한 번만 계산해서 복사해 씀
+    - 요청별 종료 조건(max_new_tokens / eos / stop 문자열), 끝난 행은 배치와 KV 캐시에서 제거
+    - KV 캐시는 transformers Cache 객체(batch_repeat_interleave / batch_select_indices)로만 다룸
+    - load_model(device="cpu") 로 GPU 없이도 동작. tokenizer/model을 직접 넘기면 그걸 씀 (작은 모델로 테스트)
+    """
+
+    def __init__(self, max_batch: int = 8, max_wait_ms: float = 10.0, device: str | None = None,
+                 max_prefixes: int = 4, tokenizer=None, model=None):
+        self.max_batch = max_batch
+        self.max_prefixes = max_prefixes
+        self._prefixes: OrderedDict = OrderedDict()   # prefix → (토큰 수, KV 캐시) / 배치 스레드에서만 접근
+        self.max_wait = max_wait_ms / 1000.0
+        if tokenizer is None or model is None:
+            tokenizer, model = load_model(device=device)
+        self.tokenizer, self.model = tokenizer, model
+        # 배치 디코딩은 마지막 위치가 맞아야 하므로 왼쪽 패딩
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token_id is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.eos_ids = self._eos_ids()
+        self.stats = {"batches": 0, "requests": 0, "tokens": 0, "prefix_hits": 0, "prefix_misses": 0}
+        self._q: queue.Queue = queue.Queue()
+        threading.Thread(target=self._loop, name="llm-batch-generator", daemon=True).start()
+
+    def _eos_ids(self) -> set[int]:
+        ids = set()
+        for v in (self.tokenizer.eos_token_id, getattr(self.model.generation_config, "eos_token_id", None)):
+            if isinstance(v, int):
+                ids.add(v)
+            elif v:
+                ids.update(v)
+        return ids
+
+    # ------------------------------------------------------------------
+    def submit(self, prompt: str, max_new_tokens: int = 256, temperature: float = 0.3,
+               stop: tuple[str, ...] = (), prefix: str = "") -> Future:
+        req = GenRequest(prompt, max_new_tokens, temperature, tuple(stop), prefix)
+        self._q.put(req)
+        return req.future
+
+    def generate(self, prompt: str, max_new_tokens: int = 256, temperature: float = 0.3,
+                 stop: tuple[str, ...] = (), prefix: str = "") -> str:
+        return self.submit(prompt, max_new_tokens, temperature, stop, prefix).result()
+
+    def _loop(self):
+        carry: list[GenRequest] = []   # prefix가 달라서 이번 배치에 못 낀 요청
+        while True:
+            first = carry.pop(0) if carry else self._q.get()
+            batch, rest = [first], []
+            for r in carry:
+                if r.prefix == first.prefix and len(batch) < self.max_batch:
+                    batch.append(r)
+                else:
+                    rest.append(r)
+            carry = rest
+
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    r = self._q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                (batch if r.prefix == first.prefix else carry).append(r)
+
+            try:
+                self._run(batch)
+            except Exception as e:
+                for r in batch:
+                    if not r.future.done():
+                        r.future.set_exception(e)
+
+    # ------------------------------------------------------------------
+    def _finish(self, req: GenRequest, text: str):
+        req.text = text
+        req.future.set_result(text)
+
+    def _check_stop(self, req: GenRequest, token: int) -> bool:
+        if token in self.eos_ids:
+            self._finish(req, self.tokenizer.decode(req.tokens, skip_special_tokens=True))
+            return True
+        req.tokens.append(token)
+        text = self.tokenizer.decode(req.tokens, skip_special_tokens=True)
+        for s in req.stop:
+            i = text.find(s)
+            if i != -1:
+                self._finish(req, text[:i])
+                return True
+        if len(req.tokens) >= req.max_new_tokens:
+            self._finish(req, text)
+            return True
+        return False
+
+    def _sample(self, logits: torch.Tensor, temps: torch.Tensor) -> torch.Tensor:
+        greedy = logits.argmax(dim=-1)
+        if bool((temps <= 0).all()):
+            return greedy
+        probs = torch.softmax(logits.float() / temps.clamp(min=1e-5)[:, None], dim=-1)
+        sampled = torch.multinomial(probs, 1).squeeze(-1)
+        return torch.where(temps > 0, sampled, greedy)
+
+    @staticmethod
+    def _select_cache(past, idx: torch.Tensor):
+        # 끝난 행을 KV 캐시에서 빼기
+        past.batch_select_indices(idx)
+        return past
+
+    def _prefix_state(self, prefix: str):
+        # prefix만 한 번 forward 해서 (토큰 수, batch=1 KV 캐시)를 저장해 둠
+        if prefix in self._prefixes:
+            self._prefixes.move_to_end(prefix)
+            self.stats["prefix_hits"] += 1
+            return self._prefixes[prefix]
+
+        self.stats["prefix_misses"] += 1
+        ids = self.tokenizer(prefix, return_tensors="pt")["input_ids"].to(self.model.device)
+        past = self.model(input_ids=ids, use_cache=True).past_key_values
+        state = (ids.shape[1], past)
+        self._prefixes[prefix] = state
+        if len(self._prefixes) > self.max_prefixes:
+            self._prefixes.popitem(last=False)
+        return state
+
+    @staticmethod
+    def _expand_cache(past, b: int):
+        # 저장된 prefix 캐시는 건드리지 않도록 복사본을 배치 크기만큼 늘려서 넘김 (forward가 캐시에 이어 붙이므로)
+        past = copy.deepcopy(past)
+        past.batch_repeat_interleave(b)
+        return past
+
+    @torch.no_grad()
+    def _run(self, batch: list[GenRequest]):
+        dev = self.model.device
+        prefix = batch[0].prefix
+        if prefix:
+            prefix_len, prefix_past = self._prefix_state(prefix)
+            past = self._expand_cache(prefix_past, len(batch))
+        else:
+            prefix_len, past = 0, None
+
+        # prefix가 있으면 BOS 등 특수 토큰은 prefix 쪽에 이미 들어가 있음
+        enc = self.tokenizer([r.prompt for r in batch], return_tensors="pt", padding=True,
+                             add_special_tokens=not prefix)
+        input_ids = enc["input_ids"].to(dev)
+        mask = enc["attention_mask"].to(dev)
+        # 왼쪽 패딩이라 실제 토큰 기준으로 위치를 다시 매김 (prefix 뒤에 이어서)
+        pos = prefix_len + (mask.long().cumsum(-1) - 1).clamp(min=0)
+        attn = torch.cat([mask.new_ones((len(batch), prefix_len)), mask], dim=-1) if prefix_len else mask
+        temps = torch.tensor([r.temperature for r in batch], device=dev)
+
+        self.stats["batches"] += 1
+        self.stats["requests"] += len(batch)
+
+        out = self.model(input_ids=input_ids, attention_mask=attn, position_ids=pos,
+                         past_key_values=past, use_cache=True)
+        past = out.past_key_values
+        logits = out.logits[:, -1, :]
+        pos = pos[:, -1:]
+        active = list(batch)
+
+        while active:
+            next_tokens = self._sample(logits, temps)
+            self.stats["tokens"] += len(active)
+
+            keep = [i for i, (r, t) in enumerate(zip(active, next_tokens.tolist()))
+                    if not self._check_stop(r, t)]
+            if not keep:
+                break
+            if len(keep) < len(active):
+                idx = torch.tensor(keep, device=dev)
+                active = [active[i] for i in keep]
+                past = self._select_cache(past, idx)
+                attn, pos, temps, next_tokens = attn[idx], pos[idx], temps[idx], next_tokens[idx]
+
+            attn = torch.cat([attn, attn.new_ones((attn.shape[0], 1))], dim=-1)
+            pos = pos + 1
+            out = self.model(
+                input_ids=next_tokens[:, None],
+                attention_mask=attn,
+                position_ids=pos,
+                past_key_values=past,
+                use_cache=True,
+            )
+            past = out.past_key_values
+            logits = out.logits[:, -1, :]
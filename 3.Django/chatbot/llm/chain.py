@@ -1,30 +1,26 @@
 from functools import lru_cache
-from langchain_ollama import ChatOllama
+from django.conf import settings
 from .flight_ctx import find_flight_context
 from .rag import retrieve_context
+from .tracing import span, add_tokens
 
-@lru_cache(maxsize=1)
-def _llm():
-    # 너의 올라마 모델명에 맞춰 변경
-    return ChatOllama(
-        model="qwen2.5:14b",
-        temperature=0,
-    )
-
-def answer_question(question: str, airport: str | None = None) -> str:
-    question = (question or "").strip()
-    if not question:
-        return ""
-    
-    flight_ctx = find_flight_context(question, airport_code=airport)
-    context = retrieve_context(question, k=3)
-
-    prompt = f"""
+# 모든 요청에서 글자 하나까지 동일한 고정 지시문.
+# 프롬프트 맨 앞(system)에 두면 Ollama(llama.cpp)가 직전 요청과 겹치는 앞부분의 KV 캐시를 재사용해서
+# 이 부분 prefill은 모델이 keep_alive로 떠 있는 동안 사실상 한 번만 계산됨.
+# → 여기에 요청마다 바뀌는 값(시간, 질문 등)을 넣으면 캐시가 깨지므로 주의
+SYSTEM_PROMPT = """
 당신은 항공편 지연/결항 보상 안내 챗봇입니다.
 아래 [관련 문서] 내용 안에서 근거를 찾아, 한국어로 간단명료하게 답하세요.
 불확실하면 "확인이 필요합니다"라고 말하세요.
 사용자 항공사가 명확하지 않으면, 검색된 문서 중 대한항공 국내 약관을 우선으로 답하세요.
+""".strip()
+
+
+def build_messages(question: str, flight_ctx: str, context: str) -> list:
+    from langchain_core.messages import HumanMessage, SystemMessage
 
+    # 요청마다 바뀌는 부분은 전부 system 뒤(human)에
+    user = f"""
 [실시간 항공편 정보]
 {flight_ctx if flight_ctx else ""}
 
@@ -36,7 +32,37 @@ def answer_question(question: str, airport: str | None = None) -> str:
 
 [답변]
 """.strip()
+    return [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=user)]
+
+@lru_cache(maxsize=1)
+def _llm():
+    from langchain_ollama import ChatOllama
+
+    # 모델명/주소는 settings(OLLAMA_MODEL, OLLAMA_BASE_URL)에서 변경
+    return ChatOllama(
+        model=settings.OLLAMA_MODEL,
+        base_url=settings.OLLAMA_BASE_URL,
+        keep_alive=settings.OLLAMA_KEEP_ALIVE,
+        temperature=0,
+    )
+
+def answer_question(question: str, airport: str | None = None) -> str:
+    question = (question or "").strip()
+    if not question:
+        return ""
+    
+    with span("flight_ctx"):
+        flight_ctx = find_flight_context(question, airport_code=airport)
+    context = retrieve_context(question, k=3)
+
+    with span("prompt_build"):
+        messages = build_messages(question, flight_ctx, context)
+
+    with span("generate"):
+        resp = _llm().invoke(messages)
 
-    resp = _llm().invoke(prompt)
+    usage = getattr(resp, "usage_metadata", None) or {}
+    add_tokens("prompt", usage.get("input_tokens"))
+    add_tokens("completion", usage.get("output_tokens"))
     # resp는 AIMessage일 수 있으니 content로 안전하게 뽑기
     return getattr(resp, "content", str(resp)).strip()
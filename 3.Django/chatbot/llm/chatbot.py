@@ -7,6 +7,10 @@ from bs4 import BeautifulSoup
 from langchain_ollama import ChatOllama
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
+try:
+    from .route_type import classify_route
+except ImportError:  # 스크립트로 직접 실행할 때
+    from route_type import classify_route
 
 # ==========================================================
 # [구간 1] 환경 최적화 및 시스템 설정
@@ -94,32 +98,8 @@ class FlightAgent:
     def determine_route_type(self, scraped_dep=None, scraped_arr=None):
         dep = scraped_dep if scraped_dep else self.current_info.get("departure", [])
         dest = scraped_arr if scraped_arr else self.current_info.get("destination", [])
-        f_no = self.current_info.get("flight_no", "N/A")
-        
-        prompt = ChatPromptTemplate.from_template("""
-        System: 당신은 '국내' 혹은 '국제' 단 두 단어만 사용할 수 있는 항공 노선 판별기입니다.
-        
-        [출력 규칙 - 절대 준수]
-        1. 반드시 한글로만 답변하세요. (No English, No Chinese characters like 国际)
-        2. 다른 설명이나 수식어 없이 오직 {{"type": "국내"}} 또는 {{"type": "국제"}} 형식의 JSON만 출력하세요.
-        3. '국제'를 '국외'나 'International'로 바꿔 부르지 마세요.
-
-        [데이터 정보]
-        - 출발지: {dep}
-        - 목적지: {dest}
-        - 편명: {f_no}
-        
-        [판단 가이드]
-        - 한 국가 내 공항 간 이동(예: GMP-CJU)인 경우만 '국내'입니다.
-        - 그 이외에는 '국제'입니다
-        """)
-        
-        chain = prompt | self.llm | self.parser
-        try:
-            res = chain.invoke({"dep": dep, "dest": dest, "f_no": f_no})
-            return res.get("type", "정보 없음")
-        except:
-            return "정보 없음"
+        # 공항→국가 표로 즉시 판별 (예전엔 여기서 LLM을 한 번 더 호출했음)
+        return classify_route(dep, dest)
     # ==========================================================
     # [구간 4] 노선 기반 항공편 검색 (Scraping)
     # 특정 구간(출발-도착)의 모든 운항 정보를 조회하여 선택 리스트 생성
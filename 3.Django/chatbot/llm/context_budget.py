@@ -0,0 +1,115 @@
+import logging
+import os
+import re
+from functools import lru_cache
+
+# 프롬프트에 넣을 문서 조각을 "토큰 예산" 안에서 조립하는 모듈 (rag.retrieve_context에서 호출)
+#  1) 서빙 모델 토크나이저로 토큰 수 계산 (없으면 글자 수 기반 추정)
+#  2) 청크끼리 겹치는 문장(청크 overlap 200토큰) 제거
+#  3) 질문과 관련 높은 문장부터 예산을 채우고, 원래 문서 순서대로 다시 이어 붙임
+
+logger = logging.getLogger(__name__)
+
+# Ollama qwen2.5와 같은 토크나이저. 요청 처리 중에는 HF 캐시에 있는 것만 씀(없으면 글자 수 추정)
+# → 내려받기는 워밍업(load_tokenizer)에서만
+TOKENIZER_NAME = os.getenv("CONTEXT_TOKENIZER", "Qwen/Qwen2.5-14B-Instruct")
+DEFAULT_BUDGET_TOKENS = 1200
+
+_SENT_SPLIT = re.compile(r"(?<=\D[.!?。])\s+|(?<=다\.)|\n+")
+_HANGUL = re.compile(r"[가-힣]")
+_WS = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1)
+def _tokenizer():
+    try:
+        from transformers import AutoTokenizer
+
+        return AutoTokenizer.from_pretrained(TOKENIZER_NAME, local_files_only=True)
+    except Exception as e:
+        logger.warning("context tokenizer %s not available (%s: %s), estimating tokens from characters",
+                       TOKENIZER_NAME, type(e).__name__, e)
+        return None
+
+
+def load_tokenizer():
+    """워밍업용: HF 캐시에 없으면 내려받은 뒤 _tokenizer를 다시 채움. 실패해도 추정치로 동작하므로 예외는 내지 않음"""
+    try:
+        from transformers import AutoTokenizer
+
+        AutoTokenizer.from_pretrained(TOKENIZER_NAME)
+    except Exception as e:
+        logger.warning("context tokenizer %s download failed (%s: %s)", TOKENIZER_NAME, type(e).__name__, e)
+    _tokenizer.cache_clear()
+    return _tokenizer()
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    tok = _tokenizer()
+    if tok is not None:
+        return len(tok.encode(text, add_special_tokens=False))
+    # 대략치: 한글은 1.5자당 1토큰, 나머지(영문/숫자/기호)는 4자당 1토큰
+    hangul = len(_HANGUL.findall(text))
+    return int(hangul / 1.5 + (len(text) - hangul) / 4) + 1
+
+
+def split_sentences(text: str) -> list[str]:
+    return [s.strip() for s in _SENT_SPLIT.split(text or "") if s and s.strip()]
+
+
+def _bigrams(text: str) -> set[str]:
+    # 한국어는 띄어쓰기/조사 때문에 단어 매칭이 잘 안 맞아서 글자 2-gram으로 비교
+    t = _WS.sub("", text.lower())
+    return {t[i:i + 2] for i in range(len(t) - 1)}
+
+
+def assemble_context(query: str, chunks: list[str], budget_tokens: int = DEFAULT_BUDGET_TOKENS) -> str:
+    """
+    chunks(검색 순위 순)에서 중복 문장을 빼고, 질문과 관련 높은 문장 위주로 budget_tokens 안에 맞춰 반환.
+    전부 넣어도 예산 안이면 중복만 제거해서 그대로 돌려줌.
+    """
+    seen = set()
+    sents = []   # (청크 순위, 문장 순서, 문장)
+    for ci, chunk in enumerate(chunks):
+        for si, s in enumerate(split_sentences(chunk)):
+            key = _WS.sub(" ", s)
+            if key in seen:
+                continue
+            seen.add(key)
+            sents.append((ci, si, s))
+    if not sents:
+        return ""
+
+    costs = [count_tokens(s) for _, _, s in sents]
+    if sum(costs) <= budget_tokens:
+        chosen = range(len(sents))
+    else:
+        q = _bigrams(query)
+
+        def score(i):
+            ci, _, s = sents[i]
+            overlap = len(q & _bigrams(s)) / (len(q) or 1)
+            # 같은 점수면 검색 순위가 높은 청크 우선
+            return overlap + 0.1 / (ci + 1)
+
+        chosen, used = [], 0
+        for i in sorted(range(len(sents)), key=score, reverse=True):
+            if used + costs[i] > budget_tokens:
+                continue
+            chosen.append(i)
+            used += costs[i]
+
+    # 원래 순서로 되돌려서 청크 단위로 묶음 (문맥이 뒤섞이지 않도록)
+    out, cur, last_ci = [], [], None
+    for i in sorted(chosen):
+        ci, _, s = sents[i]
+        if last_ci is not None and ci != last_ci:
+            out.append(" ".join(cur))
+            cur = []
+        cur.append(s)
+        last_ci = ci
+    if cur:
+        out.append(" ".join(cur))
+    return "\n\n".join(out)
@@ -0,0 +1,264 @@
+import re
+from collections import deque
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from dashboard.airports import IATA_TO_KOR, all_airports
+
+# 사용자 입력에서 항공사/편명/공항(도시)/날짜를 LLM 없이 뽑아내는 추출기 (rag, flight_ctx와 2.RAG/final.py가 같이 씀)
+# 모든 이름/코드를 Aho-Corasick 오토마톤 하나에 넣어서 입력 길이에 비례하는 시간에 한 번에 매칭
+
+# (IATA 코드, 한글 이름, 약관 파일명에 쓰인 이름, 별칭들) - 약관 코퍼스(2.RAG/항공사 운송약관)에 있는 항공사 기준
+# 국내 항공사는 2글자 코드만 써도("TW 보상") 인식. 해외 항공사 코드(IT, CA, HO 등)는 일반 단어와 겹쳐서 별칭에서 뺌
+AIRLINES = [
+    ("KE", "대한항공", "대한항공", ("대한항공", "KOREAN AIR", "KOREANAIR", "KAL", "KE")),
+    ("OZ", "아시아나항공", "아시아나항공", ("아시아나항공", "아시아나", "ASIANA", "AAR", "OZ")),
+    ("LJ", "진에어", "진에어", ("진에어", "JIN AIR", "JINAIR", "JNA", "LJ")),
+    ("TW", "티웨이항공", "티웨이", ("티웨이항공", "티웨이", "T'WAY", "TWAY", "TWB", "TW")),
+    ("ZE", "이스타항공", "이스타항공", ("이스타항공", "이스타", "EASTAR", "ESR", "ZE")),
+    ("7C", "제주항공", "제주항공", ("제주항공", "JEJU AIR", "JEJUAIR", "JJA", "7C")),
+    ("BX", "에어부산", "에어부산", ("에어부산", "AIR BUSAN", "AIRBUSAN", "ABL", "BX")),
+    ("RS", "에어서울", "에어서울", ("에어서울", "AIR SEOUL", "AIRSEOUL", "ASV", "RS")),
+    ("RF", "에어로케이", "에어로케이", ("에어로케이", "AERO K", "AEROK", "EOK", "RF")),
+    ("VJ", "비엣젯항공", "비엣젯항공", ("비엣젯항공", "비엣젯", "VIETJET", "VJC")),
+    ("TR", "스쿠트항공", "스쿠트항공", ("스쿠트항공", "스쿠트", "SCOOT", "TGW")),
+    ("7G", "스타플라이어", "스타플라이어", ("스타플라이어", "STARFLYER", "SFJ")),
+    ("D7", "에어아시아엑스", "에어아시아엑스", ("에어아시아엑스", "에어아시아X", "AIRASIA X", "XAX")),
+    ("JL", "일본항공", "일본항공", ("일본항공", "JAPAN AIRLINES", "JAL")),
+    ("NH", "전일본공수", "전일본공수", ("전일본공수", "ALL NIPPON", "ANA")),
+    ("CA", "중국국제항공", "중국국제항공", ("중국국제항공", "에어차이나", "AIR CHINA", "CCA")),
+    ("HO", "길상항공", "중국길상항공", ("중국길상항공", "길상항공", "JUNEYAO", "DKH")),
+    ("MU", "동방항공", "중국동방항공", ("중국동방항공", "동방항공", "CHINA EASTERN", "CES")),
+    ("IJ", "춘추항공", "춘추항공", ("춘추항공", "SPRING JAPAN", "SJO")),
+    ("CX", "캐세이퍼시픽", "케세이퍼시픽", ("캐세이퍼시픽", "케세이퍼시픽", "CATHAY", "CPA")),
+    ("IT", "타이거항공", "타이거항공", ("타이거항공", "TIGERAIR", "TTW")),
+    ("UO", "홍콩익스프레스", "홍콩익스프레스", ("홍콩익스프레스", "HK EXPRESS", "HKE")),
+    ("AC", "에어캐나다", "에어캐나다", ("에어캐나다", "AIR CANADA", "ACA")),
+    ("", "파라타항공", "파라타항공", ("파라타항공", "파라타", "PARATA")),
+]
+
+# 국내 공항 한글명/별칭은 dashboard/data/airports.csv 한 곳에서 (현황판·날씨·지연 예측과 같은 표)
+# 아래 CITY_TO_IATA는 자주 묻는 해외 도시 + 여러 공항이 있는 도시. 도시/지역 → 그 도시의 모든 공항
+CITY_TO_IATA = {
+    "서울": ["ICN", "GMP"],
+    "도쿄": ["NRT", "HND"], "동경": ["NRT", "HND"], "나리타": ["NRT"], "하네다": ["HND"],
+    "오사카": ["KIX", "ITM"], "간사이": ["KIX"], "후쿠오카": ["FUK"], "나고야": ["NGO"],
+    "삿포로": ["CTS"], "홋카이도": ["CTS", "HKD"], "규슈": ["FUK", "KOJ"], "오키나와": ["OKA"],
+    "베이징": ["PEK", "PKX"], "북경": ["PEK", "PKX"], "상하이": ["SHA", "PVG"], "상해": ["SHA", "PVG"],
+    "홍콩": ["HKG"], "타이베이": ["TPE", "TSA"], "대만": ["TPE", "TSA"], "마카오": ["MFM"],
+    "방콕": ["BKK", "DMK"], "다낭": ["DAD"], "하노이": ["HAN"], "호치민": ["SGN"], "나트랑": ["CXR"],
+    "싱가포르": ["SIN"], "마닐라": ["MNL"], "세부": ["CEB"], "쿠알라룸푸르": ["KUL"],
+    "괌": ["GUM"], "사이판": ["SPN"], "하와이": ["HNL"], "호놀룰루": ["HNL"],
+    "토론토": ["YYZ", "YTZ"], "밴쿠버": ["YVR"], "뉴욕": ["JFK", "EWR", "LGA"],
+    "로스앤젤레스": ["LAX"], "엘에이": ["LAX"], "샌프란시스코": ["SFO"], "시애틀": ["SEA"],
+    "파리": ["CDG"], "런던": ["LHR"], "프랑크푸르트": ["FRA"], "시드니": ["SYD"],
+}
+_BY_CODE = {code: (code, name, doc) for code, name, doc, _ in AIRLINES if code}
+KNOWN_IATA = set(IATA_TO_KOR) | {c for codes in CITY_TO_IATA.values() for c in codes}
+
+FLIGHT_NO_RE = re.compile(r"(?<![A-Z0-9])([A-Z][A-Z0-9]|[0-9][A-Z])\s?(\d{1,4})(?![0-9])")
+
+# 공항 뒤에 붙는 방향 표시
+_DEP_AFTER = re.compile(r"^\s*(에서|발|출발|부터)")
+_ARR_AFTER = re.compile(r"^\s*(행|으로|로|도착|가는|까지|에\s*가)")
+_ROUTE_SEP = re.compile(r"^\s*(-|→|->|~|>|TO\b)\s*", re.I)
+# 이전 대화를 이어받는 표현 → 문맥 판단은 LLM에 맡김
+_FOLLOW_UP = re.compile(r"아까|그거|그럼|그 비행기|거기|방금|위에")
+
+
+class AhoCorasick:
+    """patterns(대문자 문자열 → 값)를 한 번에 찾는 오토마톤. iter()는 (start, end, pattern, value)"""
+
+    def __init__(self, patterns: dict):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out: list[list] = [[]]
+        for pat, value in patterns.items():
+            s = 0
+            for ch in pat:
+                nxt = self._goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[s][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                s = nxt
+            self._out[s].append((pat, value))
+
+        # BFS로 fail 링크 연결 (루트 바로 아래 노드는 fail=0)
+        queue = deque(self._goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for ch, nxt in self._goto[s].items():
+                queue.append(nxt)
+                f = self._fail[s]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter(self, text: str):
+        s = 0
+        for i, ch in enumerate(text):
+            while s and ch not in self._goto[s]:
+                s = self._fail[s]
+            s = self._goto[s].get(ch, 0)
+            for pat, value in self._out[s]:
+                yield i - len(pat) + 1, i + 1, pat, value
+
+
+@lru_cache(maxsize=1)
+def _matcher() -> AhoCorasick:
+    patterns = {}
+    for code, name, doc, aliases in AIRLINES:
+        for a in aliases:
+            patterns[a.upper()] = ("airline", code, name, doc)
+    for a in all_airports():
+        for name in (a.kor, *a.aliases):
+            patterns[name] = ("airport", [a.iata])
+    for city, codes in CITY_TO_IATA.items():
+        patterns[city] = ("airport", codes)
+    for code in KNOWN_IATA:
+        patterns.setdefault(code, ("airport", [code]))
+    return AhoCorasick(patterns)
+
+
+def _is_ascii_word(s: str) -> bool:
+    return s.isascii() and any(c.isalnum() for c in s)
+
+
+def find_entities(text: str) -> list[tuple]:
+    """
+    겹치는 후보 중 가장 왼쪽·가장 긴 것만 남긴 매칭 결과 [(start, end, value), ...]
+    (예: "제주항공"은 항공사로, 그 안의 "제주"는 공항으로 중복 인식하지 않음)
+    """
+    if not text:
+        return []
+    upper = text.upper()
+    cands = []
+    for start, end, pat, value in _matcher().iter(upper):
+        if _is_ascii_word(pat):
+            # 영문/코드는 단어 경계 필요 (KE가 KEY 안에서 잡히지 않도록)
+            if (start > 0 and upper[start - 1].isascii() and upper[start - 1].isalnum()) or \
+               (end < len(upper) and upper[end].isascii() and upper[end].isalnum()):
+                continue
+            # 3글자 이하 코드는 원문이 대문자일 때만 (영어 문장의 "ana", "sea" 등 오인식 방지)
+            if len(pat) <= 3 and text[start:end] != pat:
+                continue
+        cands.append((start, end, value))
+
+    cands.sort(key=lambda c: (c[0], -(c[1] - c[0])))
+    picked, last_end = [], 0
+    for c in cands:
+        if c[0] >= last_end:
+            picked.append(c)
+            last_end = c[1]
+    return picked
+
+
+def find_airlines(text: str) -> list[tuple[str, str, str]]:
+    """[(IATA 코드, 한글 이름, 약관 파일명 이름), ...] 등장 순서대로, 중복 제거 (편명 앞 코드 KE123 → 대한항공 포함)"""
+    hits = [(start, value[1:]) for start, _, value in find_entities(text) if value[0] == "airline"]
+    for m in _flight_numbers((text or "").upper()):
+        hits.append((m.start(), _BY_CODE[m.group(1)]))
+    out = []
+    for _, airline in sorted(hits, key=lambda h: h[0]):
+        if airline not in out:
+            out.append(airline)
+    return out
+
+
+def _flight_numbers(upper: str):
+    """편명 후보 중 앞 2글자가 아는 항공사 코드인 것만 (A380, B737 같은 기종을 편명으로 보지 않음)"""
+    for m in FLIGHT_NO_RE.finditer(upper):
+        if m.group(1) in _BY_CODE:
+            yield m
+
+
+def _parse_date(text: str, now: datetime) -> str | None:
+    low = text.lower()
+    if "모레" in text:
+        return (now + timedelta(days=2)).strftime("%Y%m%d")
+    if "내일" in text or "tomorrow" in low:
+        return (now + timedelta(days=1)).strftime("%Y%m%d")
+    if "오늘" in text or "today" in low:
+        return now.strftime("%Y%m%d")
+    m = re.search(r"(20\d{2})[-./]?(\d{2})[-./]?(\d{2})", text)
+    if m:
+        return "".join(m.groups())
+    m = re.search(r"(\d{1,2})\s*월\s*(\d{1,2})\s*일", text) or re.search(r"(?<![\d/])(\d{1,2})/(\d{1,2})(?![\d/])", text)
+    if m:
+        month, day = int(m.group(1)), int(m.group(2))
+        try:
+            d = now.replace(month=month, day=day)
+        except ValueError:
+            return None
+        # 이미 지난 날짜면 내년으로
+        if d.date() < now.date():
+            d = d.replace(year=d.year + 1)
+        return d.strftime("%Y%m%d")
+    return None
+
+
+def extract_flight_query(text: str, now: datetime | None = None) -> dict:
+    """
+    FlightAgent.analyze_and_update의 LLM JSON과 같은 모양으로 반환 + "confident"
+    confident=False면 (이전 대화 참조, 아무 것도 못 찾음 등) LLM으로 넘길 것
+    """
+    now = now or datetime.now()
+    text = text or ""
+    upper = text.upper()
+
+    res = {
+        "flight_no": "N/A", "airline_name": "N/A", "airline_code": "N/A",
+        "departure": [], "destination": [], "date": _parse_date(text, now) or now.strftime("%Y%m%d"),
+    }
+
+    m = next(_flight_numbers(upper), None)
+    if m:
+        res["flight_no"] = m.group(1) + m.group(2)
+        res["airline_code"] = m.group(1)
+
+    ents = find_entities(text)
+    places = []
+    for start, end, value in ents:
+        if value[0] == "airline":
+            code, name = value[1], value[2]
+            if res["airline_name"] == "N/A":
+                res["airline_name"] = name
+                if code and res["airline_code"] == "N/A":
+                    res["airline_code"] = code
+        elif m and m.start() <= start < m.end():
+            continue   # 편명 안의 글자(예: "ICN" 같은 우연)는 공항으로 보지 않음
+        else:
+            places.append((start, end, value[1]))
+    if res["airline_name"] == "N/A" and res["airline_code"] != "N/A":
+        for code, name, _, _ in AIRLINES:
+            if code == res["airline_code"]:
+                res["airline_name"] = name
+                break
+
+    # 출발/도착 구분: "A에서 B", "A-B", "B행/B로" 등
+    dep, arr, loose = [], [], []
+    for i, (start, end, codes) in enumerate(places):
+        after = text[end:end + 6]
+        if _DEP_AFTER.match(after):
+            dep += codes
+        elif _ARR_AFTER.match(after):
+            arr += codes
+        elif i + 1 < len(places) and _ROUTE_SEP.match(text[end:places[i + 1][0]]):
+            dep += codes
+        else:
+            loose.append(codes)
+    # 표시 없는 공항: "김포 제주"처럼 여러 개면 마지막이 도착지, 하나뿐이면 도착지가 빈 경우에만 도착지
+    if loose and not arr:
+        arr += loose.pop()
+    for codes in loose:
+        dep += codes
+    res["departure"] = list(dict.fromkeys(dep))
+    res["destination"] = list(dict.fromkeys(arr))
+
+    found = res["flight_no"] != "N/A" or bool(res["destination"])
+    res["confident"] = found and not _FOLLOW_UP.search(text)
+    return res
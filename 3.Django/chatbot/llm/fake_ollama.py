@@ -0,0 +1,179 @@
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 벤치마크용 고정 답변 (토큰 단위로 잘라서 순서대로 흘려보냄 → 매번 같은 출력)
+FAKE_TOKENS = (
+    "현재 확보된 규정에 근거하여 안내해 드립니다. "
+    "국내선 항공편이 2시간 이상 지연된 경우 항공사는 "
+    "운임의 일부를 보상하거나 대체편을 제공해야 합니다. "
+    "정확한 금액은 확인이 필요합니다. "
+).split(" ")
+
+
+class FakeOllamaServer:
+    """
+    GPU 없이 /api/chat/ 부하테스트를 하기 위한 가짜 Ollama 서버.
+    /api/chat, /api/generate 요청에 FAKE_TOKENS를 정해진 속도로 스트리밍한다.
+
+    - tokens   : 응답 1건당 생성 토큰 수
+    - tps      : 초당 토큰 수 (0이면 지연 없이 즉시)
+    - ttft_ms  : 첫 토큰까지 걸리는 시간(프롬프트 prefill 흉내)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 tokens: int = 64, tps: float = 30.0, ttft_ms: float = 300.0,
+                 model: str = "qwen2.5:14b"):
+        self.tokens = tokens
+        self.tps = tps
+        self.ttft_ms = ttft_ms
+        self.model = model
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):  # 부하테스트 중 콘솔 도배 방지
+                pass
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                if self.path.startswith("/api/tags"):
+                    self._send_json({"models": [{"name": server.model, "model": server.model}]})
+                elif self.path.startswith("/api/version"):
+                    self._send_json({"version": "0.0.0-fake"})
+                else:
+                    self._send_text("Ollama is running")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    body = {}
+
+                if self.path.startswith("/api/chat"):
+                    prompt = "".join(m.get("content") or "" for m in body.get("messages") or [])
+                    server._stream(self, body, prompt, chat=True)
+                elif self.path.startswith("/api/generate"):
+                    server._stream(self, body, body.get("prompt") or "", chat=False)
+                elif self.path.startswith("/api/show"):
+                    self._send_json({"modelfile": "", "parameters": "", "template": "", "details": {}})
+                else:
+                    self.send_error(404)
+
+            def _send_json(self, payload: dict):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_text(self, text: str):
+                data = text.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def _chunk(self, text: str, chat: bool, done: bool) -> dict:
+        out = {
+            "model": self.model,
+            "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "done": done,
+        }
+        if chat:
+            out["message"] = {"role": "assistant", "content": text}
+        else:
+            out["response"] = text
+        return out
+
+    def _stream(self, handler: BaseHTTPRequestHandler, body: dict, prompt: str, chat: bool):
+        t0 = time.perf_counter()
+        prompt_tokens = max(1, len(prompt) // 2)  # 한글 기준 대략치 (결정적이기만 하면 됨)
+        n = int((body.get("options") or {}).get("num_predict") or self.tokens)
+        n = max(1, min(n, self.tokens))
+        pieces = [FAKE_TOKENS[i % len(FAKE_TOKENS)] + " " for i in range(n)]
+        interval = 1.0 / self.tps if self.tps > 0 else 0.0
+
+        time.sleep(self.ttft_ms / 1000.0)
+        prefill_ns = int((time.perf_counter() - t0) * 1e9)
+
+        def final(extra_text: str = "") -> dict:
+            total_ns = int((time.perf_counter() - t0) * 1e9)
+            last = self._chunk(extra_text, chat, done=True)
+            last.update({
+                "done_reason": "stop",
+                "total_duration": total_ns,
+                "load_duration": 0,
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": prefill_ns,
+                "eval_count": n,
+                "eval_duration": total_ns - prefill_ns,
+            })
+            return last
+
+        if body.get("stream") is False:
+            time.sleep(interval * n)
+            data = json.dumps(final("".join(pieces).strip())).encode("utf-8")
+            handler.send_response(200)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(data)))
+            handler.end_headers()
+            handler.wfile.write(data)
+            return
+
+        # 스트리밍: NDJSON 한 줄씩, chunked 전송
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/x-ndjson")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+
+        def write_line(obj: dict):
+            line = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+            handler.wfile.write(f"{len(line):X}\r\n".encode("ascii") + line + b"\r\n")
+            handler.wfile.flush()
+
+        for i, piece in enumerate(pieces):
+            if i and interval:
+                time.sleep(interval)
+            write_line(self._chunk(piece, chat, done=False))
+        write_line(final())
+        handler.wfile.write(b"0\r\n\r\n")
+        handler.wfile.flush()
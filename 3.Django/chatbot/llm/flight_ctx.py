@@ -1,35 +1,48 @@
-import re
+from datetime import datetime, timedelta
 from django.utils import timezone
 from dashboard.models import FlightSnapshot
+from .entities import extract_flight_query
+from .tracing import span
+
+
+def _changed_time(flight_date: str, std: str, delay_minutes: int | None) -> str | None:
+    """
+    STD + 지연(분) → "YYYYMMDD hhmm". 분 단위로 더해서 날짜를 넘기므로 23:50 → 00:20, STD 2400 표기도 그대로 처리.
+    STD가 hhmm이 아니면 None (변경시간 줄을 뺌)
+    """
+    if delay_minutes is None or len(std) != 4 or not std.isdigit():
+        return None
+    total = int(std[:2]) * 60 + int(std[2:]) + delay_minutes
+    day = datetime.strptime(flight_date, "%Y%m%d") + timedelta(days=total // 1440)
+    return f"{day:%Y%m%d} {total % 1440 // 60:02d}{total % 60:02d}"
 
-FLIGHT_RE = re.compile(r"\b([A-Z]{2}\d{2,4})\b", re.I)  # KE1401, OZ8234 등
 
 def find_flight_context(message: str, airport_code: str | None = None) -> str:
     """
     메시지에서 편명을 찾고, 오늘/현재 이후 기준으로 FlightSnapshot에서 가장 가까운 항공편 1개를 찾아 요약 문자열로 반환
     """
-    m = (message or "").upper()
-    m2 = FLIGHT_RE.search(m)
-    if not m2:
+    # 편명은 질문 분석(entities.extract_flight_query)과 같은 규칙으로 (아는 항공사 코드 + 숫자, "KE 1401"도 인식)
+    flight_no = extract_flight_query(message)["flight_no"]
+    if flight_no == "N/A":
         return ""
-
-    flight_no = m2.group(1)
     today = timezone.localdate().strftime("%Y%m%d")
     now_hhmm = timezone.localtime().strftime("%H%M")
 
+    # 지연(분) = ETD - STD 는 DB에서 계산 (FlightSnapshotQuerySet.with_delay)
     qs = FlightSnapshot.objects.filter(
         flight_no=flight_no,
         flight_date=today,
-    )
+    ).with_delay()
 
     if airport_code:
         qs = qs.filter(airport_code=airport_code)
 
-    # 지금 이후 가까운 편 우선
-    obj = qs.filter(std__gte=now_hhmm).order_by("std").first()
-    if not obj:
-        # 그래도 없으면 오늘 중 아무거나
-        obj = qs.order_by("-updated_at").first()
+    with span("flight_ctx_db"):
+        # 지금 이후 가까운 편 우선
+        obj = qs.filter(std__gte=now_hhmm).order_by("std").first()
+        if not obj:
+            # 그래도 없으면 오늘 중 아무거나
+            obj = qs.order_by("-updated_at").first()
     if not obj:
         return ""
 
@@ -37,6 +50,16 @@ def find_flight_context(message: str, airport_code: str | None = None) -> str:
     status = obj.status or "정상"
     place = obj.destination if obj.kind == "dep" else obj.origin
 
+    extra = ""
+    changed = _changed_time(obj.flight_date, obj.std, obj.delay_minutes) if obj.etd and obj.etd != obj.std else None
+    if changed:
+        # ETD가 자정을 넘기면 날짜도 바뀌므로 STD + 지연(분)으로 계산 (23:50 → 00:20이면 다음 날)
+        extra += f"- 변경시간: {changed}\n"
+    if obj.delay_minutes and obj.delay_minutes > 0:
+        extra += f"- 지연: {obj.delay_minutes}분\n"
+    if obj.gate:
+        extra += f"- 게이트: {obj.gate}\n"
+
     return (
         f"[실시간 항공편 상태]\n"
         f"- 공항: {obj.airport_code}\n"
@@ -46,4 +69,5 @@ def find_flight_context(message: str, airport_code: str | None = None) -> str:
         f"- {'목적지' if obj.kind=='dep' else '출발지'}: {place}\n"
         f"- 예정시간: {when}\n"
         f"- 상태: {status}\n"
+        f"{extra}"
     )
@@ -1,14 +1,15 @@
-from .loader import load_model
+from .inference import generate
 from .rag import retrieve_context
 
-def generate_answer(question: str) -> str:
-    tokenizer, model = load_model()
+# 고정 지시문 - 배치 생성기가 이 부분의 KV 캐시를 한 번만 계산해 두고 요청마다 재사용함
+SYSTEM_PREFIX = """
+당신은 항공편 지연 및 결항 보상 전문 상담사입니다.
+"""
 
+def generate_answer(question: str) -> str:
     context = retrieve_context(question)
 
     prompt = f"""
-당신은 항공편 지연 및 결항 보상 전문 상담사입니다.
-
 [관련 규정]
 {context}
 
@@ -18,12 +19,5 @@ def generate_answer(question: str) -> str:
 [답변]
 """
 
-    inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
-    outputs = model.generate(
-        **inputs,
-        max_new_tokens=256,
-        temperature=0.3,
-        do_sample=True,
-    )
-
-    return tokenizer.decode(outputs[0], skip_special_tokens=True)
+    # 모델은 사이드카(또는 로컬 inference 백엔드)가 들고 있음
+    return generate(prompt, max_new_tokens=256, prefix=SYSTEM_PREFIX)
@@ -0,0 +1,99 @@
+import logging
+from functools import lru_cache
+
+import requests
+from django.conf import settings
+
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+EMBED_MODEL_NAME = "Qwen/Qwen3-Embedding-0.6B"  # chroma DB 만들 때 쓴 임베딩 모델과 동일해야 정확도가 가장 좋음
+
+# 웹 워커 → 사이드카 호출용 커넥션 풀 (워커당 1개)
+_session = requests.Session()
+
+
+def _sidecar_url() -> str:
+    # 비어 있으면 지금처럼 워커 프로세스 안에서 직접 모델을 올림
+    return (getattr(settings, "INFERENCE_SIDECAR_URL", "") or "").rstrip("/")
+
+
+def _post(path: str, payload: dict, timeout: float) -> dict:
+    r = _session.post(f"{_sidecar_url()}{path}", json=payload, timeout=(1, timeout))
+    r.raise_for_status()
+    return r.json()
+
+
+# ----------------------------------------------------------------------
+# 로컬(in-process) 백엔드 - 사이드카 프로세스도 이 함수들을 그대로 씀
+# ----------------------------------------------------------------------
+@lru_cache(maxsize=1)
+def _embedder():
+    # torch까지 끌고 오는 무거운 import라 실제로 쓸 때 가져옴
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(EMBED_MODEL_NAME)
+
+
+def embed_local(texts: list[str], batch_size: int = 32) -> list[list[float]]:
+    with span("embed_load"):
+        model = _embedder()
+    return model.encode(texts, batch_size=batch_size, normalize_embeddings=True).tolist()
+
+
+def rerank_local(query: str, documents: list[str]) -> list[float]:
+    # 정규화된 임베딩끼리의 내적 = 코사인 유사도
+    vecs = embed_local([query] + list(documents))
+    q = vecs[0]
+    return [sum(a * b for a, b in zip(q, d)) for d in vecs[1:]]
+
+
+@lru_cache(maxsize=1)
+def _batcher():
+    # 동시에 들어온 생성 요청을 한 배치로 묶어 디코딩 (batching.py)
+    from .batching import BatchGenerator
+
+    return BatchGenerator(
+        max_batch=getattr(settings, "HF_GENERATE_MAX_BATCH", 8),
+        device=getattr(settings, "HF_GENERATE_DEVICE", None) or None,
+    )
+
+
+def generate_local(prompt: str, max_new_tokens: int = 256, prefix: str = "") -> str:
+    return _batcher().generate(prompt, max_new_tokens=max_new_tokens, temperature=0.3, prefix=prefix)
+
+
+# ----------------------------------------------------------------------
+# chatbot/llm에서 쓰는 공개 함수: 사이드카가 설정돼 있으면 HTTP, 아니면 로컬
+# 사이드카가 꺼져 있으면(연결 실패) 이 프로세스에서 직접 계산. 응답 오류/읽기 타임아웃은 그대로 올림
+# ----------------------------------------------------------------------
+def _remote_or_local(path: str, payload: dict, timeout: float, key: str, local):
+    if _sidecar_url():
+        try:
+            return _post(path, payload, timeout=timeout)[key]
+        except requests.ConnectionError:
+            logger.warning("inference sidecar %s unreachable, running %s locally", _sidecar_url(), path)
+    return local()
+
+
+def embed(texts: list[str]) -> list[list[float]]:
+    return _remote_or_local("/embed", {"texts": texts}, 30, "embeddings", lambda: embed_local(texts))
+
+
+def rerank(query: str, documents: list[str]) -> list[float]:
+    return _remote_or_local("/rerank", {"query": query, "documents": documents}, 30, "scores",
+                            lambda: rerank_local(query, documents))
+
+
+def generate(prompt: str, max_new_tokens: int = 256, prefix: str = "") -> str:
+    """prefix: 요청마다 같은 고정 지시문. prompt 앞에 붙고, KV 캐시는 prefix별로 한 번만 계산"""
+    payload = {"prompt": prompt, "max_new_tokens": max_new_tokens, "prefix": prefix}
+    return _remote_or_local("/generate", payload, 300, "text",
+                            lambda: generate_local(prompt, max_new_tokens=max_new_tokens, prefix=prefix))
+
+
+def sidecar_health() -> dict:
+    r = _session.get(f"{_sidecar_url()}/health", timeout=(1, 5))
+    r.raise_for_status()
+    return r.json()
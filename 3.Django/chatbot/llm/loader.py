@@ -6,17 +6,22 @@ MODEL_NAME = "your-hf-model-name"  # ← 여기에 모델명
 _tokenizer = None
 _model = None
 
-def load_model():
+def load_model(device=None):
+    """device="cpu" 이면 GPU 없이 float32로 로드 (배치 생성기 테스트용)"""
     global _tokenizer, _model
 
     if _model is None:
         print("[LLM] loading model...")
         _tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-        _model = AutoModelForCausalLM.from_pretrained(
-            MODEL_NAME,
-            device_map="auto",
-            torch_dtype=torch.float16,
-        )
+        if device == "cpu":
+            _model = AutoModelForCausalLM.from_pretrained(MODEL_NAME, torch_dtype=torch.float32)
+        else:
+            _model = AutoModelForCausalLM.from_pretrained(
+                MODEL_NAME,
+                device_map="auto",
+                torch_dtype=torch.float16,
+            )
+        _model.eval()
         print("[LLM] model loaded")
 
     return _tokenizer, _model
@@ -0,0 +1,56 @@
+import threading
+from collections import defaultdict
+
+# 프로세스 단위 집계 (gunicorn 워커가 여러 개면 워커별로 따로 쌓임 → 스크랩 시 instance 라벨로 구분)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_lock = threading.Lock()
+_stage_hist: dict[str, list] = {}                  # stage -> [버킷별 count, sum, count]
+_counters: dict[tuple, float] = defaultdict(float)  # (name, (label, value)...) -> 값
+
+
+def observe_stage(stage: str, seconds: float):
+    with _lock:
+        h = _stage_hist.get(stage)
+        if h is None:
+            h = _stage_hist[stage] = [[0] * len(BUCKETS), 0.0, 0]
+        for i, le in enumerate(BUCKETS):
+            if seconds <= le:
+                h[0][i] += 1
+        h[1] += seconds
+        h[2] += 1
+
+
+def inc(name: str, value: float = 1, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] += value
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def render() -> str:
+    """Prometheus text format(0.0.4)으로 현재 집계값을 출력"""
+    lines = []
+    with _lock:
+        if _stage_hist:
+            lines.append("# HELP chat_stage_seconds Time spent per answer_question stage")
+            lines.append("# TYPE chat_stage_seconds histogram")
+            for stage, (buckets, total, count) in sorted(_stage_hist.items()):
+                for le, n in zip(BUCKETS, buckets):
+                    lines.append(f'chat_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {n}')
+                lines.append(f'chat_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {count}')
+                lines.append(f'chat_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+                lines.append(f'chat_stage_seconds_count{{stage="{stage}"}} {count}')
+
+        typed = set()
+        for (name, pairs), value in sorted(_counters.items()):
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_labels(pairs)} {value:g}")
+    return "\n".join(lines) + "\n"
@@ -1,30 +1,22 @@
 from pathlib import Path
 from functools import lru_cache
-
-from langchain_chroma import Chroma
-from sentence_transformers import SentenceTransformer
 from typing import Optional
 import re
 
+from django.conf import settings
+
+from . import inference
+from .context_budget import assemble_context
+from .entities import find_airlines
+from .tracing import span
+
 BASE_DIR = Path(__file__).resolve().parent.parent      # chatbot/
 CHROMA_DIR = BASE_DIR / "chroma_db"                   # chatbot/chroma_db
 
-AIRLINE_HINTS = {
-    "대한항공": ["대한항공", "KAL", "KOREAN AIR", "KE"],
-    "아시아나": ["아시아나", "ASIANA", "OZ"],
-    "제주항공": ["제주항공", "JEJU AIR", "7C"],
-    "진에어": ["진에어", "JINAIR", "LJ"],
-    "티웨이": ["티웨이", "T'WAY", "TW"],
-    "에어부산": ["에어부산", "AIR BUSAN", "BX"],
-}
-
 def _guess_airline(question: str) -> Optional[str]:
-    q = (question or "").upper()
-    for name, hints in AIRLINE_HINTS.items():
-        for h in hints:
-            if h.upper() in q:
-                return name
-    return None
+    # 약관 메타데이터(source/file_name)에 쓰인 항공사 이름으로 반환 (예: "KE123 지연" → "대한항공")
+    found = find_airlines(question)
+    return found[0][2] if found else None
 
 def _guess_dom_intl(question: str) -> Optional[str]:
     q = (question or "")
@@ -36,15 +28,12 @@ def _guess_dom_intl(question: str) -> Optional[str]:
     return None
 
 
-@lru_cache(maxsize=1)
-def _embedder():
-    # chroma DB 만들 때 쓴 임베딩 모델과 동일해야 정확도가 가장 좋음
-    return SentenceTransformer("Qwen/Qwen3-Embedding-0.6B")
-
 COLLECTION_NAME = "airline_terms"
 
 @lru_cache(maxsize=1)
 def _vectordb():
+    from langchain_chroma import Chroma
+
     # persist_directory만 있으면 기존 DB 로드됨
     return Chroma(
         persist_directory=str(CHROMA_DIR),
@@ -61,14 +50,20 @@ def retrieve_context(query: str, k: int = 3) -> str:
     airline = _guess_airline(query)
     dom_intl = _guess_dom_intl(query)
 
-    emb = _embedder().encode(query).tolist()
+    # 임베딩은 사이드카(INFERENCE_SIDECAR_URL)가 있으면 거기서, 없으면 이 프로세스에서 계산
+    with span("embed"):
+        emb = inference.embed([query])[0]
+
+    with span("chroma_open"):
+        collection = _vectordb()._collection
 
     # 일단 넉넉히 뽑고
-    results = _vectordb()._collection.query(
-        query_embeddings=[emb],
-        n_results=max(12, k),
-        include=["documents", "metadatas"]
-    )
+    with span("chroma_query"):
+        results = collection.query(
+            query_embeddings=[emb],
+            n_results=max(12, k),
+            include=["documents", "metadatas"]
+        )
     docs = results.get("documents", [[]])[0] or []
     metas = results.get("metadatas", [[]])[0] or []
 
@@ -93,4 +88,6 @@ def retrieve_context(query: str, k: int = 3) -> str:
     if not picked:
         picked = docs[:k]
 
-    return ("\n\n".join(picked))[:6000]
+    # 글자 수로 자르면 문장 중간이 잘리므로, 토큰 예산 안에서 질문과 관련 있는 문장 위주로 조립
+    with span("context_budget"):
+        return assemble_context(query, picked, budget_tokens=settings.RAG_CONTEXT_TOKENS)
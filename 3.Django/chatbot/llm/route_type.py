@@ -0,0 +1,41 @@
+import csv
+from functools import lru_cache
+from pathlib import Path
+
+# 공항 코드 → 국가 표(airport_country.csv: 국가별 한 줄)로 국내/국제선 판별
+# 2.RAG/chatbot.py, chatbot+RAG.py의 determine_route_type도 django_path로 이 함수를 가져다 씀
+# 예전에는 determine_route_type이 매번 LLM(JSON 모드)을 불러서 판별했음
+DATA_PATH = Path(__file__).resolve().parent / "airport_country.csv"
+HOME_COUNTRY = "KR"
+
+
+@lru_cache(maxsize=1)
+def _airport_country() -> dict:
+    table = {}
+    with open(DATA_PATH, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            for code in row["iata"].split():
+                table[code] = row["country"]
+    return table
+
+
+def _one(code):
+    # current_info의 ["ICN", "GMP"] 같은 리스트가 들어와도 첫 번째 코드로 판별
+    if isinstance(code, (list, tuple)):
+        code = code[0] if code else None
+    code = str(code or "").strip().upper()
+    return code if code and code != "N/A" else None
+
+
+def country_of(code) -> str | None:
+    return _airport_country().get(_one(code) or "")
+
+
+def classify_route(dep, arr) -> str:
+    """"국내" | "국제" | "정보 없음" (국내 공항은 표에 전부 있으므로, 한쪽만 국내면 다른 쪽은 모르는 공항이어도 국제)"""
+    c1, c2 = country_of(dep), country_of(arr)
+    if c1 and c2:
+        return "국내" if c1 == c2 else "국제"
+    if HOME_COUNTRY in (c1, c2) and _one(dep) and _one(arr):
+        return "국제"
+    return "정보 없음"
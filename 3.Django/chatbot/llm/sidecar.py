@@ -0,0 +1,168 @@
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .inference import embed_local, generate_local
+
+
+class MicroBatcher:
+    """
+    여러 요청에서 들어온 입력을 잠깐(max_wait_ms) 모았다가 fn(list)를 한 번에 호출하고
+    결과를 요청별로 다시 나눠 돌려줌. 임베딩처럼 배치가 커질수록 GPU/CPU 효율이 좋아지는 작업용.
+    """
+
+    def __init__(self, fn, max_batch: int = 32, max_wait_ms: float = 5.0):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._q: queue.Queue = queue.Queue()
+        threading.Thread(target=self._loop, name="sidecar-batcher", daemon=True).start()
+
+    def submit(self, items: list) -> list:
+        if not items:
+            return []
+        fut: Future = Future()
+        self._q.put((list(items), fut))
+        return fut.result()
+
+    def _loop(self):
+        while True:
+            batch = [self._q.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            flat = [x for items, _ in batch for x in items]
+            try:
+                out = self.fn(flat)
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+
+            i = 0
+            for items, fut in batch:
+                fut.set_result(out[i:i + len(items)])
+                i += len(items)
+
+
+class InferenceSidecar:
+    """
+    웹 워커들이 공유하는 로컬 추론 서버. 임베딩 모델(과 선택적으로 HF 생성 모델)을 이 프로세스만 들고 있음.
+      POST /embed    {"texts": [...]}                       → {"embeddings": [[...], ...]}
+      POST /rerank   {"query": "...", "documents": [...]}   → {"scores": [...]}
+      POST /generate {"prompt": "...", "max_new_tokens": n, "prefix": "..."} → {"text": "..."}
+      GET  /health
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765,
+                 max_batch: int = 32, max_wait_ms: float = 5.0, enable_generate: bool = False):
+        self.enable_generate = enable_generate
+        self.embedder = MicroBatcher(lambda texts: embed_local(texts, batch_size=max_batch),
+                                     max_batch=max_batch, max_wait_ms=max_wait_ms)
+        self.stats = {"embed_requests": 0, "embed_texts": 0, "generate_requests": 0}
+        self._stats_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def preload(self):
+        # 첫 요청 전에 모델을 올려둠
+        self.embedder.submit(["warmup"])
+        if self.enable_generate:
+            from .inference import _batcher
+
+            _batcher()
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _count(self, **inc):
+        with self._stats_lock:
+            for k, v in inc.items():
+                self.stats[k] += v
+
+    def _handle(self, path: str, body: dict) -> dict:
+        if path == "/embed":
+            texts = [str(t) for t in body.get("texts") or []]
+            self._count(embed_requests=1, embed_texts=len(texts))
+            return {"embeddings": self.embedder.submit(texts)}
+
+        if path == "/rerank":
+            docs = [str(d) for d in body.get("documents") or []]
+            vecs = self.embedder.submit([str(body.get("query") or "")] + docs)
+            q = vecs[0]
+            self._count(embed_requests=1, embed_texts=len(vecs))
+            return {"scores": [sum(a * b for a, b in zip(q, d)) for d in vecs[1:]]}
+
+        if path == "/generate":
+            if not self.enable_generate:
+                raise LookupError("generate disabled (start with --generate)")
+            self._count(generate_requests=1)
+            text = generate_local(
+                str(body.get("prompt") or ""),
+                int(body.get("max_new_tokens") or 256),
+                prefix=str(body.get("prefix") or ""),
+            )
+            return {"text": text}
+
+        raise LookupError(path)
+
+    def _handler_class(self):
+        sidecar = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.startswith("/health"):
+                    with sidecar._stats_lock:
+                        stats = dict(sidecar.stats)
+                    self._send(200, {"status": "ok", "generate": sidecar.enable_generate, **stats})
+                else:
+                    self._send(404, {"error": "not_found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                    self._send(200, sidecar._handle(self.path.split("?")[0], body))
+                except LookupError as e:
+                    self._send(404, {"error": "not_found", "detail": str(e)})
+                except ValueError as e:
+                    self._send(400, {"error": "bad_request", "detail": str(e)})
+                except Exception as e:
+                    self._send(500, {"error": "inference_failed", "detail": f"{type(e).__name__}: {e}"})
+
+            def _send(self, status: int, payload: dict):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
@@ -0,0 +1,49 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from . import metrics
+
+# 요청 1건 동안의 구간별 소요시간(ms)을 모으는 dict. collect() 밖에서는 None → 요청별 기록은 생략
+# (프로세스 전체 집계는 collect 여부와 상관없이 metrics에 항상 쌓임)
+_current: ContextVar[dict | None] = ContextVar("chat_timings", default=None)
+
+
+@contextmanager
+def collect():
+    """
+    with collect() as timings: ... 블록 안에서 실행된 span들의 소요시간을 timings에 모음
+    예) {"flight_ctx": 3.1, "embed": 41.0, "chroma_query": 7.9, "prompt_build": 0.1, "generate": 2310.4,
+         "tokens": {"prompt": 812, "completion": 95}}
+    """
+    timings: dict = {}
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        metrics.observe_stage(name, elapsed)
+        timings = _current.get()
+        if timings is not None:
+            # 같은 구간이 여러 번 불리면 합산
+            timings[name] = timings.get(name, 0.0) + elapsed * 1000
+
+
+def add_tokens(kind: str, n: int | None):
+    """kind: "prompt" | "completion" ... 토큰 수를 요청별 timings와 전체 카운터에 기록"""
+    if not n:
+        return
+    metrics.inc("chat_tokens_total", n, kind=kind)
+    timings = _current.get()
+    if timings is not None:
+        tokens = timings.setdefault("tokens", {})
+        tokens[kind] = tokens.get(kind, 0) + n
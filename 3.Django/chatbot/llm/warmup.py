@@ -0,0 +1,85 @@
+import threading
+import time
+
+from django.conf import settings
+
+# 워커 프로세스 단위 준비 상태 (health 엔드포인트에서 그대로 내려줌)
+_state = {
+    "status": "cold",     # cold → warming → ready | failed
+    "steps": {},          # 단계별 소요시간(ms)
+    "error": None,
+    "started_at": None,
+    "finished_at": None,
+}
+_lock = threading.Lock()
+
+
+def state() -> dict:
+    with _lock:
+        return {**_state, "steps": dict(_state["steps"])}
+
+
+def _step(name: str, fn):
+    t0 = time.perf_counter()
+    fn()
+    with _lock:
+        _state["steps"][name] = round((time.perf_counter() - t0) * 1000, 1)
+
+
+def _ping_ollama():
+    # 1토큰만 생성시켜서 Ollama가 모델을 VRAM에 올리게 하고, keep_alive 동안 유지시킴
+    from langchain_ollama import ChatOllama
+
+    ChatOllama(
+        model=settings.OLLAMA_MODEL,
+        base_url=settings.OLLAMA_BASE_URL,
+        keep_alive=settings.OLLAMA_KEEP_ALIVE,
+        num_predict=1,
+        temperature=0,
+    ).invoke("ping")
+
+
+def warm_up() -> dict:
+    """
+    임베딩 모델/_vectordb/_llm lru_cache를 채우고 더미 encode + query까지 한 번 돌려서
+    첫 사용자 요청이 모델 로딩 비용을 내지 않도록 함. 이미 진행/완료된 경우 현재 상태만 반환.
+    """
+    with _lock:
+        if _state["status"] in ("warming", "ready"):
+            return {**_state, "steps": dict(_state["steps"])}
+        _state.update(status="warming", steps={}, error=None, started_at=time.time(), finished_at=None)
+
+    try:
+        # torch/chromadb 없음, 모델 경로 오류 등 import 단계 실패도 failed로 남김
+        from . import inference
+        from .chain import _llm
+        from .context_budget import load_tokenizer
+        from .rag import _vectordb
+
+        emb = {}
+        if inference._sidecar_url():
+            # 모델은 사이드카가 들고 있으므로 연결만 확인
+            _step("sidecar_health", inference.sidecar_health)
+        else:
+            _step("embed_load", inference._embedder)
+        _step("embed_encode", lambda: emb.setdefault("v", inference.embed(["항공편 지연 보상"])[0]))
+        _step("chroma_open", _vectordb)
+        _step("chroma_query", lambda: _vectordb()._collection.query(
+            query_embeddings=[emb["v"]], n_results=1, include=["documents"],
+        ))
+        _step("context_tokenizer", load_tokenizer)
+        _step("llm_client", _llm)
+        _step("ollama_load", _ping_ollama)
+    except Exception as e:
+        with _lock:
+            _state.update(status="failed", error=f"{type(e).__name__}: {e}", finished_at=time.time())
+        return state()
+
+    with _lock:
+        _state.update(status="ready", finished_at=time.time())
+    return state()
+
+
+def start_background_warmup():
+    # 요청 처리를 막지 않도록 데몬 스레드에서 진행
+    threading.Thread(target=warm_up, name="chatbot-warmup", daemon=True).start()
@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+
+from chatbot.llm import chain
+from chatbot.llm.fake_ollama import FakeOllamaServer
+from chatbot.llm.tracing import collect
+
+STAGES = ("flight_ctx", "embed", "chroma_query", "prompt_build", "generate")
+
+
+def _pct(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(round(q * (len(s) - 1))))]
+
+
+class Command(BaseCommand):
+    help = "Load-test /api/chat/ with N concurrent users (optionally against a fake local Ollama)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=4, help="concurrent users")
+        parser.add_argument("--requests", type=int, default=5, help="requests per user")
+        parser.add_argument("--message", type=str, default="KE1401 항공편이 2시간 지연되면 보상을 받을 수 있나요?")
+        parser.add_argument("--airport", type=str, default="")
+        parser.add_argument("--real", action="store_true", help="use the real Ollama server in settings instead of the fake one")
+        parser.add_argument("--tokens", type=int, default=64, help="fake server: tokens per reply")
+        parser.add_argument("--tps", type=float, default=30.0, help="fake server: tokens per second (0 = instant)")
+        parser.add_argument("--ttft-ms", type=float, default=300.0, help="fake server: time to first token")
+
+    def handle(self, *args, **opts):
+        fake = None
+        if not opts["real"]:
+            fake = FakeOllamaServer(
+                tokens=opts["tokens"], tps=opts["tps"], ttft_ms=opts["ttft_ms"],
+                model=settings.OLLAMA_MODEL,
+            ).start()
+            settings.OLLAMA_BASE_URL = fake.base_url
+            chain._llm.cache_clear()
+            self.stdout.write(f"fake ollama: {fake.base_url} tokens={opts['tokens']} tps={opts['tps']} ttft={opts['ttft_ms']}ms")
+
+        body = json.dumps({"message": opts["message"], "airport": opts["airport"]})
+        lock = threading.Lock()
+        samples: list[dict] = []
+        errors = 0
+
+        def one_request(client: Client) -> dict:
+            with collect() as timings:
+                t0 = time.perf_counter()
+                r = client.post("/api/chat/", data=body, content_type="application/json")
+                timings["total"] = (time.perf_counter() - t0) * 1000
+            timings["ok"] = r.status_code == 200
+            return timings
+
+        def user_loop(_):
+            nonlocal errors
+            client = Client(HTTP_HOST="127.0.0.1")
+            try:
+                for _ in range(opts["requests"]):
+                    t = one_request(client)
+                    with lock:
+                        if t.pop("ok"):
+                            samples.append(t)
+                        else:
+                            errors += 1
+            finally:
+                connection.close()  # 스레드별 DB 커넥션 정리
+
+        try:
+            # 모델/DB 로딩 비용은 측정에서 제외 (콜드스타트는 별도 문제)
+            self.stdout.write("warm-up request...")
+            one_request(Client(HTTP_HOST="127.0.0.1"))
+
+            t_start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=opts["users"]) as ex:
+                list(ex.map(user_loop, range(opts["users"])))
+            wall = time.perf_counter() - t_start
+        finally:
+            if fake:
+                fake.stop()
+
+        n = len(samples)
+        self.stdout.write("")
+        self.stdout.write(f"users={opts['users']} requests={n + errors} ok={n} errors={errors} wall={wall:.2f}s")
+        self.stdout.write(f"throughput: {n / wall if wall else 0:.2f} req/s")
+        completion = sum((s.get("tokens") or {}).get("completion", 0) for s in samples)
+        if completion:
+            self.stdout.write(f"generation: {completion / wall:.1f} tokens/s (all users)")
+        self.stdout.write(f"{'stage':<14}{'mean':>10}{'p50':>10}{'p95':>10}{'max':>10}  (ms)")
+        for stage in STAGES + ("total",):
+            vals = [s.get(stage, 0.0) for s in samples]
+            if not vals:
+                continue
+            self.stdout.write(
+                f"{stage:<14}{sum(vals) / len(vals):>10.1f}{_pct(vals, 0.5):>10.1f}"
+                f"{_pct(vals, 0.95):>10.1f}{max(vals):>10.1f}"
+            )
+        self.stdout.write(self.style.SUCCESS("Chat benchmark done"))
@@ -0,0 +1,66 @@
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# 이 모듈들이 URLconf 로딩만으로 올라오면 안 됨 (첫 챗 요청 때 lazy import)
+HEAVY_MODULES = (
+    "torch", "transformers", "sentence_transformers",
+    "langchain_ollama", "langchain_chroma", "chromadb",
+)
+
+# 새 인터프리터에서 관리 명령과 같은 경로(django.setup + URLconf 로드)를 밟고 측정값을 JSON으로 출력
+PROBE = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "flight_issue_compensation.settings")
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+elapsed = time.perf_counter() - t0
+heavy = [m for m in json.loads(sys.argv[1]) if m in sys.modules]
+try:
+    import resource
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KB 단위
+except ImportError:  # Windows에는 resource 모듈이 없음
+    rss_mb = None
+print(json.dumps({"ms": elapsed * 1000, "rss_mb": rss_mb, "heavy": heavy, "modules": len(sys.modules)}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure cold import time/RSS of django.setup() + URLconf (what every cron sync command pays)"
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--budget-ms", type=float, default=1000.0, help="fail if median exceeds this")
+
+    def handle(self, *args, **opts):
+        runs = []
+        for _ in range(opts["runs"]):
+            out = subprocess.run(
+                [sys.executable, "-c", PROBE, json.dumps(HEAVY_MODULES)],
+                cwd=Path(settings.BASE_DIR), capture_output=True, text=True, check=True,
+            )
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+        ms = [r["ms"] for r in runs]
+        last = runs[-1]
+        self.stdout.write(f"startup: median={statistics.median(ms):.0f}ms min={min(ms):.0f}ms max={max(ms):.0f}ms (runs={len(ms)})")
+        rss = "n/a" if last["rss_mb"] is None else f"{last['rss_mb']:.0f} MB"
+        self.stdout.write(f"max RSS: {rss}, modules loaded: {last['modules']}")
+
+        problems = []
+        if last["heavy"]:
+            problems.append(f"heavy modules imported at startup: {', '.join(last['heavy'])}")
+        if statistics.median(ms) > opts["budget_ms"]:
+            problems.append(f"median {statistics.median(ms):.0f}ms over budget {opts['budget_ms']:.0f}ms")
+        if problems:
+            raise CommandError("; ".join(problems))
+        self.stdout.write(self.style.SUCCESS("Import benchmark OK"))
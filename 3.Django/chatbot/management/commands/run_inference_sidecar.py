@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from chatbot.llm.sidecar import InferenceSidecar
+
+
+class Command(BaseCommand):
+    help = "Run the local inference sidecar that owns the embedding (and optional HF generate) model for all web workers"
+
+    # 웹 워커가 아니라 모델 서버라 URL/DB 체크는 필요 없음
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--max-batch", type=int, default=32, help="max texts per embedding batch")
+        parser.add_argument("--max-wait-ms", type=float, default=5.0, help="how long to wait for more requests to batch")
+        parser.add_argument("--generate", action="store_true", help="also load the HF causal LM (loader.py) and serve /generate")
+        parser.add_argument("--no-preload", action="store_true", help="load models on first request instead of at start")
+
+    def handle(self, *args, **opts):
+        sidecar = InferenceSidecar(
+            host=opts["host"],
+            port=opts["port"],
+            max_batch=opts["max_batch"],
+            max_wait_ms=opts["max_wait_ms"],
+            enable_generate=opts["generate"],
+        )
+        if not opts["no_preload"]:
+            self.stdout.write("loading models...")
+            sidecar.preload()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Inference sidecar listening on {sidecar.base_url} "
+            f"(set INFERENCE_SIDECAR_URL={sidecar.base_url} for the web workers)"
+        ))
+        try:
+            sidecar.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sidecar.stop()
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from chatbot.llm.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = "Preload embedding model, Chroma and the Ollama model (run before switching traffic to a new deploy)"
+
+    def handle(self, *args, **options):
+        st = warm_up()
+        for name, ms in st["steps"].items():
+            self.stdout.write(f"{name:<14}{ms:>10.1f} ms")
+
+        if st["status"] != "ready":
+            raise CommandError(f"warm-up failed: {st['error']}")
+
+        # 이 프로세스의 lru_cache는 명령 종료와 함께 사라지지만,
+        # Ollama 쪽 모델 로드(keep_alive)와 HF 모델 파일 다운로드/디스크 캐시는 유지됨
+        self.stdout.write(self.style.SUCCESS("Chatbot warm-up done"))
@@ -1,3 +1,618 @@
-from django.test import TestCase
+import importlib
+import importlib.util
+import io
+import json
+import socket
+import sys
+import threading
+import time
+import unittest
+from collections import defaultdict
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import requests
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from chatbot.llm import context_budget, inference, metrics, rag, sidecar, warmup
+from chatbot.llm.entities import extract_flight_query, find_airlines
+from chatbot.llm.flight_ctx import _changed_time, find_flight_context
+from chatbot.llm.route_type import classify_route, country_of
+from chatbot.llm.tracing import add_tokens, collect, span
+from chatbot.management.commands.bench_imports import HEAVY_MODULES
+from dashboard import airports
+from dashboard.models import FlightSnapshot
+
+
+# 토크나이저 없이(글자 수 추정) 돌려서 HF 다운로드 없이 결과가 항상 같게
+@mock.patch.object(context_budget, "_tokenizer", return_value=None)
+class AssembleContextTests(SimpleTestCase):
+    A = "지연 보상은 3시간 이상 지연 시 지급됩니다. 수하물은 23kg까지 무료입니다."
+    B = "수하물은 23kg까지 무료입니다. 기내식은 국제선에서 제공됩니다."
+
+    def test_within_budget_only_drops_overlap(self, _):
+        out = context_budget.assemble_context("지연 보상 기준", [self.A, self.B])
+        self.assertEqual(out.count("수하물은 23kg까지 무료입니다."), 1)
+        self.assertEqual(out.split("\n\n"), [self.A, "기내식은 국제선에서 제공됩니다."])
+
+    def test_over_budget_keeps_relevant_sentences(self, _):
+        out = context_budget.assemble_context("지연 보상 기준", [self.A, self.B], budget_tokens=15)
+        self.assertEqual(out, "지연 보상은 3시간 이상 지연 시 지급됩니다.")
+        self.assertLessEqual(context_budget.count_tokens(out), 15)
+
+    def test_keeps_document_order(self, _):
+        out = context_budget.assemble_context("기내식 수하물", [self.A, self.B], budget_tokens=25)
+        self.assertEqual(out, "수하물은 23kg까지 무료입니다.\n\n기내식은 국제선에서 제공됩니다.")
+
+    def test_empty(self, _):
+        self.assertEqual(context_budget.assemble_context("지연", []), "")
+        self.assertEqual(context_budget.assemble_context("지연", ["", "  "]), "")
+
+
+class ContextTokenizerTests(SimpleTestCase):
+    def setUp(self):
+        self.auto = mock.Mock()
+        patcher = mock.patch.dict(sys.modules, {"transformers": SimpleNamespace(AutoTokenizer=self.auto)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        context_budget._tokenizer.cache_clear()
+        self.addCleanup(context_budget._tokenizer.cache_clear)
+
+    def test_request_path_never_downloads(self):
+        self.auto.from_pretrained.side_effect = OSError("not in cache")
+        with self.assertLogs("chatbot.llm.context_budget", "WARNING") as logs:
+            self.assertEqual(context_budget.count_tokens("지연 보상 기준"), 5)
+        self.auto.from_pretrained.assert_called_once_with(context_budget.TOKENIZER_NAME, local_files_only=True)
+        self.assertIn("estimating tokens from characters", logs.output[0])
+
+    def test_warmup_downloads_then_loads_from_cache(self):
+        tok = mock.Mock()
+        tok.encode.return_value = [1, 2, 3]
+        self.auto.from_pretrained.return_value = tok
+        self.assertIs(context_budget.load_tokenizer(), tok)
+        self.assertEqual(self.auto.from_pretrained.call_args_list, [
+            mock.call(context_budget.TOKENIZER_NAME),
+            mock.call(context_budget.TOKENIZER_NAME, local_files_only=True),
+        ])
+        self.assertEqual(context_budget.count_tokens("지연"), 3)
+
+    def test_warmup_download_failure_falls_back(self):
+        self.auto.from_pretrained.side_effect = OSError("offline")
+        with self.assertLogs("chatbot.llm.context_budget", "WARNING") as logs:
+            self.assertIsNone(context_budget.load_tokenizer())
+        self.assertIn("download failed (OSError: offline)", logs.output[0])
+
+
+class FlightQueryTests(SimpleTestCase):
+    NOW = datetime(2026, 10, 19, 9, 0)
+
+    def extract(self, text):
+        return extract_flight_query(text, self.NOW)
+
+    def test_flight_number(self):
+        res = self.extract("KE1401 지연됐어?")
+        self.assertEqual(res["flight_no"], "KE1401")
+        self.assertEqual((res["airline_code"], res["airline_name"]), ("KE", "대한항공"))
+        self.assertEqual(res["date"], "20261019")
+        self.assertTrue(res["confident"])
+
+    def test_aircraft_type_is_not_a_flight_number(self):
+        res = self.extract("A380 지연")
+        self.assertEqual(res["flight_no"], "N/A")
+        self.assertEqual(res["airline_code"], "N/A")
+        self.assertFalse(res["confident"])
+
+    def test_route_with_spaced_flight_number(self):
+        res = self.extract("김포에서 제주 가는 KE 1201")
+        self.assertEqual(res["flight_no"], "KE1201")
+        self.assertEqual(res["departure"], ["GMP"])
+        self.assertEqual(res["destination"], ["CJU"])
+
+    def test_route_separator_and_relative_date(self):
+        res = self.extract("내일 김포-제주 대한항공")
+        self.assertEqual((res["departure"], res["destination"]), (["GMP"], ["CJU"]))
+        self.assertEqual(res["date"], "20261020")
+        self.assertTrue(res["confident"])
+
+    def test_city_expands_to_airports_and_past_date_rolls_to_next_year(self):
+        res = self.extract("10/3 인천에서 오사카")
+        self.assertEqual(res["departure"], ["ICN"])
+        self.assertEqual(res["destination"], ["KIX", "ITM"])
+        self.assertEqual(res["date"], "20271003")
+
+    def test_follow_up_goes_to_llm(self):
+        self.assertFalse(self.extract("아까 그 비행기 결항이야?")["confident"])
+
+
+class FindAirlinesTests(SimpleTestCase):
+    def test_domestic_two_letter_code(self):
+        self.assertEqual(find_airlines("TW 보상"), [("TW", "티웨이항공", "티웨이")])
+
+    def test_foreign_code_alias_is_ignored(self):
+        self.assertEqual(find_airlines("IT 회사"), [])
+
+    def test_name_inside_longer_match(self):
+        # "제주항공" 안의 "제주"는 공항으로 따로 잡지 않음
+        self.assertEqual(find_airlines("제주항공 수하물"), [("7C", "제주항공", "제주항공")])
+        self.assertEqual(extract_flight_query("제주항공 수하물")["destination"], [])
+
+    def test_order_and_dedupe(self):
+        self.assertEqual(
+            [code for code, _, _ in find_airlines("아시아나 OZ101 말고 대한항공")],
+            ["OZ", "KE"],
+        )
+
+
+class AirportTableTests(SimpleTestCase):
+    NOW = datetime(2026, 10, 19, 9, 0)
+
+    def test_same_airport_for_every_caller(self):
+        # airports.csv 한 줄(CJU,RKPC,제주,...,182)이 챗봇/날씨 동기화/예보/지연 예측에서 같은 공항으로
+        cju = airports.get_airport("CJU")
+        self.assertEqual(cju.stn, "182")
+        self.assertIs(airports.get_airport("제주공항"), cju)
+        self.assertIs(airports.get_airport("RKPC"), cju)
+        self.assertIs(airports.airport_by_stn("182"), cju)
+        self.assertEqual(airports.AIRPORT_TO_STN["CJU"], "182")
+        self.assertEqual(airports.get_nxny("제주"), (cju.nx, cju.ny))
+        self.assertEqual(airports.IATA_TO_KOR["CJU"], "제주")
+        self.assertEqual(extract_flight_query("김포에서 제주", self.NOW)["destination"], ["CJU"])
+
+    def test_aliases_and_every_domestic_airport(self):
+        self.assertEqual(extract_flight_query("부산 가는 편", self.NOW)["destination"], ["PUS"])
+        self.assertEqual(extract_flight_query("포항 출발", self.NOW)["departure"], ["KPO"])
+        for a in airports.all_airports():
+            with self.subTest(a.iata):
+                res = extract_flight_query(f"{a.kor}에서 나리타", self.NOW)
+                self.assertEqual((res["departure"], res["destination"]), ([a.iata], ["NRT"]))
+
+
+class ClassifyRouteTests(SimpleTestCase):
+    def test_domestic(self):
+        self.assertEqual(classify_route("GMP", "CJU"), "국내")
+        # current_info처럼 리스트/소문자가 와도 첫 코드로
+        self.assertEqual(classify_route(["ICN", "GMP"], "cju"), "국내")
+
+    def test_international(self):
+        self.assertEqual(classify_route("ICN", "NRT"), "국제")
+        self.assertEqual(classify_route("NRT", "PVG"), "국제")
+        # 한쪽이 국내면 모르는 해외 공항이어도 국제
+        self.assertEqual(classify_route("GMP", "XYZ"), "국제")
+
+    def test_unknown(self):
+        self.assertEqual(classify_route("XYZ", "ABC"), "정보 없음")
+        self.assertEqual(classify_route("ICN", "N/A"), "정보 없음")
+        self.assertEqual(classify_route(None, []), "정보 없음")
+
+    def test_every_domestic_airport_is_kr(self):
+        for a in airports.all_airports():
+            self.assertEqual(country_of(a.iata), "KR", a.iata)
+
+
+class FlightContextTests(TestCase):
+    def create(self, **kw):
+        fields = {"airport_code": "GMP", "kind": "dep", "flight_date": timezone.localdate().strftime("%Y%m%d"),
+                  "airline": "대한항공", "origin": "김포", "destination": "제주", "flight_no": "KE1201", **kw}
+        return FlightSnapshot.objects.create(**fields)
+
+    def test_changed_time_past_midnight(self):
+        self.create(std="2350", etd="0020", gate="12", status="지연")
+        ctx = find_flight_context("KE1201 지연됐어?")
+        tomorrow = (timezone.localdate() + timedelta(days=1)).strftime("%Y%m%d")
+        self.assertIn(f"- 변경시간: {tomorrow} 0020\n", ctx)
+        self.assertIn("- 지연: 30분\n", ctx)
+        self.assertIn("- 게이트: 12\n", ctx)
+
+    def test_changed_time_with_2400_std(self):
+        # 피드의 "2400"(그날 24:00 = 다음 날 00:00)도 500 없이 처리
+        self.create(std="2400", etd="0010")
+        tomorrow = (timezone.localdate() + timedelta(days=1)).strftime("%Y%m%d")
+        self.assertIn(f"- 변경시간: {tomorrow} 0010\n", find_flight_context("KE1201 지연됐어?"))
+
+    def test_changed_time_helper(self):
+        self.assertEqual(_changed_time("20261019", "2350", 30), "20261020 0020")
+        self.assertEqual(_changed_time("20261019", "2400", 10), "20261020 0010")
+        self.assertEqual(_changed_time("20261019", "0005", -10), "20261018 2355")
+        self.assertEqual(_changed_time("20261019", "1000", 45), "20261019 1045")
+        self.assertIsNone(_changed_time("20261019", "10:0", 45))
+        self.assertIsNone(_changed_time("20261019", "1000", None))
+
+    def test_flight_number_matches_entities(self):
+        self.create(std="1000")
+        self.assertIn("- 편명: KE1201\n", find_flight_context("ke 1201 언제 출발해?"))
+        # 기종(A380)이나 모르는 코드는 편명으로 보지 않음
+        self.assertEqual(find_flight_context("A380 타는데 KE 항공편 있어?"), "")
+
+    def test_no_flight(self):
+        self.assertEqual(find_flight_context("KE1201 지연됐어?"), "")
+        self.assertEqual(find_flight_context("수하물 규정"), "")
+
+
+class _FreshMetrics(SimpleTestCase):
+    # metrics는 프로세스 전역 집계 → 테스트마다 빈 집계로
+    def setUp(self):
+        for name, empty in (("_stage_hist", {}), ("_counters", defaultdict(float))):
+            patcher = mock.patch.object(metrics, name, empty)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TracingTests(_FreshMetrics):
+    def test_nested_spans_and_tokens(self):
+        with collect() as timings:
+            with span("generate"):
+                for _ in range(2):
+                    with span("embed"):
+                        time.sleep(0.002)
+            add_tokens("prompt", 800)
+            add_tokens("prompt", 12)
+            add_tokens("completion", 95)
+            add_tokens("completion", None)
+
+        self.assertEqual(set(timings), {"generate", "embed", "tokens"})
+        # 같은 구간은 합산, 바깥 구간은 안쪽을 포함
+        self.assertGreaterEqual(timings["embed"], 4)
+        self.assertGreaterEqual(timings["generate"], timings["embed"])
+        self.assertEqual(timings["tokens"], {"prompt": 812, "completion": 95})
+        self.assertEqual(metrics._stage_hist["embed"][2], 2)
+        self.assertEqual(metrics._counters[("chat_tokens_total", (("kind", "prompt"),))], 812)
+
+    def test_outside_collect_only_updates_metrics(self):
+        with span("embed"):
+            pass
+        add_tokens("prompt", 3)
+        with collect() as timings:
+            pass
+        self.assertEqual(timings, {})
+        self.assertEqual(metrics._stage_hist["embed"][2], 1)
+        self.assertEqual(metrics._counters[("chat_tokens_total", (("kind", "prompt"),))], 3)
+
+
+class MetricsRenderTests(_FreshMetrics):
+    def test_histogram_buckets(self):
+        metrics.observe_stage("embed", 0.03)
+        metrics.observe_stage("embed", 0.01)
+        metrics.observe_stage("embed", 120)
+        text = metrics.render()
+        self.assertIn("# TYPE chat_stage_seconds histogram\n", text)
+        # 버킷은 누적(le 이하 전부), 60초를 넘은 건 +Inf에만
+        self.assertIn('chat_stage_seconds_bucket{stage="embed",le="0.005"} 0\n', text)
+        self.assertIn('chat_stage_seconds_bucket{stage="embed",le="0.01"} 1\n', text)
+        self.assertIn('chat_stage_seconds_bucket{stage="embed",le="0.025"} 1\n', text)
+        self.assertIn('chat_stage_seconds_bucket{stage="embed",le="0.05"} 2\n', text)
+        self.assertIn('chat_stage_seconds_bucket{stage="embed",le="60.0"} 2\n', text)
+        self.assertIn('chat_stage_seconds_bucket{stage="embed",le="+Inf"} 3\n', text)
+        self.assertIn('chat_stage_seconds_sum{stage="embed"} 120.040000\n', text)
+        self.assertIn('chat_stage_seconds_count{stage="embed"} 3\n', text)
+
+    def test_counters(self):
+        metrics.inc("chat_requests_total", status="ok")
+        metrics.inc("chat_requests_total", status="ok")
+        metrics.inc("chat_requests_total", status="error")
+        metrics.inc("chat_tokens_total", 1.5, kind="prompt")
+        self.assertEqual(metrics.render(), "\n".join([
+            "# TYPE chat_requests_total counter",
+            'chat_requests_total{status="error"} 1',
+            'chat_requests_total{status="ok"} 2',
+            "# TYPE chat_tokens_total counter",
+            'chat_tokens_total{kind="prompt"} 1.5',
+        ]) + "\n")
+
+    def test_empty(self):
+        self.assertEqual(metrics.render(), "\n")
+
+
+def _fake_answer_question(message, airport=None):
+    with span("embed"):
+        pass
+    with span("generate"):
+        add_tokens("prompt", 10)
+        add_tokens("completion", 4)
+    if message == "boom":
+        raise RuntimeError("ollama down")
+    return f"{airport}: {message}"
+
+
+# chain(langchain/torch)은 import하지 않고 가짜 모듈로 바꿔서
+@mock.patch.dict(sys.modules, {"chatbot.llm.chain": SimpleNamespace(answer_question=_fake_answer_question)})
+class ChatViewTests(_FreshMetrics):
+    def chat(self, body, query=""):
+        return self.client.post(f"/api/chat/{query}", json.dumps(body), content_type="application/json")
+
+    def test_timings(self):
+        res = self.chat({"message": "지연 보상", "airport": "gmp", "timings": True})
+        self.assertEqual(res.status_code, 200)
+        body = res.json()
+        self.assertEqual(body["reply"], "GMP: 지연 보상")
+        self.assertEqual(set(body["timings"]), {"embed", "generate", "tokens"})
+        self.assertEqual(body["timings"]["tokens"], {"prompt": 10, "completion": 4})
+
+        self.assertIn("timings", self.chat({"message": "지연 보상"}, "?timings=1").json())
+        self.assertNotIn("timings", self.chat({"message": "지연 보상"}).json())
+
+    def test_metrics_endpoint(self):
+        self.chat({"message": "지연 보상"})
+        res = self.chat({"message": "boom"})
+        self.assertEqual(res.status_code, 500)
+        self.assertEqual(res.json()["detail"], "ollama down")
+
+        res = self.client.get("/metrics/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        text = res.content.decode()
+        self.assertIn('chat_requests_total{status="ok"} 1\n', text)
+        self.assertIn('chat_requests_total{status="error"} 1\n', text)
+        self.assertIn('chat_tokens_total{kind="completion"} 8\n', text)
+        self.assertIn('chat_stage_seconds_count{stage="generate"} 2\n', text)
+        self.assertEqual(self.client.post("/metrics/").status_code, 405)
+
+    def test_bad_request(self):
+        self.assertEqual(self.chat({"message": "  "}).json(), {"error": "empty_message"})
+        res = self.client.post("/api/chat/", "{", content_type="application/json")
+        self.assertEqual((res.status_code, res.json()), (400, {"error": "invalid_json"}))
+
+
+@override_settings(INFERENCE_SIDECAR_URL="")
+class WarmupTests(SimpleTestCase):
+    STEPS = ["embed_load", "embed_encode", "chroma_open", "chroma_query", "context_tokenizer", "llm_client", "ollama_load"]
+
+    def setUp(self):
+        # 워밍업 상태는 워커 전역 → 테스트마다 cold에서 시작
+        patchers = [
+            mock.patch.dict(warmup._state, status="cold", steps={}, error=None, started_at=None, finished_at=None),
+            mock.patch.dict(sys.modules, {"chatbot.llm.chain": SimpleNamespace(_llm=self.step)}),
+            mock.patch.object(inference, "_embedder", self.step),
+            mock.patch.object(inference, "embed", lambda texts: [[0.1, 0.2]]),
+            mock.patch.object(rag, "_vectordb", lambda: SimpleNamespace(_collection=self.collection)),
+            mock.patch.object(context_budget, "load_tokenizer", self.step),
+            mock.patch.object(warmup, "_ping_ollama", self.step),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+        self.collection = mock.Mock()
+        self.seen = []
+
+    def step(self):
+        # 단계가 도는 동안 밖에서 보이는 상태
+        self.seen.append(warmup.state()["status"])
+
+    def health(self):
+        return self.client.get("/api/chat/health/")
+
+    def test_cold_warming_ready(self):
+        res = self.health()
+        self.assertEqual((res.status_code, res.json()["status"]), (503, "cold"))
+
+        with mock.patch.object(warmup, "_ping_ollama", lambda: self.seen.append(self.health().status_code)):
+            st = warmup.warm_up()
+        self.assertEqual(self.seen, ["warming", "warming", "warming", 503])
+        self.assertEqual((st["status"], st["error"]), ("ready", None))
+        self.assertEqual(list(st["steps"]), self.STEPS)
+        self.collection.query.assert_called_once_with(query_embeddings=[[0.1, 0.2]], n_results=1, include=["documents"])
+
+        res = self.health()
+        self.assertEqual((res.status_code, res.json()["status"]), (200, "ready"))
+        # 이미 끝났으면 다시 돌지 않음
+        self.assertEqual(warmup.warm_up()["finished_at"], st["finished_at"])
+        self.collection.query.assert_called_once()
+
+    def test_step_failure_then_retry(self):
+        self.collection.query.side_effect = RuntimeError("collection missing")
+        st = warmup.warm_up()
+        self.assertEqual((st["status"], st["error"]), ("failed", "RuntimeError: collection missing"))
+        self.assertEqual(list(st["steps"]), self.STEPS[:3])
+        self.assertEqual(self.health().status_code, 503)
+
+        self.collection.query.side_effect = None
+        self.assertEqual(warmup.warm_up()["status"], "ready")
+        self.assertEqual(self.health().status_code, 200)
+
+    def test_import_failure(self):
+        # torch/langchain 없음 같은 import 단계 실패도 warming에 멈추지 않고 failed
+        with mock.patch.dict(sys.modules, {"chatbot.llm.chain": None}):
+            st = warmup.warm_up()
+        self.assertEqual(st["status"], "failed")
+        self.assertTrue(st["error"].startswith("ModuleNotFoundError"))
+        self.assertEqual(st["steps"], {})
+        res = self.health()
+        self.assertEqual((res.status_code, res.json()["status"]), (503, "failed"))
+
+    def test_sidecar_only_checks_health(self):
+        with override_settings(INFERENCE_SIDECAR_URL="http://sidecar"), \
+                mock.patch.object(inference, "sidecar_health", self.step):
+            st = warmup.warm_up()
+        self.assertEqual(st["status"], "ready")
+        self.assertEqual(list(st["steps"]), ["sidecar_health", *self.STEPS[1:]])
+
+
+class LazyImportTests(SimpleTestCase):
+    def test_urlconf_does_not_import_llm_stack(self):
+        # 앱 코드와 무거운 모듈을 sys.modules에서 빼고 URLconf만 다시 읽음 (모델/앱 설정은 그대로 재사용)
+        def reloadable(name):
+            top = name.split(".")[0]
+            if top in HEAVY_MODULES:
+                return True
+            return top in ("chatbot", "dashboard", "flight_issue_compensation") and \
+                not name.endswith((".models", ".apps", ".tests")) and name.count(".") > 0
+
+        with mock.patch.dict(sys.modules):
+            for name in [n for n in sys.modules if reloadable(n)]:
+                del sys.modules[name]
+            importlib.import_module(settings.ROOT_URLCONF)
+            self.assertIn("chatbot.views", sys.modules)
+            self.assertEqual([m for m in HEAVY_MODULES if m in sys.modules], [])
+
+    def test_bench_imports_command(self):
+        out = io.StringIO()
+        call_command("bench_imports", runs=1, budget_ms=60000, stdout=out)
+        self.assertIn("Import benchmark OK", out.getvalue())
+        with self.assertRaisesMessage(CommandError, "over budget 0ms"):
+            call_command("bench_imports", runs=1, budget_ms=0, stdout=out)
+
+
+def _fake_embed(texts, batch_size=32):
+    return [[float(len(t)), 1.0] for t in texts]
+
+
+class MicroBatcherTests(SimpleTestCase):
+    def test_concurrent_requests_share_one_call(self):
+        calls = []
+
+        def fn(flat):
+            calls.append(list(flat))
+            return [x * 10 for x in flat]
+
+        batcher = sidecar.MicroBatcher(fn, max_batch=100, max_wait_ms=200)
+        results = {}
+        threads = [threading.Thread(target=lambda i=i: results.update({i: batcher.submit([i, i + 100])}))
+                   for i in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+
+        # 요청별 결과는 제 입력 순서대로 돌아감
+        self.assertEqual(results, {i: [i * 10, (i + 100) * 10] for i in range(3)})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(calls[0]), [0, 1, 2, 100, 101, 102])
+        self.assertEqual(batcher.submit([]), [])
+
+    def test_max_batch_and_errors(self):
+        calls = []
+
+        def fn(flat):
+            calls.append(len(flat))
+            if "bad" in flat:
+                raise ValueError("bad input")
+            return flat
+
+        batcher = sidecar.MicroBatcher(fn, max_batch=2, max_wait_ms=1000)
+        t0 = time.monotonic()
+        self.assertEqual(batcher.submit(["a", "b"]), ["a", "b"])
+        # 배치가 차면 max_wait를 기다리지 않음
+        self.assertLess(time.monotonic() - t0, 0.5)
+        with self.assertRaisesMessage(ValueError, "bad input"):
+            batcher.submit(["bad", "x"])
+        self.assertEqual(batcher.submit(["c", "d"]), ["c", "d"])
+        self.assertEqual(calls, [2, 2, 2])
+
+
+class SidecarClientTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(sidecar, "embed_local", _fake_embed)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.server = sidecar.InferenceSidecar(port=0, max_wait_ms=1)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.stop)
+        settings_patch = override_settings(INFERENCE_SIDECAR_URL=self.server.base_url + "/")
+        settings_patch.enable()
+        self.addCleanup(settings_patch.disable)
+
+    def test_embed_rerank_and_health(self):
+        with mock.patch.object(inference, "embed_local", side_effect=AssertionError("ran locally")):
+            self.assertEqual(inference.embed(["ab", "가나다"]), [[2.0, 1.0], [3.0, 1.0]])
+            self.assertEqual(inference.rerank("abc", ["a", "bb"]), [4.0, 7.0])
+            health = inference.sidecar_health()
+        self.assertEqual(health, {"status": "ok", "generate": False,
+                                  "embed_requests": 2, "embed_texts": 5, "generate_requests": 0})
+
+    def test_errors_are_not_masked(self):
+        # 사이드카가 살아 있는데 거절한 요청은 로컬로 돌리지 않고 그대로 오류
+        with mock.patch.object(inference, "generate_local") as local, \
+                self.assertRaises(requests.HTTPError) as cm:
+            inference.generate("안녕")
+        self.assertEqual(cm.exception.response.status_code, 404)
+        self.assertIn("generate disabled", cm.exception.response.json()["detail"])
+        local.assert_not_called()
+
+        res = requests.post(f"{self.server.base_url}/embed", data=b"{", timeout=5)
+        self.assertEqual((res.status_code, res.json()["error"]), (400, "bad_request"))
+        self.assertEqual(requests.get(f"{self.server.base_url}/nope", timeout=5).status_code, 404)
+
+    def test_falls_back_to_local_when_sidecar_is_down(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        with override_settings(INFERENCE_SIDECAR_URL=f"http://127.0.0.1:{port}"), \
+                mock.patch.object(inference, "embed_local", side_effect=_fake_embed) as local, \
+                mock.patch.object(inference, "generate_local", return_value="로컬") as generate_local, \
+                self.assertLogs("chatbot.llm.inference", "WARNING") as logs:
+            self.assertEqual(inference.embed(["abc"]), [[3.0, 1.0]])
+            self.assertEqual(inference.rerank("a", ["bb"]), [3.0])
+            self.assertEqual(inference.generate("안녕", max_new_tokens=8, prefix="p"), "로컬")
+        self.assertEqual(local.call_count, 2)
+        generate_local.assert_called_once_with("안녕", max_new_tokens=8, prefix="p")
+        self.assertIn("unreachable, running /embed locally", logs.output[0])
+        self.assertEqual(self.server.stats["embed_requests"], 0)
+
+
+def _tiny_lm():
+    # 글자 하나 = 토큰 하나인 토크나이저 + 무작위 가중치 작은 Llama (다운로드 없이 CPU에서)
+    import torch
+    from tokenizers import Regex, Tokenizer, decoders, models, pre_tokenizers
+    from transformers import LlamaConfig, LlamaForCausalLM, PreTrainedTokenizerFast
+
+    vocab = {t: i for i, t in enumerate(["<pad>", "</s>", "<unk>", *"abcdefghij 가나다라마바사"])}
+    tok = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    tok.pre_tokenizer = pre_tokenizers.Split(Regex("."), behavior="isolated")
+    tok.decoder = decoders.Fuse()
+    tokenizer = PreTrainedTokenizerFast(tokenizer_object=tok, pad_token="<pad>", eos_token="</s>", unk_token="<unk>")
+
+    torch.manual_seed(0)
+    model = LlamaForCausalLM(LlamaConfig(
+        vocab_size=len(vocab), hidden_size=32, intermediate_size=64, num_hidden_layers=2,
+        num_attention_heads=4, num_key_value_heads=2, max_position_embeddings=128,
+        pad_token_id=0, eos_token_id=1, bos_token_id=None,
+    )).eval()
+    return tokenizer, model
+
+
+@unittest.skipUnless(importlib.util.find_spec("torch") and importlib.util.find_spec("transformers"),
+                     "torch/transformers not installed")
+class BatchGeneratorTests(SimpleTestCase):
+    PROMPTS = ["ab", "abcdefg 가나"]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from chatbot.llm.batching import BatchGenerator
+
+        cls.tokenizer, cls.model = _tiny_lm()
+        cls.gen = BatchGenerator(max_wait_ms=200, tokenizer=cls.tokenizer, model=cls.model)
+
+    def reference(self, prompt, n=8):
+        # HF generate(greedy) 한 건씩 = 정답
+        ids = self.tokenizer(prompt, return_tensors="pt")["input_ids"]
+        out = self.model.generate(ids, attention_mask=ids.new_ones(ids.shape), max_new_tokens=n, do_sample=False)
+        return self.tokenizer.decode(out[0, ids.shape[1]:], skip_special_tokens=True)
+
+    def test_left_padded_batch_matches_single(self):
+        self.assertEqual(self.tokenizer.padding_side, "left")
+        batches = self.gen.stats["batches"]
+        futures = [self.gen.submit(p, max_new_tokens=8, temperature=0) for p in self.PROMPTS]
+        self.assertEqual([f.result() for f in futures], [self.reference(p) for p in self.PROMPTS])
+        self.assertEqual(self.gen.stats["batches"], batches + 1)
+
+    def test_stop_string(self):
+        full = self.reference("ab")
+        stop = full[3]
+        self.assertEqual(self.gen.generate("ab", max_new_tokens=8, temperature=0, stop=(stop,)), full[:full.index(stop)])
+
+    def test_prefix_reuse_matches_full_prompt(self):
+        prefix = "가나다 "
+        expected = self.gen.generate(prefix + "cd", max_new_tokens=8, temperature=0)
+        hits = self.gen.stats["prefix_hits"]
+        self.assertEqual(self.gen.generate("cd", max_new_tokens=8, temperature=0, prefix=prefix), expected)
+        # 두 번째부터는 저장된 prefix KV 캐시 재사용 (저장된 캐시가 배치에 의해 바뀌지 않아야 같은 결과)
+        futures = [self.gen.submit(p, max_new_tokens=8, temperature=0, prefix=prefix) for p in ("cd", "a")]
+        self.assertEqual(futures[0].result(), expected)
+        self.assertEqual(futures[1].result(), self.gen.generate(prefix + "a", max_new_tokens=8, temperature=0))
+        self.assertGreater(self.gen.stats["prefix_hits"], hits)
@@ -1,6 +1,8 @@
 from django.urls import path
-from .views import api_chat
+from .views import api_chat, api_chat_health, metrics_view
 
 urlpatterns = [
     path("api/chat/", api_chat, name="api_chat"),
+    path("api/chat/health/", api_chat_health, name="api_chat_health"),
+    path("metrics/", metrics_view, name="chat_metrics"),
 ]
@@ -1,9 +1,10 @@
 import json
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
-from chatbot.llm.chain import answer_question
-from .llm.chain import answer_question
+from django.views.decorators.http import require_GET, require_POST
+from .llm import metrics
+from .llm.tracing import collect
+from .llm.warmup import state as warmup_state
 
 @csrf_exempt  # 데모 단계에서는 편하게. (나중에 CSRF 적용 가능)
 @require_POST
@@ -18,9 +19,35 @@ def api_chat(request):
     if not message:
         return JsonResponse({"error": "empty_message"}, status=400)
 
+    # {"timings": true} 또는 ?timings=1 이면 구간별 소요시간(ms)/토큰 수를 응답에 같이 내려줌
+    want_timings = bool(payload.get("timings")) or request.GET.get("timings") == "1"
+
     try:
-        reply = answer_question(message, airport=airport)
-        return JsonResponse({"reply": reply})
+        # LLM/RAG 스택(langchain, sentence_transformers→torch)은 첫 챗 요청 때 import
+        # → URLconf를 읽는 관리 명령(sync_weather 등)은 이 비용을 내지 않음
+        from .llm.chain import answer_question
+
+        with collect() as timings:
+            reply = answer_question(message, airport=airport)
+        metrics.inc("chat_requests_total", status="ok")
+        body = {"reply": reply}
+        if want_timings:
+            body["timings"] = {k: (round(v, 1) if isinstance(v, float) else v) for k, v in timings.items()}
+        return JsonResponse(body)
     except Exception as e:
+        metrics.inc("chat_requests_total", status="error")
         # 데모용: 에러 숨기고 메시지만
         return JsonResponse({"error": "chat_failed", "detail": str(e)}, status=500)
+
+
+@require_GET
+def metrics_view(request):
+    # Prometheus 스크랩용 (/metrics/)
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@require_GET
+def api_chat_health(request):
+    # 로드밸런서 readiness 체크용: 워밍업 끝나기 전에는 503
+    st = warmup_state()
+    return JsonResponse(st, status=200 if st["status"] == "ready" else 503)
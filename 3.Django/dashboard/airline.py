@@ -1,42 +1,34 @@
 # dashboard/airline.py
 import os
 import math
-import requests
 from datetime import datetime, date, timedelta  
 from dotenv import load_dotenv
 from zoneinfo import ZoneInfo
 from django.utils import timezone
 from django.core.cache import cache
 
+# 공항코드 -> 공공데이터의 한글 공항명(매칭용) - 현황판 대상 공항 (data/airports.csv)
+from .airports import AIRPORT_KOR
+from .http import get_session
+
 load_dotenv()
 KST = ZoneInfo("Asia/Seoul")
 
 AIRLINE_URL = "https://api.odcloud.kr/api/FlightStatusListDTL/v1/getFlightStatusListDetail"
 
-# 공항코드 -> 공공데이터의 한글 공항명(매칭용)
-AIRPORT_KOR = {
-    "ICN": "인천",
-    "GMP": "김포",
-    "CJU": "제주",
-    "PUS": "김해",  # 부산/김해
-    "MWX": "무안",
-    "USN": "울산",
-    "RSU": "여수",
-    "YNY": "양양",
-}
-
 def _fetch(page: int, per_page: int) -> dict:
     key = os.getenv("airline_key")
     if not key:
         raise RuntimeError("Missing env airline_key")
 
     params = {"page": page, "perPage": per_page, "serviceKey": key}
-    r = requests.get(AIRLINE_URL, params=params, timeout=(3, 20))
+    r = get_session().get(AIRLINE_URL, params=params, timeout=(3, 20))
     r.raise_for_status()
     return r.json()
 
 def _total_pages(per_page: int) -> int:
-    payload = _fetch(page=1, per_page=per_page)
+    # totalCount는 perPage와 무관 → 1건만 받아서 확인
+    payload = _fetch(page=1, per_page=1)
     total_count = payload.get("totalCount")
     if total_count is None:
         # 혹시 키 이름이 다르면 여기서 확인
@@ -121,23 +113,112 @@ def _parse_hhmm(s: str | None) -> str | None:
         return s
     return None
 
-def iter_flights_for_date(target: date, per_page: int = 10000):
+def _std_ordered(items, target_str: str) -> bool:
+    """items 중 target 날짜 행들의 STD가 내림 없이 이어지는지 (STD가 이상한 행은 건너뜀)"""
+    stds = [
+        std for f in items
+        if (f.get("FLIGHT_DATE") or "").strip() == target_str and (std := _parse_hhmm(f.get("STD"))) is not None
+    ]
+    return all(a <= b for a, b in zip(stds, stds[1:]))
+
+def _day_pages(target_str: str, p: int, per_page: int, std_from: str = "0000", std_to: str = "2400"):
+    """
+    p(target이 들어 있는 페이지)부터 앞뒤로 target 날짜가 이어지는 페이지만 받아서 yield.
+    페이지 첫 날짜가 target이면 앞 페이지에도 있을 수 있고, 마지막 날짜가 target이면 뒤 페이지에도 있을 수 있음.
+    데이터가 FLIGHT_DATE, STD 순 정렬이라는 전제에서 STD 구간 [std_from, std_to) 밖으로 나가면 더 받지 않음
+    (앞 페이지는 첫 행 STD가 std_from 이상일 때만, 뒤 페이지는 마지막 행 STD가 std_to 미만일 때만)
+    받은 페이지에서 같은 날짜 안의 STD가 거꾸로 가면 그 전제가 깨진 것 → 날짜 경계만 보고 끝까지 받음
+    (STD 때문에 먼저 멈춘 쪽도 다시 이어서 받음)
+    """
+    items = _fetch(page=p, per_page=per_page).get("data", [])
+    yield items
+    if not items:
+        return
+    ordered = _std_ordered(items, target_str)
+
+    def stop(item, step) -> bool:
+        if (item.get("FLIGHT_DATE") or "").strip() != target_str:
+            return True
+        std = _parse_hhmm(item.get("STD"))
+        # STD가 이상하면 범위를 모르니 계속 받음
+        if not ordered or std is None:
+            return False
+        return std < std_from if step < 0 else std >= std_to
+
+    # 방향별 (마지막으로 받은 페이지, 그 방향 끝 행, 더 받을 게 없는지)
+    ends = {-1: [p, items[0], False], 1: [p, items[-1], False]}
+    while True:
+        todo = [step for step, (_, _, done) in ends.items() if not done]
+        if not todo:
+            return
+        for step in todo:
+            q, edge, _ = ends[step]
+            while not (step < 0 and q <= 1) and not stop(edge, step):
+                q += step
+                page = _fetch(page=q, per_page=per_page).get("data", [])
+                if not page:
+                    edge = None
+                    break
+                yield page
+                ordered = ordered and _std_ordered(page + [edge] if step < 0 else [edge] + page, target_str)
+                edge = page[0] if step < 0 else page[-1]
+            ends[step] = [q, edge, True]
+        if not ordered:
+            # STD 구간 때문에 멈춘 쪽만 날짜 기준으로 다시
+            for step, (q, edge, _) in ends.items():
+                if edge is not None and not (step < 0 and q <= 1) and not stop(edge, step):
+                    ends[step][2] = False
+
+def iter_flights_for_date(target: date, per_page: int = 10000, std_from: str = "0000", std_to: str = "2400"):
     """
     target 날짜의 raw flight dict들을 yield.
-    find_page_for_date로 찾은 페이지 주변을 훑고, FLIGHT_DATE == target만 골라냄.
+    find_page_for_date로 찾은 페이지에서 시작해 target 날짜(+ STD 구간)가 걸친 페이지만 받고, FLIGHT_DATE == target만 골라냄.
+    STD 구간은 페이지를 덜 받기 위한 것 → 걸러내는 건 호출하는 쪽에서 (경계 페이지에는 구간 밖 행도 섞여 있음)
     """
     target_str = target.strftime("%Y%m%d")
     p = find_page_for_date(target, per_page=per_page)
 
-    # 주변 몇 페이지를 보면 충분 (데이터 분포에 따라 조정 가능)
-    pages = [x for x in [p - 2, p - 1, p, p + 1, p + 2] if x >= 1]
-
-    for page in pages:
-        payload = _fetch(page=page, per_page=per_page)
-        for f in payload.get("data", []):
+    for items in _day_pages(target_str, p, per_page, std_from, std_to):
+        for f in items:
             if (f.get("FLIGHT_DATE") or "").strip() == target_str:
                 yield f
 
+def split_board(flights, target_str: str, airports: dict[str, str] = AIRPORT_KOR) -> list[dict]:
+    """
+    한 날짜의 raw flight들을 한 번만 훑어서 현황판 공항 전체의 출/도착 행으로 나눔 (FlightSnapshot upsert용 키).
+    출발지에 공항명이 들어 있으면 그 공항 dep, 도착지에 들어 있으면 그 공항 arr
+    """
+    out: list[dict] = []
+    for f in flights:
+        std = _parse_hhmm(f.get("STD"))
+        if not std:
+            continue
+
+        origin = f.get("BOARDING_KOR") or "-"
+        dest = f.get("ARRIVED_KOR") or "-"
+        flight_no = f.get("AIR_FLN") or "-"
+        base = {
+            # UFID가 없는 행은 None → 예전 키(공항/구분/날짜/STD/편명/출발지/도착지)로 upsert (dashboard/flight_sync.py)
+            "ufid": (f.get("UFID") or "").strip() or None,
+            "flight_date": target_str,
+            "std": std,                               # "HHMM"
+            "etd": _parse_hhmm(f.get("ETD")) or "",
+            "airline": f.get("AIRLINE_KOREAN") or "-",
+            "flight_no": flight_no,
+            "origin": origin,
+            "destination": dest,
+            "status": f.get("RMK_KOR") or "정상",
+            "gate": (f.get("GATE") or "").strip()[:10],
+            "line": (f.get("LINE") or "").strip()[:10],
+            "io": (f.get("IO") or "").strip()[:2],
+        }
+        for airport_code, kor in airports.items():
+            if kor in origin:
+                out.append({"airport_code": airport_code, "kind": "dep", **base})
+            if kor in dest:
+                out.append({"airport_code": airport_code, "kind": "arr", **base})
+    return out
+
 def board_for_date(
     airport_code: str,
     kind: str,
@@ -155,51 +236,9 @@ def board_for_date(
     if not kor:
         return []
 
-    out: list[dict] = []
     target_str = target.strftime("%Y%m%d")
-
-    for f in iter_flights_for_date(target, per_page=per_page):
-        std = _parse_hhmm(f.get("STD"))
-        if not std:
-            continue
-
-        origin = f.get("BOARDING_KOR") or "-"
-        dest = f.get("ARRIVED_KOR") or "-"
-
-        # dep: 선택 공항에서 출발
-        if kind == "dep":
-            if kor not in origin:
-                continue
-            out.append({
-                "airport_code": airport_code,
-                "kind": "dep",
-                "flight_date": target_str,                # ✅ target 날짜로 저장
-                "std": std,                               # "HHMM"
-                "airline": f.get("AIRLINE_KOREAN") or "-",
-                "flight_no": f.get("AIR_FLN") or "-",
-                "origin": origin or "-",
-                "destination": dest or "-",
-                "status": f.get("RMK_KOR") or "정상",
-            })
-
-        # arr: 선택 공항으로 도착
-        elif kind == "arr":
-            if kor not in dest:
-                continue
-            out.append({
-                "airport_code": airport_code,
-                "kind": "arr",
-                "flight_date": target_str,                # ✅ target 날짜로 저장
-                "std": std,                               # "HHMM"
-                "airline": f.get("AIRLINE_KOREAN") or "-",
-                "flight_no": f.get("AIR_FLN") or "-",
-                "origin": origin or "-",
-                "destination": dest or "-",
-                "status": f.get("RMK_KOR") or "정상",
-            })
-
-        if len(out) >= limit:
-            break
+    rows = split_board(iter_flights_for_date(target, per_page=per_page), target_str, {airport_code: kor})
+    out = [x for x in rows if x["kind"] == kind][:limit]
 
     out.sort(key=lambda x: (x["flight_date"], x["std"], x["flight_no"]))
     return out
@@ -256,6 +295,8 @@ def get_board(airport_code: str, kind: str, limit: int = 30, per_page: int = 100
                     "destination": destination or "-",   # 목적지
                     "flight": f.get("AIR_FLN") or "-",
                     "time": _hhmm(f.get("STD")),         # 출발 예정(네 데이터 기준)
+                    "etd": _hhmm(f.get("ETD")),          # 변경(예상) 시각, 없으면 "-"
+                    "gate": f.get("GATE") or "-",
                     "status": f.get("RMK_KOR") or "정상",
                 })
 
@@ -271,6 +312,7 @@ def get_board(airport_code: str, kind: str, limit: int = 30, per_page: int = 100
                     "origin": origin or "-",             # 도착현황에서는 '출발지'를 보여주는 게 보통이라 origin을 넣음
                     "flight": f.get("AIR_FLN") or "-",
                     "time": _hhmm(f.get("STD")),         # 이 API에 도착예정이 없으면 일단 STD 사용
+                    "etd": _hhmm(f.get("ETD")),
                     "status": f.get("RMK_KOR") or "정상",
                 })
 
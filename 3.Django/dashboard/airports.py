@@ -0,0 +1,92 @@
+import csv
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+# 국내 공항 기준 정보 한 곳에 모음 (현황판/날씨 동기화/지연 예측/챗봇 공항 인식이 모두 이 표를 봄)
+# data/airports.csv 한 파일에서 IATA / ICAO / 한글명 / AMOS 지점 / 기상청 격자(nx, ny)를 읽어서
+# 프로세스당 한 번만 dict로 만들어 두고 O(1)로 찾음
+AIRPORTS_CSV = Path(__file__).resolve().parent / "data" / "airports.csv"
+
+
+@dataclass(frozen=True)
+class Airport:
+    iata: str
+    icao: str
+    kor: str                    # 공공데이터 현황판/모델 학습에 쓰는 한글명 (인천, 김해, 포항경주 ...)
+    aliases: tuple[str, ...]    # 다른 이름 (부산, 포항)
+    lat: float
+    lon: float
+    nx: int                     # 기상청 단기예보 격자
+    ny: int
+    stn: str | None             # AMOS 지점번호 (없는 공항은 None)
+    board: bool                 # 현황판(항공편 동기화) 대상
+
+    @property
+    def name(self) -> str:
+        return f"{self.kor}공항"
+
+
+@lru_cache(maxsize=1)
+def all_airports() -> tuple[Airport, ...]:
+    with open(AIRPORTS_CSV, encoding="utf-8-sig", newline="") as f:
+        return tuple(
+            Airport(
+                iata=row["IATA"],
+                icao=row["ICAO"],
+                kor=row["공항"],
+                aliases=tuple(a for a in row["별칭"].split("|") if a),
+                lat=float(row["위도"]),
+                lon=float(row["경도"]),
+                nx=int(row["nx"]),
+                ny=int(row["ny"]),
+                stn=row["AMOS"] or None,
+                board=row["현황판"] == "Y",
+            )
+            for row in csv.DictReader(f)
+        )
+
+
+@lru_cache(maxsize=1)
+def _index() -> dict[str, Airport]:
+    idx = {}
+    for a in all_airports():
+        for key in (a.iata, a.icao, a.kor, a.name, *a.aliases, *(f"{x}공항" for x in a.aliases)):
+            idx[key.upper()] = a
+    return idx
+
+
+@lru_cache(maxsize=1)
+def _by_stn() -> dict[str, Airport]:
+    return {a.stn: a for a in all_airports() if a.stn}
+
+
+def get_airport(key: str | None) -> Airport | None:
+    """IATA(ICN) / ICAO(RKSI) / 한글명(인천, 인천공항, 부산) 아무거나로 조회"""
+    if not key:
+        return None
+    return _index().get(str(key).strip().upper())
+
+
+def airport_by_stn(stn: str | None) -> Airport | None:
+    return _by_stn().get(str(stn)) if stn else None
+
+
+def get_nxny(key: str) -> tuple[int, int] | None:
+    a = get_airport(key)
+    return (a.nx, a.ny) if a else None
+
+
+def board_airports() -> tuple[Airport, ...]:
+    return tuple(a for a in all_airports() if a.board)
+
+
+def domestic_names() -> tuple[str, ...]:
+    """국내선 판정용 한글명 + 별칭 (현황판 목적지 문자열 포함 여부로 비교)"""
+    return tuple(n for a in all_airports() for n in (a.kor, *a.aliases))
+
+
+# 예전 dict 이름 그대로 쓰던 코드용 (전부 airports.csv에서 만들어짐)
+AIRPORT_KOR = {a.iata: a.kor for a in board_airports()}        # 현황판 공항코드 → 한글명
+AIRPORT_TO_STN = {a.iata: a.stn for a in board_airports()}     # 현황판 공항코드 → AMOS stn (없으면 None)
+IATA_TO_KOR = {a.iata: a.kor for a in all_airports()}          # 국내 공항 전체
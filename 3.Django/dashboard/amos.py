@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import requests
+
+# 기상청 AMOS(공항 1분 관측) 응답 파서 (Django 의존성 없음)
+# dtm 구간 전체 응답을 한 번에 컬럼별 numpy 배열로 바꿈 → 현재 관측(latest)도, 이력 적재/백필(rows)도 같은 결과로 씀
+AMOS_URL = "https://apihub.kma.go.kr/api/typ01/url/amos.php"
+KST = ZoneInfo("Asia/Seoul")
+
+# 헤더 기준 컬럼 순서:
+# STN TM L_VIS R_VIS L_RVR R_RVR CH_MIN TA TD HM PS PA RN 예비1 예비2 WD02 WD02_MAX WD02_MIN WS02 WS02_MAX WS02_MIN ...
+# 필요한 위치만 뽑기 (인덱스 주의!)
+COLUMNS = {"l_vis": 2, "r_vis": 3, "ta": 7, "ws02": 18, "ws02_max": 19}
+SCALE = {"ta": 10.0, "ws02": 10.0, "ws02_max": 10.0}   # 0.1 단위 → /10
+INT_FIELDS = ("l_vis", "r_vis")
+MISSING = (-99999, -9999, 99999)                       # 결측값
+MIN_COLS = max(COLUMNS.values()) + 1
+
+
+def _to_float(v: str) -> float:
+    try:
+        return float(v)
+    except ValueError:
+        return np.nan
+
+
+@dataclass(frozen=True)
+class AmosBatch:
+    stn: np.ndarray          # str
+    tm: np.ndarray           # int64 YYYYMMDDHHMM (오름차순, 중복 없음)
+    l_vis: np.ndarray        # float64, 결측은 NaN
+    r_vis: np.ndarray
+    ta: np.ndarray
+    ws02: np.ndarray
+    ws02_max: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.tm)
+
+    def row(self, i: int) -> dict:
+        """i번째 관측 → WeatherCurrent/WeatherSnapshot 필드 이름 dict (결측 None)"""
+        out = {
+            "stn": str(self.stn[i]),
+            "observed_at": datetime.strptime(str(self.tm[i]), "%Y%m%d%H%M").replace(tzinfo=KST),
+        }
+        for name in COLUMNS:
+            v = getattr(self, name)[i]
+            out[name] = None if np.isnan(v) else (int(v) if name in INT_FIELDS else float(v))
+        return out
+
+    def rows(self) -> list[dict]:
+        return [self.row(i) for i in range(len(self))]
+
+    def latest(self) -> dict | None:
+        return self.row(len(self) - 1) if len(self) else None
+
+
+def parse_amos(text: str) -> AmosBatch:
+    """AMOS 응답 텍스트 전체(# 주석 제외 모든 데이터 줄) → AmosBatch"""
+    cols = [ln.split() for ln in text.splitlines() if ln.strip() and not ln.lstrip().startswith("#")]
+    cols = [c for c in cols if len(c) >= MIN_COLS and len(c[1]) == 12 and c[1].isdigit()]
+
+    stn = np.array([c[0] for c in cols], dtype=object)
+    tm = np.array([int(c[1]) for c in cols], dtype=np.int64)
+    values = np.array(
+        [[_to_float(c[i]) for i in COLUMNS.values()] for c in cols],
+        dtype=np.float64,
+    ).reshape(len(cols), len(COLUMNS))
+    values[np.isin(values, MISSING)] = np.nan
+
+    # 시간순 정렬 + 같은 관측시각 중복 제거 (뒤에 온 줄 우선)
+    order = np.argsort(tm, kind="stable")[::-1]
+    _, first = np.unique(tm[order], return_index=True)
+    keep = order[first]
+
+    arrays = {}
+    for j, name in enumerate(COLUMNS):
+        arr = values[keep, j]
+        arrays[name] = arr / SCALE[name] if name in SCALE else arr
+    return AmosBatch(stn=stn[keep], tm=tm[keep], **arrays)
+
+
+def fetch_amos(stn: str, key: str, dtm: int = 10, tm: str | None = None,
+               session=None, timeout=(3, 7)) -> AmosBatch:
+    """
+    stn 지점의 tm(YYYYMMDDHHMM, 없으면 현재) 이전 dtm분 관측을 한 번에 받아 파싱.
+    긴 공백 백필은 tm을 dtm만큼씩 옮겨 가며 호출
+    """
+    params = {"stn": stn, "dtm": dtm, "authKey": key}
+    if tm:
+        params["tm"] = tm
+    r = (session or requests).get(AMOS_URL, params=params, timeout=timeout)
+    r.raise_for_status()
+    return parse_amos(r.text)
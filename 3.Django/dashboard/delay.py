@@ -0,0 +1,197 @@
+# dashboard/delay.py
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils import timezone
+
+from .airports import IATA_TO_KOR, all_airports, domestic_names, get_airport
+from .forecast import fetch_forecast
+from .model_registry import ModelRegistry
+from .models import FlightSnapshot, WeatherCurrent
+
+MODEL_DIR = settings.BASE_DIR / "model"
+CLASSIFIER_PATH = MODEL_DIR / "모델_이진분류.joblib"
+REGRESSOR_PATH = MODEL_DIR / "모델_회기분석.joblib"
+FAST_MODEL_PATH = MODEL_DIR / "delay_models.npz"    # fast 경로 캐시 기준 이름 (첫 로드 때 joblib 해시를 붙여 생성)
+
+CAT_COLS = ["항공사", "출발지", "flight_type"]
+DEFAULT_THRESHOLD = 0.4
+
+# 학습 때 국내선 판정에 쓴 공항들 (1.Model 전처리 DOMESTIC_CODES) - 현황판 목적지는 한글이라 한글명으로 비교
+DOMESTIC_KOR = domestic_names()
+
+
+@lru_cache(maxsize=1)
+def model_registry() -> ModelRegistry:
+    # lightgbm/sklearn까지 끌고 오는 로드라 실제 예측할 때 처음 읽음 (이후 파일이 바뀌면 자동 교체)
+    return ModelRegistry(CLASSIFIER_PATH, REGRESSOR_PATH, fast_path=FAST_MODEL_PATH)
+
+
+def flight_type_for(destination: str) -> str:
+    return "국내" if any(k in (destination or "") for k in DOMESTIC_KOR) else "국제"
+
+
+def _weather_for_airports(airport_codes) -> dict:
+    """
+    공항별 예보 시계열 1번씩만 조회 + 예보가 없을 때 쓸 현재 관측값.
+    *_base는 "어떤 날씨로 예측했는지" 표시 (F+예보 발표시각 / O+관측시각) → 바뀐 경우에만 다시 예측
+    """
+    out = {}
+    current = {w.airport_code: w for w in WeatherCurrent.objects.filter(airport_code__in=list(airport_codes))}
+    for code in airport_codes:
+        obs = current.get(code)
+        has_obs = obs is not None and obs.ta is not None
+        forecast = fetch_forecast(code)
+        out[code] = {
+            "forecast": forecast,
+            "forecast_base": f"F{forecast.base}",
+            "current": {"기온(°C)": obs.ta, "풍속_ms": obs.ws02} if has_obs else None,
+            "current_base": f"O{timezone.localtime(obs.observed_at):%Y%m%d%H%M}" if has_obs else "",
+        }
+    return out
+
+
+def predict_flights(flights: list[dict], threshold: float = DEFAULT_THRESHOLD,
+                    known_bases: list[str] | None = None) -> list[dict]:
+    """
+    flights: FlightSnapshot.values() 형태의 dict 리스트 (airport_code=출발 공항, flight_date, std, airline, destination)
+    반환: 같은 순서의 [{"ok", "delay_prob", "is_delay", "predicted_delay_minutes", "weather", "weather_base"}, ...]
+    known_bases: 편별로 지난번 예측에 쓴 날씨 기준. 지금과 같으면 예측을 생략하고 {"ok": True, "unchanged": True}
+
+    final.py predict_delay_binary를 한 편씩 부르는 대신, 전체를 DataFrame 하나로 만들어
+    predict_proba / predict를 각각 1번만 호출함 (날씨도 공항당 1번)
+    """
+    if not flights:
+        return []
+
+    import pandas as pd
+
+    weather = _weather_for_airports({f["airport_code"] for f in flights})
+    deps = [f"{f['flight_date']}{f['std']}" for f in flights]
+
+    # 공항별로 출발 시각 전체를 한 번에 예보 배열에서 찾음 (searchsorted)
+    by_airport = defaultdict(list)
+    for i, f in enumerate(flights):
+        by_airport[f["airport_code"]].append(i)
+    picked = [None] * len(flights)
+    for code, idxs in by_airport.items():
+        w = weather[code]
+        for i, wx in zip(idxs, w["forecast"].at_many([deps[i] for i in idxs])):
+            # 예보가 없으면(범위 밖/미수집) 현재 관측값으로
+            picked[i] = (wx, w["forecast_base"]) if wx is not None else (w["current"], w["current_base"])
+
+    rows, idx, results = [], [], []
+    for i, f in enumerate(flights):
+        dep = deps[i]
+        wx, base = picked[i]
+        if wx is None:
+            results.append({"ok": False, "reason": "날씨 데이터 없음"})
+            continue
+        if known_bases is not None and known_bases[i] == base:
+            results.append({"ok": True, "unchanged": True, "weather_base": base})
+            continue
+
+        dep_dt = datetime.strptime(dep, "%Y%m%d%H%M")
+        weekday = dep_dt.weekday()
+        rows.append({
+            "기온(°C)": wx["기온(°C)"],
+            "풍속_ms": wx["풍속_ms"],
+            "dep_hour": dep_dt.hour,
+            "dep_minute": dep_dt.minute,
+            # 학습 때 IATA 문자열을 숫자로 강제 변환(-1)한 컬럼이라 동일하게 넣음
+            "arrival_code": -1,
+            "dep_weekday": weekday,
+            "is_weekend": int(weekday in (5, 6)),
+            "항공사": f["airline"],
+            "출발지": IATA_TO_KOR.get(f["airport_code"], f["airport_code"]),
+            "flight_type": flight_type_for(f["destination"]),
+        })
+        idx.append(i)
+        results.append({"ok": True, "weather": wx, "weather_base": base})
+
+    if rows:
+        # 한 배치 안에서는 같은 버전 모델만 쓰도록 bundle을 한 번만 받음
+        models = model_registry().get()
+        X = pd.DataFrame(rows)
+        for c in CAT_COLS:
+            X[c] = X[c].astype("category")
+
+        clf, reg = models.pick(len(rows))
+
+        probs = clf.predict_proba(X[list(models.clf_features)])[:, 1]
+        delayed = probs >= threshold
+        # 회귀는 지연 예상인 행만 한 번에
+        minutes = reg.predict(X.loc[delayed, list(models.reg_features)]) if delayed.any() else []
+
+        it = iter(minutes)
+        for i, p, d in zip(idx, probs, delayed):
+            results[i].update(delay_prob=round(float(p), 4), is_delay=int(d))
+            if d:
+                # 음수 방지 (회귀 모델에서 가끔 발생)
+                results[i]["predicted_delay_minutes"] = round(max(0.0, float(next(it))), 1)
+
+    return results
+
+
+def _departure_code(row: FlightSnapshot) -> str | None:
+    # 도착편은 출발지(한글)가 국내 공항일 때만 예측 가능 (해외 출발은 날씨 데이터 없음)
+    if row.kind == "dep":
+        return row.airport_code
+    a = get_airport(row.origin) or next((a for a in all_airports() if a.kor in (row.origin or "")), None)
+    return a.iata if a else None
+
+
+def score_snapshots(qs, threshold: float = DEFAULT_THRESHOLD, force: bool = False) -> int:
+    """
+    qs(FlightSnapshot)의 지연 예측을 한 번에 계산해서 delay_prob/predicted_delay_minutes에 저장.
+    날씨 기준(delay_weather_base)이 지난번과 같은 편은 건너뜀 (force=True면 전부 다시)
+    반환: 새로 저장한 행 수
+    """
+    rows, flights = [], []
+    for r in qs.only("id", "airport_code", "kind", "flight_date", "std", "airline",
+                     "origin", "destination", "delay_weather_base"):
+        dep_code = _departure_code(r)
+        if not dep_code:
+            continue
+        rows.append(r)
+        flights.append({
+            "airport_code": dep_code,
+            "flight_date": r.flight_date,
+            "std": r.std,
+            "airline": r.airline,
+            "destination": r.destination if r.kind == "dep" else IATA_TO_KOR.get(r.airport_code, r.airport_code),
+        })
+
+    known = None if force else [r.delay_weather_base for r in rows]
+    preds = predict_flights(flights, threshold=threshold, known_bases=known)
+
+    now = timezone.now()
+    changed = []
+    for r, p in zip(rows, preds):
+        if not p.get("ok") or p.get("unchanged"):
+            continue
+        r.delay_prob = p["delay_prob"]
+        r.predicted_delay_minutes = p.get("predicted_delay_minutes")
+        r.delay_weather_base = p["weather_base"]
+        r.delay_scored_at = now
+        changed.append(r)
+
+    FlightSnapshot.objects.bulk_update(
+        changed,
+        ["delay_prob", "predicted_delay_minutes", "delay_weather_base", "delay_scored_at"],
+        batch_size=500,
+    )
+    return len(changed)
+
+
+def upcoming_snapshots():
+    """지금 이후 출발/도착 예정인 스냅샷 (오늘 남은 편 + 내일 이후)"""
+    from django.db.models import Q
+
+    now = timezone.localtime()
+    today = now.strftime("%Y%m%d")
+    return FlightSnapshot.objects.filter(
+        Q(flight_date__gt=today) | Q(flight_date=today, std__gte=now.strftime("%H%M"))
+    )
@@ -0,0 +1,467 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 학습된 LightGBM(clf: LGBMClassifier / reg: 전처리 Pipeline + LGBMRegressor)을 numpy 배열(.npz)로 펼쳐서
+# sklearn/lightgbm/pandas 없이 예측하는 모듈 (Django 의존성 없음 → 1.Model·2.RAG에서도 이 파일을 씀)
+#  - npz는 저장소에 두지 않고 ModelRegistry가 처음 로드할 때 joblib에서 만들어 캐시 (파일 이름에 joblib 해시)
+#  - 트리 전체를 노드 배열 하나로 합치고, (행, 트리) 전부를 한꺼번에 리프까지 내려감
+#  - 분기 규칙은 LightGBM과 동일 (결측 방향 default_left, 범주형은 코드 집합)
+#  - reg의 ColumnTransformer(중앙값 대체 + 원핫)도 같이 펼쳐 둠
+
+FORMAT_VERSION = 1
+ZERO_THRESHOLD = 1e-35          # LightGBM kZeroThreshold
+MISSING_TYPES = {"None": 0, "Zero": 1, "NaN": 2}
+# export 검증 허용 오차 (부동소수 합산 순서 차이 정도만 허용)
+MAX_PROB_DIFF = 1e-6
+MAX_MINUTES_DIFF = 1e-4
+CHUNK_ROWS = 256                # (행 x 트리) 중간 배열이 CPU 캐시에 들어가는 크기로 나눠서 계산
+
+
+def cache_path(base, version: str) -> Path:
+    """npz 캐시 파일 경로. model/delay_models.npz + 해시 → model/delay_models-<해시>.npz (모델이 바뀌면 새 파일)"""
+    base = Path(base)
+    return base.with_name(f"{base.stem}-{version}{base.suffix}")
+
+
+def remove_stale_caches(base, keep: Path) -> list[Path]:
+    """keep 말고 예전 joblib 해시로 만든 캐시 삭제"""
+    base = Path(base)
+    removed = []
+    for p in base.parent.glob(f"{base.stem}-*{base.suffix}"):
+        if p != keep and not p.name.endswith(".tmp.npz"):
+            p.unlink(missing_ok=True)
+            removed.append(p)
+    return removed
+
+
+def file_version(paths) -> str:
+    """joblib 파일 내용 해시 앞 12자리 (export한 npz가 어느 모델에서 나왔는지 확인용)"""
+    h = hashlib.sha1()
+    for p in paths:
+        with open(p, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    return h.hexdigest()[:12]
+
+
+# ----------------------------------------------------------------------
+# export
+# ----------------------------------------------------------------------
+def _flatten_trees(dump: dict) -> dict:
+    feature, threshold, left, right = [], [], [], []
+    default_left, missing, cat_row, value = [], [], [], []
+    cat_sets, roots = [], []
+
+    def add(node) -> int:
+        i = len(feature)
+        feature.append(-1)
+        threshold.append(0.0)
+        left.append(i)
+        right.append(i)
+        default_left.append(False)
+        missing.append(0)
+        cat_row.append(-1)
+        value.append(0.0)
+
+        if "leaf_value" in node:
+            value[i] = float(node["leaf_value"])
+            return i
+
+        feature[i] = int(node["split_feature"])
+        default_left[i] = bool(node["default_left"])
+        missing[i] = MISSING_TYPES[node["missing_type"]]
+        if node["decision_type"] == "==":
+            cat_row[i] = len(cat_sets)
+            cat_sets.append([int(c) for c in str(node["threshold"]).split("||")])
+        elif node["decision_type"] == "<=":
+            threshold[i] = float(node["threshold"])
+        else:
+            raise ValueError(f"지원하지 않는 분기: {node['decision_type']}")
+        left[i] = add(node["left_child"])
+        right[i] = add(node["right_child"])
+        return i
+
+    for tree in dump["tree_info"]:
+        roots.append(add(tree["tree_structure"]))
+
+    width = max((max(s) for s in cat_sets), default=-1) + 1
+    cat_mask = np.zeros((len(cat_sets), max(width, 1)), dtype=bool)
+    for r, s in enumerate(cat_sets):
+        cat_mask[r, s] = True
+
+    return {
+        "feature": np.asarray(feature, dtype=np.int32),
+        "threshold": np.asarray(threshold, dtype=np.float64),
+        "left": np.asarray(left, dtype=np.int32),
+        "right": np.asarray(right, dtype=np.int32),
+        "default_left": np.asarray(default_left, dtype=bool),
+        "missing": np.asarray(missing, dtype=np.int8),
+        "cat_row": np.asarray(cat_row, dtype=np.int32),
+        "cat_mask": cat_mask,
+        "value": np.asarray(value, dtype=np.float64),
+        "roots": np.asarray(roots, dtype=np.int32),
+    }
+
+
+def _objective(dump: dict) -> dict:
+    name, *params = dump["objective"].split()
+    if dump.get("num_class", 1) != 1 or dump.get("average_output"):
+        raise ValueError("단일 출력 GBDT만 지원")
+    if name == "binary":
+        sigmoid = 1.0
+        for p in params:
+            if p.startswith("sigmoid:"):
+                sigmoid = float(p.split(":", 1)[1])
+        return {"kind": "binary", "sigmoid": sigmoid}
+    if name == "regression":
+        return {"kind": "regression"}
+    raise ValueError(f"지원하지 않는 objective: {dump['objective']}")
+
+
+def _booster_encoders(estimator, dump: dict) -> list[dict]:
+    # pandas category 컬럼 그대로 학습한 경우: 범주형 feature는 학습 때 카테고리 순서가 코드
+    names = list(dump["feature_names"])
+    infos = dump.get("feature_infos") or {}
+    cat_idx = [j for j, n in enumerate(names) if (infos.get(n) or {}).get("values")]
+    cats = dump.get("pandas_categorical") or []
+    if len(cat_idx) != len(cats):
+        # 분기에 안 쓰인 범주형 feature가 있으면 위치를 못 맞춤 → 학습 때 지정한 범주형 목록으로
+        cat_idx = [j for j, n in enumerate(names) if n in set(getattr(estimator, "_categorical_feature", None) or [])]
+        if len(cat_idx) != len(cats):
+            raise ValueError("범주형 feature와 pandas_categorical 개수가 다름")
+
+    encoders = []
+    cat_of = dict(zip(cat_idx, cats))
+    for j, n in enumerate(names):
+        if j in cat_of:
+            encoders.append({"kind": "cat", "col": n, "index": j, "categories": list(cat_of[j])})
+        else:
+            info = infos.get(n) or {}
+            rng = [info["min_value"], info["max_value"]] if "min_value" in info else None
+            encoders.append({"kind": "num", "col": n, "index": j, "fill": None, "range": rng})
+    return encoders
+
+
+def _pipeline_encoders(pipeline) -> tuple[list[str], list[dict], object]:
+    # Pipeline(prep=ColumnTransformer(num: SimpleImputer / cat: SimpleImputer + OneHotEncoder), reg=LGBM)
+    prep, model = pipeline.steps[0][1], pipeline.steps[-1][1]
+    if len(pipeline.steps) != 2 or getattr(prep, "remainder", "drop") != "drop":
+        raise ValueError("prep + 모델 2단계 Pipeline만 지원")
+
+    encoders, j = [], 0
+    for _, trans, cols in prep.transformers_:
+        if trans == "drop":
+            continue
+        steps = dict(trans.steps) if hasattr(trans, "steps") else {"only": trans}
+        imputer = next((s for s in steps.values() if type(s).__name__ == "SimpleImputer"), None)
+        onehot = next((s for s in steps.values() if type(s).__name__ == "OneHotEncoder"), None)
+        others = [s for s in steps.values() if s is not imputer and s is not onehot]
+        if others:
+            raise ValueError(f"지원하지 않는 전처리: {[type(s).__name__ for s in others]}")
+
+        if onehot is None:
+            stats = imputer.statistics_ if imputer is not None else [None] * len(cols)
+            for c, fill in zip(cols, stats):
+                encoders.append({"kind": "num", "col": c, "index": j,
+                                 "fill": None if fill is None else float(fill), "range": None})
+                j += 1
+        else:
+            if onehot.drop is not None or getattr(onehot, "min_frequency", None) or getattr(onehot, "max_categories", None):
+                raise ValueError("drop/infrequent 원핫은 지원 안 함")
+            fill = imputer.fill_value if imputer is not None else None
+            for c, categories in zip(cols, onehot.categories_):
+                encoders.append({"kind": "onehot", "col": c, "index": j,
+                                 "categories": [str(x) for x in categories], "fill": fill})
+                j += len(categories)
+    return list(pipeline.feature_names_in_), encoders, model
+
+
+def compile_estimator(estimator) -> tuple[dict, dict]:
+    """LGBMClassifier / LGBMRegressor / (전처리 + LGBM) Pipeline → (meta, arrays)"""
+    if hasattr(estimator, "steps"):
+        inputs, encoders, model = _pipeline_encoders(estimator)
+        dump = model.booster_.dump_model()
+    else:
+        model = estimator
+        dump = model.booster_.dump_model()
+        encoders = _booster_encoders(model, dump)
+        inputs = list(dump["feature_names"])
+
+    n_features = len(dump["feature_names"])
+    last = encoders[-1]
+    width = last["index"] + (len(last["categories"]) if last["kind"] == "onehot" else 1)
+    if width != n_features:
+        raise ValueError(f"전처리 출력 {width}개 != 모델 입력 {n_features}개")
+
+    meta = {
+        "format": FORMAT_VERSION,
+        "inputs": inputs,
+        "n_features": n_features,
+        "encoders": encoders,
+        "objective": _objective(dump),
+        "trees": len(dump["tree_info"]),
+    }
+    return meta, _flatten_trees(dump)
+
+
+def export_models(path, source_version: str = "", **estimators) -> Path:
+    """export_models("delay_models.npz", clf=clf, reg=reg) → 이름별 모델을 npz 하나에 저장"""
+    arrays = {}
+    for name, est in estimators.items():
+        meta, arr = compile_estimator(est)
+        meta["source_version"] = source_version
+        arrays[f"{name}.meta"] = np.asarray(json.dumps(meta, ensure_ascii=False))
+        for k, v in arr.items():
+            arrays[f"{name}.{k}"] = v
+    path = Path(path)
+    np.savez_compressed(path, **arrays)
+    return path
+
+
+# ----------------------------------------------------------------------
+# predict
+# ----------------------------------------------------------------------
+class FastTreeModel:
+    """export한 트리 모델 하나. sklearn 모델과 같은 이름의 predict / predict_proba 제공"""
+
+    def __init__(self, meta: dict, arrays: dict):
+        self.meta = meta
+        self.inputs = list(meta["inputs"])
+        # ModelRegistry.validate_features가 sklearn 모델과 똑같이 읽을 수 있도록
+        self.feature_name_ = self.inputs
+        self.feature_names_in_ = self.inputs
+        self.source_version = meta.get("source_version", "")
+        self.n_features = meta["n_features"]
+        self.objective = meta["objective"]
+        for k in ("feature", "threshold", "left", "right", "default_left", "missing",
+                  "cat_row", "cat_mask", "value", "roots"):
+            setattr(self, k, arrays[k])
+        self._children = np.column_stack([self.left, self.right]).ravel()
+        self.is_cat = self.cat_row >= 0
+        self._has_cat = bool(self.is_cat.any())
+        self._n_cat = self.cat_mask.shape[1]
+        self._cat_flat = self.cat_mask.ravel()
+        self.cat_offset = np.where(self.is_cat, self.cat_row, 0).astype(np.int32) * self._n_cat
+        self._has_zero_missing = bool((self.missing == 1).any())
+        self._encoders = []
+        for e in meta["encoders"]:
+            e = dict(e)
+            if e["kind"] in ("cat", "onehot"):
+                e["codes"] = {c: i for i, c in enumerate(e["categories"])}
+            self._encoders.append(e)
+
+    # 입력: DataFrame 또는 dict 리스트 (컬럼 이름은 학습 때와 동일)
+    @staticmethod
+    def _column(X, col, numeric: bool) -> np.ndarray:
+        if isinstance(X, (list, tuple)):
+            vals = [r.get(col) for r in X]
+            if numeric:
+                return np.array([np.nan if v is None else float(v) for v in vals], dtype=np.float64)
+            return np.array(vals, dtype=object)
+        s = X[col]
+        if numeric:
+            return s.to_numpy(dtype=np.float64, na_value=np.nan)
+        return s.astype(object).to_numpy()
+
+    def encode(self, X) -> np.ndarray:
+        n = len(X)
+        F = np.zeros((n, self.n_features), dtype=np.float64)
+        for e in self._encoders:
+            if e["kind"] == "num":
+                v = self._column(X, e["col"], numeric=True)
+                if e["fill"] is not None:
+                    v = np.where(np.isnan(v), e["fill"], v)
+                F[:, e["index"]] = v
+                continue
+
+            vals = self._column(X, e["col"], numeric=False)
+            codes = e["codes"]
+            if e["kind"] == "cat":
+                # 학습 때 없던 값/결측은 NaN (LightGBM pandas 입력과 동일)
+                F[:, e["index"]] = [codes.get(v, np.nan) if isinstance(v, str) else np.nan for v in vals]
+            else:
+                fill = e["fill"]
+                for r, v in enumerate(vals):
+                    if not isinstance(v, str):
+                        v = fill
+                    k = codes.get(v)
+                    if k is not None:
+                        F[r, e["index"] + k] = 1.0
+        return F
+
+    def raw_score(self, F: np.ndarray) -> np.ndarray:
+        if len(F) > CHUNK_ROWS:
+            return np.concatenate([self._raw_score(F[i:i + CHUNK_ROWS]) for i in range(0, len(F), CHUNK_ROWS)])
+        return self._raw_score(F)
+
+    def _raw_score(self, F: np.ndarray) -> np.ndarray:
+        n, nf = F.shape
+        flat = F.ravel()
+        node = np.tile(self.roots, n)                       # (행, 트리) 를 1차원으로
+        base = np.repeat(np.arange(n, dtype=np.int32) * nf, len(self.roots))
+        check_missing = self._has_zero_missing or bool(np.isnan(flat).any())
+
+        # 아직 리프에 도착하지 않은 (행, 트리)만 골라서 한 단계씩 내려감
+        feat = self.feature[node]
+        act = np.flatnonzero(feat >= 0).astype(np.int32)
+        feat = feat[act]
+        while act.size:
+            nd = node[act]
+            x = flat[base[act] + feat]
+            if check_missing:
+                # 수치형: NaN은 missing_type이 NaN일 때만 결측, 아니면 0으로 보고 비교
+                isnan = np.isnan(x)
+                miss = self.missing[nd]
+                xv = np.where(isnan & (miss != 2), 0.0, x)
+                is_default = ((miss == 1) & (np.abs(xv) <= ZERO_THRESHOLD)) | ((miss == 2) & isnan)
+                go_right = ~np.where(is_default, self.default_left[nd], xv <= self.threshold[nd])
+            else:
+                go_right = ~(x <= self.threshold[nd])
+
+            if self._has_cat:
+                # 범주형: NaN(처음 보는 값)·음수는 오른쪽, 코드가 집합에 있으면 왼쪽
+                c = np.flatnonzero(self.is_cat[nd])
+                if c.size:
+                    code = x[c]
+                    ok = (code >= 0) & (code < self._n_cat)
+                    miss_set = np.ones(c.size, dtype=bool)
+                    miss_set[ok] = ~self._cat_flat[self.cat_offset[nd[c[ok]]] + code[ok].astype(np.int32)]
+                    go_right[c] = miss_set
+
+            # children: 노드 i의 왼쪽/오른쪽 자식이 2i / 2i+1 자리에
+            nxt = self._children[nd * 2 + go_right]
+            node[act] = nxt
+            feat = self.feature[nxt]
+            keep = feat >= 0
+            act, feat = act[keep], feat[keep]
+
+        return self.value[node].reshape(n, -1).sum(axis=1)
+
+    def predict(self, X) -> np.ndarray:
+        raw = self.raw_score(self.encode(X))
+        if self.objective["kind"] == "binary":
+            return (self._sigmoid(raw) >= 0.5).astype(np.int64)
+        return raw
+
+    def predict_proba(self, X) -> np.ndarray:
+        if self.objective["kind"] != "binary":
+            raise AttributeError("predict_proba는 분류 모델만")
+        p = self._sigmoid(self.raw_score(self.encode(X)))
+        return np.column_stack([1.0 - p, p])
+
+    def _sigmoid(self, raw: np.ndarray) -> np.ndarray:
+        return 1.0 / (1.0 + np.exp(-self.objective["sigmoid"] * raw))
+
+
+def load_fast_models(path) -> dict[str, FastTreeModel]:
+    with np.load(path, allow_pickle=False) as z:
+        names = sorted({k.split(".", 1)[0] for k in z.files})
+        out = {}
+        for name in names:
+            meta = json.loads(str(z[f"{name}.meta"]))
+            if meta.get("format") != FORMAT_VERSION:
+                raise ValueError(f"npz 형식 버전 불일치: {meta.get('format')}")
+            arrays = {k.split(".", 1)[1]: z[k] for k in z.files if k.startswith(f"{name}.") and not k.endswith(".meta")}
+            out[name] = FastTreeModel(meta, arrays)
+    return out
+
+
+def sample_rows(model: FastTreeModel, n: int, seed: int = 0) -> list[dict]:
+    """검증/벤치마크용 임의 입력 (수치형은 학습 범위 안, 범주형은 학습 카테고리 + 가끔 처음 보는 값)"""
+    rng = np.random.default_rng(seed)
+    rows = [{} for _ in range(n)]
+    for e in model.meta["encoders"]:
+        col = e["col"]
+        if e["kind"] == "num":
+            lo, hi = e.get("range") or (-1, -1)
+            vals = rng.uniform(lo, hi, n)
+            if float(lo).is_integer() and float(hi).is_integer():
+                vals = np.floor(vals + 0.5)
+            for r, v in zip(rows, vals):
+                r[col] = float(v)
+        else:
+            cats = e["categories"] + ["UNSEEN"]
+            for r, k in zip(rows, rng.integers(0, len(cats), n)):
+                r[col] = cats[k]
+    return rows
+
+
+# ----------------------------------------------------------------------
+# 미리 만들어 두기/점검용: python 3.Django/dashboard/fast_model.py 모델_이진분류.joblib 모델_회기분석.joblib -o delay_models.npz
+# ----------------------------------------------------------------------
+def compare(clf, reg, fast: dict, check_rows: int = 2000, seed: int = 0) -> dict:
+    """임의 입력 check_rows개로 원래 모델(clf/reg)과 fast 모델 결과 차이/소요시간 비교"""
+    import pandas as pd
+
+    rows = sample_rows(fast["clf"], check_rows, seed=seed)
+    X = pd.DataFrame(rows)[list(clf.feature_name_)]
+    cat_cols = [e["col"] for e in fast["clf"].meta["encoders"] if e["kind"] == "cat"]
+    for c in cat_cols:
+        X[c] = X[c].astype("category")
+
+    t0 = time.perf_counter()
+    p_ref = clf.predict_proba(X)[:, 1]
+    m_ref = reg.predict(X[list(fast["reg"].inputs)])
+    t_ref = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    p_fast = fast["clf"].predict_proba(rows)[:, 1]
+    m_fast = fast["reg"].predict(rows)
+    t_fast = time.perf_counter() - t0
+
+    return {
+        "rows": check_rows,
+        "max_prob_diff": float(np.max(np.abs(p_ref - p_fast))),
+        "max_minutes_diff": float(np.max(np.abs(m_ref - m_fast))),
+        "joblib_seconds": round(t_ref, 4),
+        "fast_seconds": round(t_fast, 4),
+    }
+
+
+def export_checked(clf, reg, out_path, version: str, check_rows: int = 2000) -> dict:
+    """
+    로드된 clf/reg를 npz로 export 하고, compare로 원래 모델과 결과가 같은지 확인.
+    임시 파일에 먼저 쓰고 검증을 통과해야 out_path로 교체 (다른 프로세스가 덜 쓴 파일을 읽지 않도록, 임시 파일 이름은 pid별)
+    """
+    out_path = Path(out_path)
+    tmp_path = out_path.with_name(f"{out_path.stem}.{os.getpid()}.tmp.npz")
+    try:
+        export_models(tmp_path, source_version=version, clf=clf, reg=reg)
+        report = {"path": str(out_path), "source_version": version,
+                  **compare(clf, reg, load_fast_models(tmp_path), check_rows)}
+        if report["max_prob_diff"] > MAX_PROB_DIFF or report["max_minutes_diff"] > MAX_MINUTES_DIFF:
+            raise ValueError(f"export 결과가 원래 모델과 다름: {report}")
+        os.replace(tmp_path, out_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return report
+
+
+def export_from_joblib(classifier_path, regressor_path, base_path, check_rows: int = 2000) -> dict:
+    """joblib 파일 두 개 → ModelRegistry가 찾는 캐시 경로(cache_path(base_path, 해시))에 export_checked"""
+    import joblib
+
+    clf, reg = joblib.load(classifier_path), joblib.load(regressor_path)
+    version = file_version([classifier_path, regressor_path])
+    out_path = cache_path(base_path, version)
+    report = export_checked(clf, reg, out_path, version, check_rows=check_rows)
+    remove_stale_caches(base_path, keep=out_path)
+    return report
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Export LightGBM delay models to a numpy .npz fast predictor")
+    ap.add_argument("classifier", nargs="?", default="모델_이진분류.joblib")
+    ap.add_argument("regressor", nargs="?", default="모델_회기분석.joblib")
+    ap.add_argument("-o", "--out", default="delay_models.npz")
+    args = ap.parse_args()
+
+    report = export_from_joblib(args.classifier, args.regressor, args.out)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    print("✅ export 완료")
@@ -0,0 +1,224 @@
+import logging
+import os
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from .airports import IATA_TO_KOR, get_airport
+from .delay import _departure_code, flight_type_for
+from .models import FlightSnapshot, WeatherSnapshot
+
+# 지난 날짜 항공편 결과를 Parquet으로 쌓아 두는 학습용 이력 (append-only)
+#  - archive/flights/flight_date=YYYYMMDD/part-*.parquet (hive 파티션) → 날짜 조건은 파일을 열기 전에 걸러짐
+#  - prune_flights(dashboard/retention.py)가 지우기 직전에 날짜 단위로 한 번 씀. 이미 파티션이 있는 날짜는 다시 안 씀
+#  - 편마다 출발 공항의 출발 시각 직전 AMOS 관측(WeatherSnapshot, 60분 이내)을 붙여 둠
+#  - pyarrow가 없으면 아무것도 안 함 (정리는 그대로 진행)
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = Path(os.getenv("FLIGHT_PARQUET_DIR", settings.BASE_DIR / "archive" / "flights"))
+ENABLED = os.getenv("FLIGHT_PARQUET", "1") == "1"
+WEATHER_TOLERANCE = timedelta(minutes=60)
+
+FLIGHT_FIELDS = (
+    "airport_code", "kind", "std", "etd", "airline", "flight_no", "origin", "destination",
+    "status", "delay_prob", "predicted_delay_minutes",
+)
+WEATHER_FIELDS = ("ta", "ws02", "ws02_max", "l_vis", "r_vis")
+
+
+def parquet_available() -> bool:
+    if not ENABLED:
+        return False
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _schema():
+    import pyarrow as pa
+
+    # flight_date는 디렉터리 이름(파티션)으로만 저장
+    return pa.schema([
+        ("airport_code", pa.string()),
+        ("kind", pa.string()),
+        ("std", pa.string()),
+        ("etd", pa.string()),                 # 변경(예상) 출발/도착 시각 hhmm, 없으면 null
+        ("airline", pa.string()),
+        ("flight_no", pa.string()),
+        ("origin", pa.string()),
+        ("destination", pa.string()),
+        ("status", pa.string()),              # 마지막으로 본 상태 (RMK_KOR)
+        ("delay_prob", pa.float64()),
+        ("predicted_delay_minutes", pa.float64()),
+        ("dep_airport", pa.string()),         # 출발 공항 IATA (해외 출발 도착편은 null)
+        ("weather_observed_at", pa.timestamp("s", tz="Asia/Seoul")),
+        ("ta", pa.float64()),
+        ("ws02", pa.float64()),
+        ("ws02_max", pa.float64()),
+        ("l_vis", pa.int64()),
+        ("r_vis", pa.int64()),
+    ])
+
+
+def partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    # 문자열로 고정 (자동 추론하면 20261019가 정수가 됨)
+    return ds.partitioning(pa.schema([("flight_date", pa.string())]), flavor="hive")
+
+
+def partition_dir(flight_date: str) -> Path:
+    return ARCHIVE_DIR / f"flight_date={flight_date}"
+
+
+def archived_dates() -> set[str]:
+    if not ARCHIVE_DIR.exists():
+        return set()
+    return {
+        p.name.split("=", 1)[1] for p in ARCHIVE_DIR.iterdir()
+        if p.is_dir() and p.name.startswith("flight_date=") and any(p.glob("*.parquet"))
+    }
+
+
+def _observations(codes, start, end) -> dict[str, list]:
+    # 공항별 (관측시각, 값...) 시간순 목록
+    out: dict[str, list] = {}
+    qs = (
+        WeatherSnapshot.objects
+        .filter(airport_code__in=codes, observed_at__gte=start, observed_at__lt=end)
+        .order_by("airport_code", "observed_at")
+        .values_list("airport_code", "observed_at", *WEATHER_FIELDS)
+    )
+    for code, t, *vals in qs.iterator(chunk_size=2000):
+        out.setdefault(code, []).append((t, vals))
+    return out
+
+
+def build_day(flight_date: str) -> list[dict]:
+    """FlightSnapshot 하루치 → 보관 행 (출발 공항 관측 포함)"""
+    import bisect
+    from datetime import datetime
+
+    rows = list(FlightSnapshot.objects.filter(flight_date=flight_date).order_by("pk"))
+    if not rows:
+        return []
+
+    tz = timezone.get_current_timezone()
+    day = datetime.strptime(flight_date, "%Y%m%d").replace(tzinfo=tz)
+    deps = [_departure_code(r) for r in rows]
+    obs = _observations({c for c in deps if c}, day - WEATHER_TOLERANCE, day + timedelta(days=1))
+    times = {code: [t for t, _ in v] for code, v in obs.items()}
+
+    out = []
+    for r, dep in zip(rows, deps):
+        item = {f: getattr(r, f) for f in FLIGHT_FIELDS}
+        item["dep_airport"] = dep
+        item["weather_observed_at"] = None
+        item.update(dict.fromkeys(WEATHER_FIELDS))
+
+        if dep in obs:
+            try:
+                dep_dt = datetime.strptime(flight_date + r.std, "%Y%m%d%H%M").replace(tzinfo=tz)
+            except ValueError:
+                # std가 이상한 행은 날씨 없이 보관 (한 행 때문에 그날 전체가 실패하지 않도록)
+                out.append(item)
+                continue
+            # 출발 시각 이전(같으면 포함) 가장 최근 관측, 60분 넘게 비었으면 없음
+            i = bisect.bisect_right(times[dep], dep_dt) - 1
+            if i >= 0 and dep_dt - obs[dep][i][0] <= WEATHER_TOLERANCE:
+                t, vals = obs[dep][i]
+                item["weather_observed_at"] = timezone.localtime(t)
+                item.update(zip(WEATHER_FIELDS, vals))
+        out.append(item)
+    return out
+
+
+def write_day(flight_date: str) -> int:
+    """하루치를 파티션 파일 하나로 씀 (임시 파일에 쓰고 이름 바꿈 → 반쯤 쓴 파일이 남지 않음). 반환: 행 수"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = build_day(flight_date)
+    if not rows:
+        return 0
+
+    table = pa.Table.from_pylist(rows, schema=_schema())
+    folder = partition_dir(flight_date)
+    folder.mkdir(parents=True, exist_ok=True)
+    name = f"part-{timezone.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+    tmp = folder / f".{name}.tmp"
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, folder / name)
+    return len(rows)
+
+
+def archive_before(min_date: str) -> tuple[int, list[str]]:
+    """
+    FlightSnapshot에 남아 있는 min_date 이전 날짜 중 아직 보관 안 된 날짜를 씀.
+    반환: (쓴 행 수, 실패한 날짜) - 실패한 날짜는 지우지 않도록 호출하는 쪽에서 처리
+    """
+    if not parquet_available():
+        return 0, []
+
+    dates = (
+        FlightSnapshot.objects.filter(flight_date__lt=min_date)
+        .order_by("flight_date").values_list("flight_date", flat=True).distinct()
+    )
+    done = archived_dates()
+    written, failed = 0, []
+    for d in dates:
+        if d in done:
+            continue
+        try:
+            written += write_day(d)
+        except Exception:
+            logger.warning("flight parquet archive failed for %s", d, exc_info=True)
+            failed.append(d)
+    return written, failed
+
+
+def training_frame(batch) -> "pd.DataFrame":
+    """
+    보관 배치(pyarrow RecordBatch) → 1.Model 학습 CSV(new_flight_weather_merged.csv)와 같은 컬럼.
+    지연_분은 etd가 있을 때만 (etd - std, 자정 넘김 보정)
+    """
+    import numpy as np
+    import pandas as pd
+
+    df = batch.to_pandas()
+    dep_dt = pd.to_datetime(df["flight_date"].astype(str) + df["std"], format="%Y%m%d%H%M", errors="coerce")
+
+    etd = pd.to_datetime(df["flight_date"].astype(str) + df["etd"].fillna(""), format="%Y%m%d%H%M", errors="coerce")
+    minutes = (etd - dep_dt).dt.total_seconds() / 60
+    minutes = minutes.where(minutes > -12 * 60, minutes + 24 * 60)
+
+    status = df["status"].fillna("")
+    state = np.select(
+        [status.str.contains("결항"), status.str.contains("회항"), status.str.contains("지연")],
+        ["결항", "회항", "지연"],
+        default="정상",
+    )
+
+    def arrival_code(name):
+        a = get_airport(name)
+        return a.iata if a else None
+
+    return pd.DataFrame({
+        "departure_datetime": dep_dt,
+        "항공사": df["airline"],
+        "출발지": df["dep_airport"].map(IATA_TO_KOR),
+        "arrival_code": df["destination"].map(arrival_code),
+        "flight_type": df["destination"].map(flight_type_for),
+        "기온(°C)": df["ta"],
+        "풍속_ms": df["ws02"],
+        "상태": state,
+        "지연_분": minutes,
+        "is_delay": (state == "지연").astype(int),
+        "flight_no": df["flight_no"],
+    })
@@ -0,0 +1,176 @@
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .airline import iter_flights_for_date, split_board
+from .models import FlightSnapshot
+
+# 항공편 현황 단계별 갱신 (가까운 편일수록 자주)
+#  - near   : 지금 ~ 2시간 뒤 출발/도착 편 (1분마다)   ← 상태(지연/결항/탑승중)가 실제로 바뀌는 구간
+#             + 예정시각(STD)이 지났어도 ETD가 아직 안 지났거나 저장된 상태가 최종(출발/도착/결항/회항)이 아닌 편
+#  - today  : 오늘 나머지 편 (10분마다)
+#  - future : 내일 ~ 7일 뒤 (1시간마다)
+# 날짜마다 페이지 인덱스(find_page_for_date)로 그 날짜 페이지를 찾고, STD 구간을 벗어나는 페이지는 받지 않음
+TIERS = ("near", "today", "future")
+TIER_INTERVALS = {"near": 60, "today": 600, "future": 3600}   # run_scheduler 기본 주기(초)
+NEAR_HOURS = 2
+NEAR_LOOKBACK_MINUTES = 30     # STD/ETD가 막 지난 편은 그대로 near에서 갱신
+NEAR_PENDING_HOURS = 6         # STD가 이만큼 지난 편까지는 최종 상태가 될 때까지 near에서 갱신 (크게 지연된 편)
+FINAL_STATUSES = ("출발", "도착", "결항", "회항")
+FUTURE_DAYS = 7
+
+# 현황판 행에서 FlightSnapshot으로 옮기는 값 (키는 (ufid, kind))
+FIELDS = (
+    "airport_code", "flight_date", "std", "etd", "airline", "flight_no",
+    "origin", "destination", "status", "gate", "line", "io",
+)
+# UFID가 없는 행의 키 (UFID가 NULL인 행끼리는 이 키로 유일 - FlightSnapshot uniq_flight_legacy_key)
+LEGACY_KEY = ("airport_code", "kind", "flight_date", "std", "flight_no", "origin", "destination")
+
+
+def _legacy_key(r) -> tuple:
+    return tuple(r[k] if isinstance(r, dict) else getattr(r, k) for k in LEGACY_KEY)
+
+
+def _row_key(r) -> tuple:
+    """현황판 행(dict) / FlightSnapshot 공통 키: (ufid, kind), UFID가 없으면 예전 키"""
+    ufid, kind = (r["ufid"], r["kind"]) if isinstance(r, dict) else (r.ufid, r.kind)
+    return (ufid, kind) if ufid else _legacy_key(r)
+
+
+def tier_windows(tier: str, now=None) -> list[tuple[str, str, str]]:
+    """
+    단계별 갱신 구간 [(YYYYMMDD, std 시작(포함), std 끝(미포함)), ...] (hhmm 문자열, 하루 끝은 2400).
+    near는 NEAR_PENDING_HOURS 전부터 (그 안에서 어떤 편을 갱신할지는 near_rows)
+    """
+    now = timezone.localtime(now or timezone.now()).replace(second=0, microsecond=0)
+    today = now.strftime("%Y%m%d")
+    near_end = now + timedelta(hours=NEAR_HOURS)
+
+    if tier == "near":
+        start = now - timedelta(hours=NEAR_PENDING_HOURS)
+        out = []
+        day = start.replace(hour=0, minute=0)
+        # 자정을 걸치면 어제 늦은 편 / 내일 새벽 편까지 날짜별로 나눔
+        while day < near_end:
+            nxt = day + timedelta(days=1)
+            lo = max(start, day)
+            hi = min(near_end, nxt)
+            if lo < hi:
+                out.append((day.strftime("%Y%m%d"), lo.strftime("%H%M"), "2400" if hi == nxt else hi.strftime("%H%M")))
+            day = nxt
+        return out
+    if tier == "today":
+        if near_end.date() != now.date():
+            return []
+        return [(today, near_end.strftime("%H%M"), "2400")]
+    if tier == "future":
+        return [
+            ((now + timedelta(days=d)).strftime("%Y%m%d"), "0000", "2400")
+            for d in range(1, FUTURE_DAYS + 1)
+        ]
+    raise ValueError(f"tier must be one of {TIERS}: {tier}")
+
+
+def _at(flight_date: str, hhmm: str, tz):
+    return datetime.strptime(flight_date + hhmm, "%Y%m%d%H%M").replace(tzinfo=tz)
+
+
+def _etd_at(r: dict, std_dt):
+    """ETD 시각 (없으면 None). STD보다 12시간 넘게 이르면 자정을 넘긴 것으로 봄 (FlightSnapshotQuerySet.with_delay와 같은 규칙)"""
+    if not r.get("etd"):
+        return None
+    etd = _at(r["flight_date"], r["etd"], std_dt.tzinfo)
+    if etd - std_dt < -timedelta(hours=12):
+        etd += timedelta(days=1)
+    return etd
+
+
+def near_rows(rows: list[dict], flight_date: str, now=None) -> list[dict]:
+    """
+    near 구간 창에서 받은 행 중 이번에 갱신할 편:
+    STD 또는 ETD가 [지금-30분, 지금+2시간) 안이거나, STD가 지났는데 DB에 저장된 상태가 아직 최종이 아닌 편
+    (피드가 최종 상태로 바뀐 순간도 놓치지 않도록 새 상태가 아니라 저장된 상태로 판단)
+    """
+    now = timezone.localtime(now or timezone.now()).replace(second=0, microsecond=0)
+    lo = now - timedelta(minutes=NEAR_LOOKBACK_MINUTES)
+    hi = now + timedelta(hours=NEAR_HOURS)
+    pending = {
+        _row_key(obj) for obj in
+        FlightSnapshot.objects.filter(flight_date=flight_date).exclude(status__in=FINAL_STATUSES).only("ufid", *LEGACY_KEY)
+    }
+
+    out = []
+    for r in rows:
+        std = _at(flight_date, r["std"], now.tzinfo)
+        if std >= hi:
+            continue
+        etd = _etd_at(r, std)
+        if lo <= std or (etd is not None and lo <= etd < hi) or _row_key(r) in pending:
+            out.append(r)
+    return out
+
+
+def upsert_snapshots(rows: list[dict], flight_date: str) -> tuple[int, int]:
+    """
+    한 날짜의 현황판 행을 FlightSnapshot에 반영. (ufid, kind)로 (UFID가 없으면 예전 키로) 그 날짜 기존 행을 한 번에 읽어서
+    새 편은 bulk_create, 바뀐 편(상태/ETD/게이트/시각 변경 등)만 bulk_update. 반환: (추가, 변경)
+    """
+    incoming = {_row_key(r): r for r in rows}
+
+    # 예정 시각이 바뀌어 구간을 넘어간 편도 같은 UFID로 찾도록 날짜 전체를 읽음 (flight_date 인덱스)
+    existing, by_legacy = {}, {}
+    for obj in FlightSnapshot.objects.filter(flight_date=flight_date).only("ufid", "kind", *FIELDS):
+        if obj.ufid:
+            existing[(obj.ufid, obj.kind)] = obj
+        by_legacy[_legacy_key(obj)] = obj
+
+    now = timezone.now()
+    new, changed, seen = [], [], []
+    for key, r in incoming.items():
+        obj = existing.get(key) if r["ufid"] else None
+        if obj is None:
+            # UFID 없는 행 → 예전 키로 찾음. 처음 보는 UFID → UFID 없이 저장돼 있던 같은 편이 있으면 그 행에 UFID를 채움
+            obj = by_legacy.get(_legacy_key(r))
+            if obj is not None and r["ufid"] and obj.ufid:
+                obj = None
+            if obj is None:
+                new.append(FlightSnapshot(ufid=r["ufid"], kind=r["kind"], **{k: r[k] for k in FIELDS}))
+                continue
+        if (not r["ufid"] or obj.ufid == r["ufid"]) and all(getattr(obj, k) == r[k] for k in FIELDS):
+            seen.append(obj.pk)
+            continue
+        if r["ufid"]:
+            obj.ufid = r["ufid"]
+        for k in FIELDS:
+            setattr(obj, k, r[k])
+        obj.updated_at = now
+        changed.append(obj)
+
+    with transaction.atomic():
+        FlightSnapshot.objects.bulk_create(new, batch_size=500, ignore_conflicts=True)
+        FlightSnapshot.objects.bulk_update(changed, ["ufid", *FIELDS, "updated_at"], batch_size=500)
+        # 안 바뀐 편도 "마지막 갱신" 시각은 이번 조회 기준으로 (SQLite 변수 개수 제한 안쪽으로 나눠서)
+        for i in range(0, len(seen), 500):
+            FlightSnapshot.objects.filter(pk__in=seen[i:i + 500]).update(updated_at=now)
+    return len(new), len(changed)
+
+
+def sync_tier(tier: str, now=None) -> dict:
+    """단계 하나 갱신. 날짜별로 STD 구간에 걸친 upstream 페이지만 받음. 지연 예측 갱신은 호출하는 쪽에서 (counts["dates"])"""
+    counts = {"tier": tier, "dates": [], "flights": 0, "created": 0, "updated": 0}
+    for flight_date, std_from, std_to in tier_windows(tier, now):
+        target = datetime.strptime(flight_date, "%Y%m%d").date()
+        rows = [
+            r for r in split_board(iter_flights_for_date(target, std_from=std_from, std_to=std_to), flight_date)
+            if std_from <= r["std"] < std_to
+        ]
+        if tier == "near":
+            rows = near_rows(rows, flight_date, now)
+        created, updated = upsert_snapshots(rows, flight_date)
+        counts["dates"].append(flight_date)
+        counts["flights"] += len(rows)
+        counts["created"] += created
+        counts["updated"] += updated
+    return counts
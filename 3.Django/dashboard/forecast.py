@@ -0,0 +1,84 @@
+# dashboard/forecast.py
+import os
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from dotenv import load_dotenv
+
+from .airports import get_nxny
+from .forecast_series import ForecastSeries
+from .http import get_session
+from .models import WeatherForecast
+
+load_dotenv()
+KST = ZoneInfo("Asia/Seoul")
+
+# 기상청 단기예보 (2.RAG/final.py get_weather와 같은 API)
+VILAGE_URL = "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
+VILAGE_BASE_TIMES = ["0200", "0500", "0800", "1100", "1400", "1700", "2000", "2300"]
+# 발표시각 뒤 API에 올라오기까지 걸리는 시간
+PUBLISH_DELAY = timedelta(minutes=10)
+
+
+def pick_latest_vilage_base(now_kst: datetime | None = None) -> tuple[str, str]:
+    now_kst = now_kst or datetime.now(KST)
+    ymd = now_kst.strftime("%Y%m%d")
+    hm = now_kst.strftime("%H%M")
+
+    candidates = [t for t in VILAGE_BASE_TIMES if t <= hm]
+    if candidates:
+        return ymd, candidates[-1]
+
+    # 새벽이면 전날 23시
+    return (now_kst - timedelta(days=1)).strftime("%Y%m%d"), "2300"
+
+
+def published_vilage_base(now_kst: datetime | None = None) -> tuple[str, str]:
+    """API에서 실제로 받을 수 있는 가장 최근 발표 (발표시각 + 10분 뒤부터 제공)"""
+    now_kst = now_kst or datetime.now(KST)
+    return pick_latest_vilage_base(now_kst - PUBLISH_DELAY)
+
+
+def download_forecast(nx: int, ny: int, base_date: str, base_time: str) -> list[list]:
+    """
+    기상청 API에서 격자 하나의 단기예보(TMP 기온, WSD 풍속)를 받아 [[YYYYMMDDHHMM, TMP, WSD], ...] 시간순으로 반환.
+    sync_forecast 전용 (요청 처리 중에는 호출하지 않음). 실패하면 requests/KeyError 예외 그대로 올림
+    """
+    key = os.getenv("KMA_SERVICE_KEY")
+    if not key:
+        raise RuntimeError("Missing env KMA_SERVICE_KEY")
+
+    params = {
+        "serviceKey": key,
+        "numOfRows": 1000,
+        "pageNo": 1,
+        "dataType": "JSON",
+        "base_date": base_date,
+        "base_time": base_time,
+        "nx": nx,
+        "ny": ny,
+    }
+    r = get_session().get(VILAGE_URL, params=params, timeout=(3, 20))
+    r.raise_for_status()
+    items = r.json()["response"]["body"]["items"]["item"]
+    return ForecastSeries.from_items(items).to_rows()
+
+
+def fetch_forecast(airport_code: str) -> ForecastSeries:
+    """
+    공항 격자의 저장된 최신 단기예보를 시간순 배열(ForecastSeries, .base = 발표시각 YYYYMMDDHHMM)로 반환.
+    DB(WeatherForecast)만 읽고 API는 부르지 않음. 아직 받아 둔 게 없으면 빈 시리즈
+    """
+    nxny = get_nxny(airport_code)
+    row = None
+    if nxny:
+        row = (
+            WeatherForecast.objects
+            .filter(nx=nxny[0], ny=nxny[1])
+            .order_by("-base_date", "-base_time")
+            .values("base_date", "base_time", "series")
+            .first()
+        )
+    if not row:
+        return ForecastSeries([], [], [])
+    return ForecastSeries.from_rows(row["series"], base=row["base_date"] + row["base_time"])
@@ -0,0 +1,82 @@
+import numpy as np
+
+# 단기예보(TMP 기온, WSD 풍속) 시계열을 시간순 numpy 배열로 들고 있다가 출발 시각별 값을 searchsorted로 찾는 모듈
+# 기준은 final.py get_weather와 동일: 출발 시각 이전(같으면 포함)의 가장 최근 예보 시각 값
+
+
+def _to_float(v) -> float:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _to_time(v) -> int:
+    # "YYYYMMDDHHMM" / datetime / pandas Timestamp 모두 YYYYMMDDHHMM 정수로
+    if hasattr(v, "strftime"):
+        return int(v.strftime("%Y%m%d%H%M"))
+    return int(str(v)[:12])
+
+
+class ForecastSeries:
+    def __init__(self, times, tmp, wsd, base: str = ""):
+        order = np.argsort(times, kind="stable")
+        self.times = np.asarray(times, dtype=np.int64)[order]
+        self.tmp = np.asarray(tmp, dtype=np.float64)[order]
+        self.wsd = np.asarray(wsd, dtype=np.float64)[order]
+        self.base = base            # 발표시각 YYYYMMDDHHMM (없으면 "")
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @classmethod
+    def from_items(cls, items, base: str = "") -> "ForecastSeries":
+        """기상청 getVilageFcst 응답 item 리스트 → TMP/WSD만 시간별로 모음"""
+        by_time: dict[int, list] = {}
+        for it in items:
+            cat = it.get("category")
+            if cat not in ("TMP", "WSD"):
+                continue
+            slot = by_time.setdefault(int(it["fcstDate"] + it["fcstTime"]), [np.nan, np.nan])
+            slot[0 if cat == "TMP" else 1] = _to_float(it.get("fcstValue"))
+        times = list(by_time)
+        return cls(times, [by_time[t][0] for t in times], [by_time[t][1] for t in times], base)
+
+    @classmethod
+    def from_rows(cls, rows, base: str = "") -> "ForecastSeries":
+        """[[YYYYMMDDHHMM, TMP, WSD], ...] (WeatherForecast.series 형식) → 배열"""
+        return cls(
+            [int(r[0]) for r in rows],
+            [_to_float(r[1]) for r in rows],
+            [_to_float(r[2]) for r in rows],
+            base,
+        )
+
+    def to_rows(self) -> list[list]:
+        return [
+            [str(t), None if np.isnan(a) else float(a), None if np.isnan(b) else float(b)]
+            for t, a, b in zip(self.times.tolist(), self.tmp, self.wsd)
+        ]
+
+    def lookup(self, dep_times) -> np.ndarray:
+        """출발 시각들 → 사용할 예보 행 번호 배열 (이전 예보가 없으면 -1)"""
+        t = np.fromiter((_to_time(x) for x in dep_times), dtype=np.int64)
+        return np.searchsorted(self.times, t, side="right") - 1
+
+    def at_many(self, dep_times) -> list[dict | None]:
+        """출발 시각 여러 개를 한 번에 → [{"기온(°C)", "풍속_ms"} 또는 None, ...]"""
+        idx = self.lookup(dep_times)
+        out = []
+        for i in idx.tolist():
+            if i < 0:
+                out.append(None)
+                continue
+            tmp, wsd = self.tmp[i], self.wsd[i]
+            out.append({
+                "기온(°C)": None if np.isnan(tmp) else float(tmp),
+                "풍속_ms": None if np.isnan(wsd) else float(wsd),
+            })
+        return out
+
+    def at(self, dep_time) -> dict | None:
+        return self.at_many([dep_time])[0]
@@ -0,0 +1,18 @@
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 외부 API(공공데이터 항공편, 기상청 AMOS/단기예보) 공용 requests 세션
+# 프로세스당 하나 → 같은 호스트로의 연결(keep-alive, TLS)을 재사용. run_scheduler처럼 오래 떠 있는 프로세스에서 효과가 큼
+# (세션에 쿠키/인증 상태는 안 씀 → 여러 스레드에서 같이 써도 됨, 연결 풀은 urllib3가 스레드 안전하게 관리)
+POOL_MAXSIZE = 16   # 호스트당 동시 연결 수 (sync_weather 동시 요청 수 이상)
+
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=POOL_MAXSIZE)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
@@ -0,0 +1,70 @@
+import os
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from django.utils import timezone
+
+from dashboard.airports import AIRPORT_TO_STN
+from dashboard.amos import fetch_amos
+from dashboard.http import get_session
+from dashboard.models import WeatherSnapshot
+from dashboard.weather_history import RAW_DAYS, append_observations
+
+
+class Command(BaseCommand):
+    help = "Backfill WeatherSnapshot gaps from AMOS in large dtm windows (one request per window per station)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=1, help="look back at most N days (default 1)")
+        parser.add_argument("--window", type=int, default=60, help="minutes per AMOS request (default 60)")
+        parser.add_argument("--only", type=str, default="", help="comma-separated airport codes e.g. ICN,GMP")
+
+    def handle(self, *args, **opts):
+        key = (os.getenv("KEY") or "").strip()
+        if not key:
+            raise CommandError("missing KEY in env")
+        if not 0 < opts["days"] <= RAW_DAYS:
+            # raw 보관기간보다 오래된 구간은 넣어도 prune_weather가 바로 집계로 옮김
+            raise CommandError(f"--days must be 1..{RAW_DAYS} (WEATHER_RAW_DAYS)")
+
+        window = opts["window"]
+        now = timezone.localtime().replace(second=0, microsecond=0)
+        floor = now - timedelta(days=opts["days"])
+        only = [x.strip().upper() for x in opts["only"].split(",") if x.strip()]
+        airports = [a for a in (only or AIRPORT_TO_STN) if AIRPORT_TO_STN.get(a)]
+
+        # 공항별 마지막 저장 시각부터 채움 (없거나 너무 오래됐으면 --days 전부터)
+        last = dict(
+            WeatherSnapshot.objects
+            .filter(airport_code__in=airports)
+            .values_list("airport_code")
+            .annotate(Max("observed_at"))
+        )
+
+        session = get_session()
+        total = calls = failed = 0
+        for airport in airports:
+            stn = AIRPORT_TO_STN[airport]
+            start = max(floor, timezone.localtime(last[airport])) if airport in last else floor
+
+            # tm 기준 이전 window분이 한 번에 오므로 tm을 뒤로 window만큼씩 옮김
+            tm = now
+            added = 0
+            while tm > start:
+                calls += 1
+                try:
+                    batch = fetch_amos(stn, key, dtm=window, tm=tm.strftime("%Y%m%d%H%M"), session=session)
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"[{airport}] {tm:%Y%m%d%H%M} failed: {type(e).__name__}")
+                else:
+                    added += append_observations([{"airport_code": airport, **row} for row in batch.rows()])
+                tm -= timedelta(minutes=window)
+
+            total += added
+            self.stdout.write(f"[{airport}] from {start:%Y-%m-%d %H:%M}: {added} rows")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Weather backfill done: {total} rows, {calls} requests, {failed} failed"
+        ))
@@ -0,0 +1,68 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.delay import CAT_COLS, CLASSIFIER_PATH, FAST_MODEL_PATH, REGRESSOR_PATH
+from dashboard.fast_model import cache_path, file_version, load_fast_models, sample_rows
+
+
+class Command(BaseCommand):
+    help = "Benchmark joblib vs numpy fast-path delay models (single-row latency / batch throughput)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--single", type=int, default=200, help="single-row calls per backend")
+        parser.add_argument("--rows", type=int, default=2000, help="batch size")
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **opts):
+        import joblib
+        import numpy as np
+        import pandas as pd
+
+        fast_path = cache_path(FAST_MODEL_PATH, file_version([CLASSIFIER_PATH, REGRESSOR_PATH]))
+        if not fast_path.exists():
+            raise CommandError(f"{fast_path} not found (run export_fast_model first)")
+
+        clf, reg = joblib.load(CLASSIFIER_PATH), joblib.load(REGRESSOR_PATH)
+        fast = load_fast_models(fast_path)
+        clf_cols, reg_cols = list(clf.feature_name_), list(reg.feature_names_in_)
+
+        # delay.predict_flights와 같은 방식 (DataFrame → 분류 → 지연 행만 회귀)
+        def run_joblib(rows):
+            X = pd.DataFrame(rows)
+            for c in CAT_COLS:
+                X[c] = X[c].astype("category")
+            p = clf.predict_proba(X[clf_cols])[:, 1]
+            return p, reg.predict(X[reg_cols])
+
+        def run_fast(rows):
+            return fast["clf"].predict_proba(rows)[:, 1], fast["reg"].predict(rows)
+
+        batch = sample_rows(fast["clf"], opts["rows"], seed=1)
+        singles = [[r] for r in sample_rows(fast["clf"], opts["single"], seed=2)]
+
+        p1, m1 = run_joblib(batch)
+        p2, m2 = run_fast(batch)
+        self.stdout.write(f"max |prob diff|: {np.max(np.abs(p1 - p2)):.2e}, max |minutes diff|: {np.max(np.abs(m1 - m2)):.2e}")
+
+        for name, fn in (("joblib", run_joblib), ("fast", run_fast)):
+            lat = []
+            for rows in singles:
+                t0 = time.perf_counter()
+                fn(rows)
+                lat.append((time.perf_counter() - t0) * 1000)
+            lat.sort()
+
+            best = float("inf")
+            for _ in range(opts["repeat"]):
+                t0 = time.perf_counter()
+                fn(batch)
+                best = min(best, time.perf_counter() - t0)
+
+            self.stdout.write(
+                f"{name:6s} single p50={statistics.median(lat):.2f}ms p95={lat[int(len(lat) * 0.95) - 1]:.2f}ms | "
+                f"batch {opts['rows']} rows {best * 1000:.0f}ms ({opts['rows'] / best:,.0f} rows/s)"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Benchmark done"))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.delay import CLASSIFIER_PATH, FAST_MODEL_PATH, REGRESSOR_PATH
+from dashboard.fast_model import export_from_joblib
+
+
+class Command(BaseCommand):
+    help = "Build the numpy fast-path cache for the current joblib delay models (model/delay_models-<hash>.npz)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--out", default=str(FAST_MODEL_PATH), help="cache base path; the joblib hash is added to the name")
+        parser.add_argument("--check-rows", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        # ModelRegistry가 첫 로드 때 하는 것과 같은 작업을 배포 전에 미리 (원래 모델과 결과가 다르면 실패)
+        try:
+            report = export_from_joblib(CLASSIFIER_PATH, REGRESSOR_PATH, opts["out"], check_rows=opts["check_rows"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        for k, v in report.items():
+            self.stdout.write(f"{k}: {v}")
+
+        self.stdout.write(self.style.SUCCESS("Fast model export done"))
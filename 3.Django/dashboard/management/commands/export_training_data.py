@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.flight_archive import ARCHIVE_DIR, parquet_available, partitioning, training_frame
+
+
+class Command(BaseCommand):
+    help = "Export delay-model training rows (1.Model CSV columns) from the Parquet flight archive"
+
+    def add_arguments(self, parser):
+        parser.add_argument("out", help="output file (.csv or .parquet)")
+        parser.add_argument("--start", type=str, default="", help="first flight_date YYYYMMDD")
+        parser.add_argument("--end", type=str, default="", help="last flight_date YYYYMMDD")
+        parser.add_argument("--only", type=str, default="", help="comma-separated departure airports e.g. ICN,GMP")
+        parser.add_argument("--with-weather", action="store_true", help="skip flights without an AMOS observation")
+
+    def handle(self, *args, **opts):
+        if not parquet_available():
+            raise CommandError("pyarrow is not installed (or FLIGHT_PARQUET=0)")
+        if not ARCHIVE_DIR.exists():
+            raise CommandError(f"no archive at {ARCHIVE_DIR}")
+
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        dataset = ds.dataset(ARCHIVE_DIR, format="parquet", partitioning=partitioning())
+
+        # 날짜는 파티션 디렉터리로, 나머지는 파일 통계(row group min/max)로 걸러짐 → 필요한 부분만 읽음
+        # 출발편 행만 (도착편 행은 같은 편이 출발 공항 쪽에 한 번 더 있음, 해외 출발은 날씨가 없음)
+        cond = ds.field("kind") == "dep"
+        if opts["start"]:
+            cond &= ds.field("flight_date") >= opts["start"]
+        if opts["end"]:
+            cond &= ds.field("flight_date") <= opts["end"]
+        only = [x.strip().upper() for x in opts["only"].split(",") if x.strip()]
+        if only:
+            cond &= ds.field("dep_airport").isin(only)
+        if opts["with_weather"]:
+            cond &= ds.field("ta").is_valid()
+
+        columns = [
+            "flight_date", "std", "etd", "airline", "flight_no", "destination",
+            "status", "dep_airport", "ta", "ws02",
+        ]
+
+        out = Path(opts["out"])
+        out.parent.mkdir(parents=True, exist_ok=True)
+        total = 0
+        writer = None
+        try:
+            # 배치 단위로 변환해서 바로 씀 (전체를 메모리에 올리지 않음)
+            for batch in dataset.to_batches(columns=columns, filter=cond):
+                if not batch.num_rows:
+                    continue
+                df = training_frame(batch)
+                if out.suffix == ".parquet":
+                    table = pa.Table.from_pandas(df, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(out, table.schema, compression="zstd")
+                    writer.write_table(table)
+                else:
+                    # 첫 배치만 헤더 + BOM (엑셀에서 한글 안 깨지게)
+                    first = total == 0
+                    df.to_csv(out, mode="w" if first else "a", header=first, index=False,
+                              encoding="utf-8-sig" if first else "utf-8")
+                total += len(df)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        self.stdout.write(self.style.SUCCESS(f"Training export done: {total} rows -> {out}"))
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dashboard.retention import ARCHIVE, BATCH, prune_archive, prune_flights
+
+
+class Command(BaseCommand):
+    help = "Delete past FlightSnapshot rows in small raw-SQL batches, optionally archiving them first (run daily)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-days", type=int, default=0, help="keep N past days in FlightSnapshot (default 0 = today onward)")
+        parser.add_argument("--archive", action="store_true", default=ARCHIVE, help="copy rows to FlightArchive before deleting (env FLIGHT_ARCHIVE=1)")
+        parser.add_argument("--archive-days", type=int, default=0, help="drop FlightArchive rows older than N days (0 = keep forever)")
+        parser.add_argument("--batch", type=int, default=BATCH, help=f"rows per DELETE (default {BATCH})")
+
+    def handle(self, *args, **opts):
+        today = timezone.localdate()
+        min_date = (today - timedelta(days=opts["keep_days"])).strftime("%Y%m%d")
+        max_date = (today + timedelta(days=7)).strftime("%Y%m%d")
+
+        out = prune_flights(min_date, max_date, archive=opts["archive"], batch=opts["batch"])
+
+        archive_deleted = 0
+        if opts["archive_days"] > 0:
+            archive_min = (today - timedelta(days=opts["archive_days"])).strftime("%Y%m%d")
+            archive_deleted = prune_archive(archive_min, batch=opts["batch"])
+
+        if out["parquet_failed"]:
+            # 실패한 날짜부터는 지우지 않고 남겨 둠 → 계속 실패하면 DB가 줄지 않으니 눈에 띄게
+            self.stderr.write(self.style.WARNING(
+                f"parquet archive failed for {', '.join(out['parquet_failed'])}; rows from {min(out['parquet_failed'])} kept"
+            ))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Flight prune done: {out['deleted']} past rows deleted ({out['archived']} archived), "
+            f"{out['future_deleted']} far-future rows deleted, {archive_deleted} archive rows expired, "
+            f"{out['parquet_rows']} rows to parquet (failed days: {out['parquet_failed'] or '-'})"
+        ))
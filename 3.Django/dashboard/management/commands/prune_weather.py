@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.weather_history import HOURLY_DAYS, RAW_DAYS, TENMIN_DAYS, prune
+
+
+class Command(BaseCommand):
+    help = "Roll up old AMOS history (raw 1min -> 10min -> 1h) and drop expired rows (run daily)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--raw-days", type=int, default=RAW_DAYS, help="keep raw 1-minute rows for N days")
+        parser.add_argument("--tenmin-days", type=int, default=TENMIN_DAYS, help="keep 10-minute aggregates for N days")
+        parser.add_argument("--hourly-days", type=int, default=HOURLY_DAYS, help="keep hourly aggregates for N days (0 = forever)")
+
+    def handle(self, *args, **opts):
+        if not 0 < opts["raw_days"] <= opts["tenmin_days"]:
+            raise SystemExit("need 0 < --raw-days <= --tenmin-days")
+
+        out = prune(
+            raw_days=opts["raw_days"],
+            tenmin_days=opts["tenmin_days"],
+            hourly_days=opts["hourly_days"],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Weather prune done: raw->10m {out['10m'][0]} buckets ({out['10m'][1]} rows removed), "
+            f"10m->1h {out['1h'][0]} buckets ({out['1h'][1]} rows removed), "
+            f"{out['1h_deleted']} expired hourly rows"
+        ))
@@ -0,0 +1,58 @@
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.scheduler import DEFAULT_JITTER, DEFAULT_JOBS, Job, Scheduler
+
+
+class Command(BaseCommand):
+    help = "Run all sync jobs in one long-lived process (replaces cron entries for sync_* commands)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--only", type=str, default="", help="comma-separated job names e.g. sync_weather,sync_flights_near")
+        parser.add_argument("--interval", action="append", default=[], metavar="JOB=SECONDS",
+                            help="override a job interval, repeatable e.g. --interval sync_weather=120")
+        parser.add_argument("--jitter", type=float, default=DEFAULT_JITTER, help="max delay as a fraction of the interval")
+        parser.add_argument("--workers", type=int, default=2, help="jobs allowed to run at the same time")
+        parser.add_argument("--once", action="store_true", help="run every job once in order and exit")
+
+    def handle(self, *args, **opts):
+        specs = {name: (command, options) for name, _, command, options in DEFAULT_JOBS}
+        intervals = {name: interval for name, interval, _, _ in DEFAULT_JOBS}
+        for item in opts["interval"]:
+            name, _, seconds = item.partition("=")
+            if name not in intervals or not seconds.isdigit() or int(seconds) <= 0:
+                raise CommandError(f"bad --interval {item!r} (jobs: {', '.join(intervals)})")
+            intervals[name] = int(seconds)
+
+        only = [x.strip() for x in opts["only"].split(",") if x.strip()]
+        unknown = [x for x in only if x not in intervals]
+        if unknown:
+            raise CommandError(f"unknown job(s): {unknown}")
+
+        jobs = [
+            Job(name=name, interval=interval, command=specs[name][0], options=specs[name][1], jitter=opts["jitter"])
+            for name, interval in intervals.items()
+            if not only or name in only
+        ]
+        scheduler = Scheduler(jobs, workers=opts["workers"], log=self.stdout.write)
+
+        if opts["once"]:
+            results = scheduler.run_once()
+            failed = [name for name, ok in results.items() if not ok]
+            if failed:
+                # cron/CI에서 실패를 알 수 있게 0이 아닌 종료 코드로
+                raise CommandError(f"{len(failed)}/{len(results)} jobs failed: {', '.join(failed)}")
+            self.stdout.write(self.style.SUCCESS(f"Scheduler run done: {len(results)} jobs"))
+            return
+
+        def _stop(signum, frame):
+            self.stdout.write("stopping after running jobs finish...")
+            scheduler.stop.set()
+
+        signal.signal(signal.SIGINT, _stop)
+        signal.signal(signal.SIGTERM, _stop)
+
+        self.stdout.write(", ".join(f"{j.name}/{j.interval}s" for j in jobs))
+        scheduler.run_forever()
+        self.stdout.write(self.style.SUCCESS("Scheduler stopped"))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dashboard.delay import score_snapshots, upcoming_snapshots
+from dashboard.flight_sync import TIERS, sync_tier
+from dashboard.retention import prune_flights
+
+
+class Command(BaseCommand):
+    help = ("Tiered flight status sync: near (now~2h plus delayed flights not yet final, every 1min), "
+            "today (rest of today, 10min), future (+1~7 days, hourly)")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tier", choices=(*TIERS, "all"), default="all")
+
+    def handle(self, *args, **opts):
+        tiers = TIERS if opts["tier"] == "all" else (opts["tier"],)
+
+        dates = set()
+        for tier in tiers:
+            c = sync_tier(tier)
+            dates.update(c["dates"])
+            self.stdout.write(
+                f"[{tier}] {len(c['dates'])} days, {c['flights']} flights, "
+                f"{c['created']} new, {c['updated']} changed"
+            )
+
+        # 오늘 이전 데이터 정리 (10분 단계에서 한 번이면 충분)
+        if "today" in tiers:
+            prune_flights(timezone.localdate().strftime("%Y%m%d"))
+
+        # 새 편/상태 바뀐 편 지연 예측 (날씨 기준이 같은 편은 건너뜀)
+        if dates:
+            try:
+                scored = score_snapshots(upcoming_snapshots().filter(flight_date__in=dates))
+                self.stdout.write(f"Delay scored: {scored}")
+            except Exception as e:
+                self.stderr.write(f"delay scoring failed: {type(e).__name__}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"Flight sync done: {', '.join(tiers)}"))
@@ -1,8 +1,9 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from dashboard.models import FlightSnapshot
-from dashboard.airline import get_board, AIRPORT_KOR
+from dashboard.retention import prune_flights
+from dashboard.flight_sync import sync_tier
+from dashboard.delay import score_snapshots, upcoming_snapshots
 
 
 class Command(BaseCommand):
@@ -12,31 +13,19 @@ class Command(BaseCommand):
         today = timezone.localdate().strftime("%Y%m%d")
         total = 0
 
-        for airport_code in AIRPORT_KOR.keys():
-            for kind in ("dep", "arr"):
-                rows = get_board(airport_code=airport_code, kind=kind, limit=500)
-
-                for x in rows:
-                    std = (x.get("time") or "").replace(":", "")
-                    if len(std) != 4:
-                        continue
-
-                    FlightSnapshot.objects.update_or_create(
-                        airport_code=airport_code,
-                        kind=kind,
-                        flight_date=today,
-                        std=std,
-                        flight_no=x.get("flight") or "-",
-                        origin=x.get("origin") or "-",
-                        destination=x.get("destination") or "-",
-                        defaults={
-                            "airline": x.get("airline") or "-",
-                            "status": x.get("status") or "정상",
-                        },
-                    )
-                    total += 1
+        # near(지금~2시간) + today(오늘 나머지) 단계를 한 번에 (run_scheduler에서는 sync_flights --tier로 주기를 나눠 돌림)
+        for tier in ("near", "today"):
+            c = sync_tier(tier)
+            total += c["created"] + c["updated"]
 
         # 오늘 이전 데이터 정리
-        FlightSnapshot.objects.filter(flight_date__lt=today).delete()
+        prune_flights(today)
+
+        # 남은 오늘 편 지연 예측 갱신 (날씨 기준이 바뀐 편만)
+        try:
+            scored = score_snapshots(upcoming_snapshots().filter(flight_date=today))
+            self.stdout.write(f"Delay scored: {scored}")
+        except Exception as e:
+            self.stderr.write(f"delay scoring failed: {type(e).__name__}: {e}")
 
         self.stdout.write(self.style.SUCCESS(f"Today sync done: {total} upserts"))
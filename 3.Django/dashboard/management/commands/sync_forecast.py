@@ -0,0 +1,70 @@
+import os
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from dashboard.airports import all_airports
+from dashboard.delay import score_snapshots, upcoming_snapshots
+from dashboard.forecast import download_forecast, published_vilage_base
+from dashboard.models import WeatherForecast
+
+
+class Command(BaseCommand):
+    help = "Prefetch KMA short-term forecasts for every airport grid (run hourly; new data every 3h at base time + 10min)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="re-download even if this base time is stored")
+        parser.add_argument("--keep-days", type=int, default=3)
+
+    def handle(self, *args, **opts):
+        if not os.getenv("KMA_SERVICE_KEY"):
+            raise CommandError("Missing env KMA_SERVICE_KEY")
+
+        base_date, base_time = published_vilage_base()
+        grids = sorted({(a.nx, a.ny) for a in all_airports()})
+
+        have = set()
+        if not opts["force"]:
+            have = set(
+                WeatherForecast.objects
+                .filter(base_date=base_date, base_time=base_time)
+                .values_list("nx", "ny")
+            )
+
+        fetched = failed = 0
+        for nx, ny in grids:
+            if (nx, ny) in have:
+                continue
+            try:
+                series = download_forecast(nx, ny, base_date, base_time)
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"[{nx},{ny}] failed: {type(e).__name__}")
+                continue
+            if not series:
+                failed += 1
+                continue
+
+            WeatherForecast.objects.update_or_create(
+                nx=nx, ny=ny, base_date=base_date, base_time=base_time,
+                defaults={"series": series},
+            )
+            fetched += 1
+
+        # 오래된 발표분 정리
+        cutoff = (timezone.localdate() - timedelta(days=opts["keep_days"])).strftime("%Y%m%d")
+        WeatherForecast.objects.filter(base_date__lt=cutoff).delete()
+
+        # 새 예보가 들어왔으면 지연 예측도 갱신 (예보 기준이 바뀐 편만)
+        if fetched:
+            try:
+                scored = score_snapshots(upcoming_snapshots())
+                self.stdout.write(f"Delay scored: {scored}")
+            except Exception as e:
+                self.stderr.write(f"delay scoring failed: {type(e).__name__}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Forecast sync done: base {base_date} {base_time}, {fetched} fetched, "
+            f"{len(have)} already stored, {failed} failed"
+        ))
@@ -1,83 +1,67 @@
 import os
-import requests
-from datetime import datetime
-from zoneinfo import ZoneInfo
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 
-from dashboard.models import WeatherCurrent
-
-AMOS_URL = "https://apihub.kma.go.kr/api/typ01/url/amos.php"
-KST = ZoneInfo("Asia/Seoul")
-
-# 공항코드 -> AMOS stn (김해/부산은 AMOS 지점이 없어서 None)
-AIRPORT_TO_STN = {
-    "ICN": "113",
-    "GMP": "110",
-    "CJU": "182",
-    "MWX": "163",
-    "USN": "151",
-    "RSU": "167",
-    "YNY": "92",
-    "PUS": None,  # ❗ AMOS에 없으면 스킵
-}
-
-def _to_int(x: str):
-    try:
-        return int(x)
-    except:
-        return None
-
-def _clean_missing(v: int | None):
-    if v is None:
-        return None
-    if v in (-99999, -9999, 99999):
-        return None
-    return v
-
-def _parse_latest_amos_row(text: str) -> dict | None:
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    data_lines = [ln for ln in lines if not ln.startswith("#")]
-    if not data_lines:
-        return None
-
-    cols = data_lines[-1].split()
-    # 0:STN 1:TM 2:L_VIS 3:R_VIS ... 7:TA ... 18:WS02 19:WS02_MAX
-    stn = cols[0]
-    tm = cols[1]
-
-    l_vis = _clean_missing(_to_int(cols[2]))
-    r_vis = _clean_missing(_to_int(cols[3]))
-
-    ta_raw = _clean_missing(_to_int(cols[7]))
-    ta = None if ta_raw is None else ta_raw / 10.0
-
-    ws02_raw = _clean_missing(_to_int(cols[18]))
-    ws02 = None if ws02_raw is None else ws02_raw / 10.0
-
-    ws02_max_raw = _clean_missing(_to_int(cols[19]))
-    ws02_max = None if ws02_max_raw is None else ws02_max_raw / 10.0
-
-    # TM: YYYYMMDDHHMI
-    observed = datetime.strptime(tm, "%Y%m%d%H%M").replace(tzinfo=KST)
-
-    return {
-        "stn": stn,
-        "observed_at": observed,
-        "ta": ta,
-        "ws02": ws02,
-        "ws02_max": ws02_max,
-        "l_vis": l_vis,
-        "r_vis": r_vis,
-    }
+# 공항코드 -> AMOS stn (김해/부산은 AMOS 지점이 없어서 None → 스킵) - data/airports.csv
+from dashboard.airports import AIRPORT_TO_STN
+from dashboard.amos import fetch_amos
+from dashboard.delay import score_snapshots, upcoming_snapshots
+from dashboard.http import get_session
+from dashboard.models import StationSyncStatus, WeatherCurrent
+from dashboard.weather_history import append_observations
+
+CONNECT_TIMEOUT = 3.0
+READ_TIMEOUT = 7.0
+
+
+def _fetch(stn, key, dtm, until):
+    # 요청 timeout은 전체 마감(until, time.monotonic 기준)까지 남은 시간 안으로
+    # → 늦게 시작한 지점도 마감을 넘겨 스레드를 붙잡고 있지 않음 (run_scheduler에서 회차마다 쌓이지 않도록)
+    remaining = until - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("deadline passed before request")
+    t0 = time.perf_counter()
+    batch = fetch_amos(stn, key, dtm=dtm, session=get_session(),
+                       timeout=(min(CONNECT_TIMEOUT, remaining), min(READ_TIMEOUT, remaining)))
+    return batch, round((time.perf_counter() - t0) * 1000)
+
+
+def _record_status(stations, results, errors, attempted_at):
+    existing = {s.airport_code: s for s in StationSyncStatus.objects.filter(airport_code__in=stations)}
+    for airport, stn in stations.items():
+        st = existing.get(airport) or StationSyncStatus(airport_code=airport)
+        st.stn = stn
+        st.last_attempt_at = attempted_at
+        if airport in results:
+            batch, ms = results[airport]
+            st.last_success_at = attempted_at
+            st.last_observed_at = batch.latest()["observed_at"]
+            st.last_latency_ms = ms
+            st.last_rows = len(batch)
+            st.last_error = ""
+            st.consecutive_failures = 0
+            st.success_count += 1
+        else:
+            st.last_latency_ms = None
+            st.last_rows = 0
+            st.last_error = errors.get(airport, "")[:200]
+            st.consecutive_failures += 1
+            st.failure_count += 1
+        st.save()
+
 
 class Command(BaseCommand):
-    help = "Fetch AMOS weather for airports and upsert WeatherSnapshot"
+    help = "Fetch AMOS weather for airports, upsert WeatherCurrent and append WeatherSnapshot history"
 
     def add_arguments(self, parser):
         parser.add_argument("--dtm", type=int, default=10, help="minutes window for AMOS (default 10)")
         parser.add_argument("--only", type=str, default="", help="comma-separated airport codes e.g. ICN,GMP")
+        parser.add_argument("--deadline", type=float, default=12.0, help="seconds to wait for all stations (default 12)")
+        parser.add_argument("--workers", type=int, default=8, help="concurrent station requests (default 8)")
 
     def handle(self, *args, **opts):
         key = (os.getenv("KEY") or "").strip()
@@ -85,26 +69,46 @@ class Command(BaseCommand):
             raise SystemExit("missing KEY in env")
 
         dtm = opts["dtm"]
+        deadline = opts["deadline"]
         only = [x.strip().upper() for x in opts["only"].split(",") if x.strip()]
         airports = only or list(AIRPORT_TO_STN.keys())
 
-        upserts = 0
-        skipped = 0
-
-        for airport in airports:
-            stn = AIRPORT_TO_STN.get(airport)
-            if not stn:
-                skipped += 1
-                continue
-
-            params = {"stn": stn, "dtm": dtm, "authKey": key}
-            try:
-                r = requests.get(AMOS_URL, params=params, timeout=(3, 7))
-                r.raise_for_status()
-                parsed = _parse_latest_amos_row(r.text)
-                if not parsed:
-                    continue
-
+        stations = {a: AIRPORT_TO_STN[a] for a in airports if AIRPORT_TO_STN.get(a)}
+        skipped = len(airports) - len(stations)
+        started = timezone.now()
+
+        # 지점별 요청은 동시에 (DB는 안 건드림). 전체 마감 안에 안 끝난 지점은 이번 회차에서 버림
+        results, errors = {}, {}
+        if stations:
+            until = time.monotonic() + deadline
+            pool = ThreadPoolExecutor(max_workers=max(1, min(opts["workers"], len(stations))),
+                                      thread_name_prefix="amos")
+            futures = {pool.submit(_fetch, stn, key, dtm, until): airport for airport, stn in stations.items()}
+            done, pending = wait(futures, timeout=max(0.0, until - time.monotonic()))
+            # 마감까지 안 끝난 지점은 기다리지 않음: 시작 안 한 요청은 취소, 진행 중인 요청은 스레드에 남겨 두고 결과를 버림
+            # (requests read timeout은 소켓 read마다라서 응답 전체 시간을 보장하지 못함 → 마감은 여기서 지킴)
+            pool.shutdown(wait=False, cancel_futures=True)
+
+            for f in done:
+                try:
+                    results[futures[f]] = f.result()
+                except Exception as e:
+                    errors[futures[f]] = type(e).__name__
+            for f in pending:
+                errors[futures[f]] = f"deadline {deadline:g}s"
+
+        for airport, (batch, _) in list(results.items()):
+            if not len(batch):
+                del results[airport]
+                errors[airport] = "no data"
+        for airport, err in errors.items():
+            self.stderr.write(f"[{airport}] failed: {err}")
+
+        # 받은 지점만 한 트랜잭션으로 반영 (현재값 + 이력 + 지점 상태)
+        history = []
+        with transaction.atomic():
+            for airport, (batch, _) in results.items():
+                parsed = batch.latest()
                 WeatherCurrent.objects.update_or_create(
                     airport_code=airport,
                     defaults={
@@ -117,11 +121,23 @@ class Command(BaseCommand):
                         "r_vis": parsed["r_vis"],
                     }
                 )
+                # dtm 구간 전체 → 이력으로 (보관/집계는 prune_weather)
+                history.extend({"airport_code": airport, **row} for row in batch.rows())
+
+            appended = append_observations(history)
+            _record_status(stations, results, errors, started)
 
-                upserts += 1
+        upserts = len(results)
+
+        # 관측/예보 기준이 바뀐 편만 다시 예측
+        if upserts:
+            try:
+                scored = score_snapshots(upcoming_snapshots())
+                self.stdout.write(f"Delay scored: {scored}")
             except Exception as e:
-                self.stderr.write(f"[{airport}] failed: {type(e).__name__}")
+                self.stderr.write(f"delay scoring failed: {type(e).__name__}: {e}")
 
         self.stdout.write(self.style.SUCCESS(
-            f"Weather sync done: {upserts} upserts, {skipped} skipped(PUS etc)"
+            f"Weather sync done: {upserts} upserts, {appended} history rows, {len(errors)} failed, "
+            f"{skipped} skipped(PUS etc) in {(timezone.now() - started).total_seconds():.1f}s"
         ))
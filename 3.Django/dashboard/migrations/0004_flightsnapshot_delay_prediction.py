@@ -0,0 +1,33 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_weathercurrent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flightsnapshot',
+            name='delay_prob',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='flightsnapshot',
+            name='delay_scored_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='flightsnapshot',
+            name='delay_weather_base',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='flightsnapshot',
+            name='predicted_delay_minutes',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_flightsnapshot_delay_prediction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nx', models.IntegerField()),
+                ('ny', models.IntegerField()),
+                ('base_date', models.CharField(max_length=8)),
+                ('base_time', models.CharField(max_length=4)),
+                ('series', models.JSONField(default=list)),
+                ('fetched_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('nx', 'ny', 'base_date', 'base_time'), name='uniq_forecast_grid_base')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_weatherforecast'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='weathersnapshot',
+            name='airport_code',
+            field=models.CharField(max_length=3),
+        ),
+        migrations.CreateModel(
+            name='WeatherAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('airport_code', models.CharField(max_length=3)),
+                ('stn', models.CharField(max_length=5)),
+                ('resolution', models.CharField(choices=[('10m', '10 minutes'), ('1h', '1 hour')], max_length=3)),
+                ('bucket_start', models.DateTimeField()),
+                ('samples', models.IntegerField(default=0)),
+                ('ta_avg', models.FloatField(blank=True, null=True)),
+                ('ta_min', models.FloatField(blank=True, null=True)),
+                ('ta_max', models.FloatField(blank=True, null=True)),
+                ('ws02_avg', models.FloatField(blank=True, null=True)),
+                ('ws02_max', models.FloatField(blank=True, null=True)),
+                ('l_vis_min', models.IntegerField(blank=True, null=True)),
+                ('r_vis_min', models.IntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('airport_code', 'resolution', 'bucket_start'), name='uniq_weather_agg_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0006_weather_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StationSyncStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('airport_code', models.CharField(max_length=3, unique=True)),
+                ('stn', models.CharField(max_length=5)),
+                ('last_attempt_at', models.DateTimeField(blank=True, null=True)),
+                ('last_success_at', models.DateTimeField(blank=True, null=True)),
+                ('last_observed_at', models.DateTimeField(blank=True, null=True)),
+                ('last_latency_ms', models.IntegerField(blank=True, null=True)),
+                ('last_rows', models.IntegerField(default=0)),
+                ('last_error', models.CharField(blank=True, default='', max_length=200)),
+                ('consecutive_failures', models.IntegerField(default=0)),
+                ('success_count', models.IntegerField(default=0)),
+                ('failure_count', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_stationsyncstatus'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncJobStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('interval_seconds', models.IntegerField()),
+                ('running', models.BooleanField(default=False)),
+                ('last_started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_success_at', models.DateTimeField(blank=True, null=True)),
+                ('last_duration_ms', models.IntegerField(blank=True, null=True)),
+                ('last_error', models.CharField(blank=True, default='', max_length=200)),
+                ('next_run_at', models.DateTimeField(blank=True, null=True)),
+                ('runs', models.IntegerField(default=0)),
+                ('failures', models.IntegerField(default=0)),
+                ('skipped_overlaps', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0008_syncjobstatus'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FlightArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('airport_code', models.CharField(max_length=5)),
+                ('kind', models.CharField(max_length=3)),
+                ('flight_date', models.CharField(max_length=8)),
+                ('std', models.CharField(max_length=4)),
+                ('airline', models.CharField(max_length=50)),
+                ('origin', models.CharField(max_length=50)),
+                ('destination', models.CharField(max_length=50)),
+                ('flight_no', models.CharField(max_length=10)),
+                ('status', models.CharField(max_length=20)),
+                ('delay_prob', models.FloatField(blank=True, null=True)),
+                ('predicted_delay_minutes', models.FloatField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='flightsnapshot',
+            index=models.Index(fields=['flight_date'], name='flight_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flightarchive',
+            index=models.Index(fields=['flight_date'], name='flight_archive_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='flightarchive',
+            constraint=models.UniqueConstraint(fields=('airport_code', 'kind', 'flight_date', 'std', 'flight_no', 'origin', 'destination'), name='uniq_flight_archive'),
+        ),
+    ]
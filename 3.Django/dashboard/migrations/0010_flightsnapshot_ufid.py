@@ -0,0 +1,55 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0009_flight_retention'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='flightsnapshot',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='flightarchive',
+            name='etd',
+            field=models.CharField(blank=True, default='', max_length=4),
+        ),
+        migrations.AddField(
+            model_name='flightsnapshot',
+            name='etd',
+            field=models.CharField(blank=True, default='', max_length=4),
+        ),
+        migrations.AddField(
+            model_name='flightsnapshot',
+            name='gate',
+            field=models.CharField(blank=True, default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='flightsnapshot',
+            name='io',
+            field=models.CharField(blank=True, default='', max_length=2),
+        ),
+        migrations.AddField(
+            model_name='flightsnapshot',
+            name='line',
+            field=models.CharField(blank=True, default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='flightsnapshot',
+            name='ufid',
+            field=models.CharField(blank=True, max_length=40, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='flightsnapshot',
+            constraint=models.UniqueConstraint(fields=('ufid', 'kind'), name='uniq_flight_ufid_kind'),
+        ),
+        migrations.AddConstraint(
+            model_name='flightsnapshot',
+            constraint=models.UniqueConstraint(condition=models.Q(('ufid__isnull', True)), fields=('airport_code', 'kind', 'flight_date', 'std', 'flight_no', 'origin', 'destination'), name='uniq_flight_legacy_key'),
+        ),
+    ]
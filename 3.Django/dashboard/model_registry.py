@@ -0,0 +1,210 @@
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+# 지연 예측 모델(이진분류 clf + 회귀 reg) 로더 (dashboard.delay와 2.RAG/final.py가 같은 검사·교체 규칙으로 읽음)
+#  - 프로세스당 한 번만 로드 (joblib mmap_mode로 numpy 배열은 메모리 매핑)
+#  - clf / reg 입력 컬럼이 맞는지 로드할 때 검사
+#  - 파일이 바뀌면(mtime/size) 재시작 없이 새 버전으로 교체. 새 모델 검사에 실패하면 기존 모델 유지
+#  - fast 경로(.npz, fast_model.py)는 joblib 해시가 이름에 붙은 캐시 파일. 없으면 처음 로드할 때 joblib에서 만들어 둠
+#    → 저장소에 npz를 두지 않으므로 joblib과 어긋난 예전 npz로 예측할 일이 없음
+
+from .fast_model import cache_path, export_checked, file_version, load_fast_models, remove_stale_caches
+
+# 파일 변경 확인 주기(초) - 매 예측마다 stat 하지 않도록
+DEFAULT_CHECK_INTERVAL = float(os.getenv("DELAY_MODEL_CHECK_INTERVAL", "30"))
+# auto: joblib + fast 같이 로드 / joblib: joblib만 / fast: npz만 (캐시가 이미 있으면 sklearn/lightgbm 불필요)
+DEFAULT_BACKEND = os.getenv("DELAY_MODEL_BACKEND", "auto")
+# auto일 때 이 행 수 이하만 fast로 (bench_delay_model 기준 100행 부근부터 lightgbm 네이티브 배치가 더 빠름)
+FAST_MAX_ROWS = int(os.getenv("DELAY_MODEL_FAST_MAX_ROWS", "100"))
+
+
+class ModelValidationError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    clf: object
+    reg: object
+    clf_features: tuple[str, ...]
+    reg_features: tuple[str, ...]
+    version: str                         # 두 joblib 파일 내용 해시 앞 12자리
+    backend: str                         # "joblib" / "fast" / "auto"
+    loaded_at: datetime
+    load_seconds: float
+    stamp: tuple = field(repr=False)     # 파일별 (mtime_ns, size) → 변경 감지용
+    fast: tuple | None = field(default=None, repr=False)   # (clf, reg) numpy 버전
+
+    def pick(self, n_rows: int) -> tuple:
+        """예측할 행 수에 맞는 (clf, reg). 적은 행은 fast(호출 오버헤드 작음), 많은 행은 lightgbm"""
+        if self.fast is not None and n_rows <= FAST_MAX_ROWS:
+            return self.fast
+        return self.clf, self.reg
+
+
+def _stamp(paths) -> tuple:
+    out = []
+    for p in paths:
+        st = os.stat(p)
+        out.append((st.st_mtime_ns, st.st_size))
+    return tuple(out)
+
+
+def validate_features(clf, reg) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """
+    clf(LGBMClassifier)의 feature_name_과 reg(sklearn Pipeline)의 feature_names_in_ 비교.
+    reg는 clf 입력 DataFrame에서 컬럼을 골라 쓰므로 reg 컬럼이 전부 clf 컬럼 안에 있어야 함
+    """
+    clf_features = tuple(getattr(clf, "feature_name_", None) or ())
+    if not clf_features:
+        raise ModelValidationError("분류 모델에 feature_name_ 없음")
+
+    reg_names = getattr(reg, "feature_names_in_", None)
+    if reg_names is None:
+        reg_names = getattr(reg, "feature_name_", None)
+    reg_features = tuple(reg_names) if reg_names is not None else clf_features
+
+    missing = [c for c in reg_features if c not in clf_features]
+    if missing:
+        raise ModelValidationError(f"회귀 모델 입력 컬럼이 분류 모델에 없음: {missing}")
+    return clf_features, reg_features
+
+
+class ModelRegistry:
+    def __init__(self, classifier_path, regressor_path, fast_path=None,
+                 check_interval: float = DEFAULT_CHECK_INTERVAL, backend: str = DEFAULT_BACKEND):
+        if backend not in ("auto", "joblib", "fast"):
+            raise ValueError(f"backend must be auto/joblib/fast: {backend}")
+        self.paths = (Path(classifier_path), Path(regressor_path))
+        # npz 캐시 기준 경로 (실제 파일은 cache_path로 joblib 해시가 붙은 이름)
+        self.fast_path = Path(fast_path) if fast_path else None
+        self.backend = backend
+        self.check_interval = check_interval
+        self._bundle: ModelBundle | None = None
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self.reloads = 0
+        self.last_error: str | None = None
+        self.fast_error: str | None = None    # npz 캐시 생성 실패 (auto면 joblib만으로 계속)
+
+    def _read_fast(self, version: str):
+        """현재 joblib 해시의 npz 캐시가 있으면 (clf, reg)"""
+        if self.backend == "joblib" or self.fast_path is None:
+            return None
+        path = cache_path(self.fast_path, version)
+        if not path.exists():
+            return None
+        fast = load_fast_models(path)
+        if fast["clf"].source_version != version or fast["reg"].source_version != version:
+            return None
+        return fast["clf"], fast["reg"]
+
+    def _build_fast(self, clf, reg, version: str):
+        """npz 캐시가 없으면 로드한 joblib에서 만들어 저장 (원래 모델과 결과가 다르면 auto는 joblib만, fast는 실패)"""
+        if self.backend == "joblib" or self.fast_path is None:
+            if self.backend == "fast":
+                raise ModelValidationError("fast 모델 경로(fast_path) 없음")
+            return None
+        path = cache_path(self.fast_path, version)
+        try:
+            export_checked(clf, reg, path, version)
+        except Exception as e:
+            if self.backend == "fast":
+                raise
+            self.fast_error = f"{type(e).__name__}: {e}"[:300]
+            return None
+        remove_stale_caches(self.fast_path, keep=path)
+        self.fast_error = None
+        fast = load_fast_models(path)
+        return fast["clf"], fast["reg"]
+
+    def _load(self, stamp: tuple) -> ModelBundle:
+        t0 = time.perf_counter()
+        version = file_version(self.paths)
+        fast = self._read_fast(version)
+        if fast is not None and self.backend == "fast":
+            clf, reg = fast
+        else:
+            import joblib
+
+            clf = joblib.load(self.paths[0], mmap_mode="r")
+            reg = joblib.load(self.paths[1], mmap_mode="r")
+            if fast is None:
+                fast = self._build_fast(clf, reg, version)
+            if self.backend == "fast":
+                clf, reg = fast
+        clf_features, reg_features = validate_features(clf, reg)
+        if fast is not None and validate_features(*fast) != (clf_features, reg_features):
+            raise ModelValidationError("fast 모델 입력 컬럼이 joblib 모델과 다름")
+        return ModelBundle(
+            clf=clf,
+            reg=reg,
+            clf_features=clf_features,
+            reg_features=reg_features,
+            version=version,
+            backend=self.backend if fast is not None else "joblib",
+            loaded_at=datetime.now().astimezone(),
+            load_seconds=round(time.perf_counter() - t0, 3),
+            stamp=stamp,
+            fast=fast,
+        )
+
+    def get(self) -> ModelBundle:
+        """현재 모델 반환. check_interval마다 파일 변경을 확인해서 바뀌었으면 새로 로드해 교체"""
+        bundle = self._bundle
+        now = time.monotonic()
+        if bundle is not None and now - self._last_check < self.check_interval:
+            return bundle
+
+        with self._lock:
+            bundle = self._bundle
+            if bundle is not None and now - self._last_check < self.check_interval:
+                return bundle
+            self._last_check = now
+
+            try:
+                stamp = _stamp(self.paths)
+            except OSError as e:
+                # 교체 중에 파일이 잠깐 없을 수 있음 → 기존 모델로 계속
+                if bundle is None:
+                    raise
+                self.last_error = f"{type(e).__name__}: {e}"
+                return bundle
+
+            if bundle is not None and stamp == bundle.stamp:
+                return bundle
+
+            try:
+                new = self._load(stamp)
+            except Exception as e:
+                if bundle is None:
+                    raise
+                self.last_error = f"{type(e).__name__}: {e}"
+                return bundle
+
+            # 참조 한 번만 바꿔서 교체 (예측 중인 요청은 이전 bundle을 그대로 씀)
+            self._bundle = new
+            self.last_error = None
+            if bundle is not None:
+                self.reloads += 1
+            return new
+
+    def health(self) -> dict:
+        bundle = self._bundle
+        return {
+            "loaded": bundle is not None,
+            "version": bundle.version if bundle else None,
+            "backend": bundle.backend if bundle else None,
+            "fast_loaded": bool(bundle and bundle.fast is not None),
+            "loaded_at": bundle.loaded_at.isoformat() if bundle else None,
+            "load_seconds": bundle.load_seconds if bundle else None,
+            "features": list(bundle.clf_features) if bundle else [],
+            "reloads": self.reloads,
+            "last_error": self.last_error,
+            "fast_error": self.fast_error,
+            "paths": [str(p) for p in self.paths] + ([str(cache_path(self.fast_path, bundle.version))] if self.fast_path and bundle else []),
+        }
@@ -1,6 +1,34 @@
 # dashboard/models.py
 
 from django.db import models
+from django.db.models import Case, IntegerField, Value, When
+from django.db.models.functions import Cast, Substr
+from django.db.models.lookups import LessThan
+
+
+def _minutes(field: str):
+    # "hhmm" 문자열 → 0시부터 분 (DB에서 계산)
+    return (
+        Cast(Substr(field, 1, 2), IntegerField()) * 60
+        + Cast(Substr(field, 3, 2), IntegerField())
+    )
+
+
+class FlightSnapshotQuerySet(models.QuerySet):
+    def with_delay(self):
+        """
+        delay_minutes = etd - std (분)를 DB에서 계산해 붙임. etd가 없으면 NULL.
+        12시간 넘게 앞서면 자정을 넘긴 것으로 보고 +24시간 (23:50 → 00:20 = 30분 지연)
+        """
+        diff = _minutes("etd") - _minutes("std")
+        return self.annotate(
+            delay_minutes=Case(
+                When(etd="", then=Value(None)),
+                When(LessThan(diff, -12 * 60), then=diff + 24 * 60),
+                default=diff,
+                output_field=IntegerField(),
+            )
+        )
 
 
 class FlightSnapshot(models.Model):
@@ -9,11 +37,14 @@ class FlightSnapshot(models.Model):
         ("arr", "Arrival"),
     )
 
+    # 공공데이터 UFID (날짜+출발지+도착지+편명) - 같은 편이 출발 공항 dep / 도착 공항 arr 두 행이라 (ufid, kind)가 키
+    ufid = models.CharField(max_length=40, null=True, blank=True)
     airport_code = models.CharField(max_length=5)
     kind = models.CharField(max_length=3, choices=KIND_CHOICES)
 
     flight_date = models.CharField(max_length=8)  # YYYYMMDD
     std = models.CharField(max_length=4)          # hhmm
+    etd = models.CharField(max_length=4, blank=True, default="")   # 변경(예상) 시각 hhmm, 없으면 ""
 
     airline = models.CharField(max_length=50)
     origin = models.CharField(max_length=50)
@@ -21,20 +52,70 @@ class FlightSnapshot(models.Model):
     flight_no = models.CharField(max_length=10)
 
     status = models.CharField(max_length=20, default="정상")
+    gate = models.CharField(max_length=10, blank=True, default="")
+    line = models.CharField(max_length=10, blank=True, default="")  # 국내/국제 (LINE)
+    io = models.CharField(max_length=2, blank=True, default="")     # 출도착 구분 (IO)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # 동기화 때 미리 계산해 두는 지연 예측 (dashboard/delay.py score_snapshots)
+    delay_prob = models.FloatField(null=True, blank=True)
+    predicted_delay_minutes = models.FloatField(null=True, blank=True)  # 지연 예상(delay_prob >= 기준)일 때만
+    delay_weather_base = models.CharField(max_length=16, blank=True, default="")  # 예측에 쓴 날씨 기준(F+예보발표/O+관측시각)
+    delay_scored_at = models.DateTimeField(null=True, blank=True)
+
+    objects = FlightSnapshotQuerySet.as_manager()
+
     class Meta:
         indexes = [
             models.Index(fields=["airport_code", "kind", "flight_date", "std"]),
+            # 날짜 기준 정리(dashboard/retention.py)용 - 공항 없이 flight_date 범위만으로 id를 찾음
+            models.Index(fields=["flight_date"], name="flight_date_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["ufid", "kind"], name="uniq_flight_ufid_kind"),
+            # UFID가 없는 행(NULL)은 예전 unique_together 키로 유일 → 피드가 나중에 UFID를 주면 그 행에 채움 (dashboard/flight_sync.py)
+            models.UniqueConstraint(
+                fields=["airport_code", "kind", "flight_date", "std", "flight_no", "origin", "destination"],
+                condition=models.Q(ufid__isnull=True),
+                name="uniq_flight_legacy_key",
+            ),
+        ]
+
+
+class FlightArchive(models.Model):
+    # 지난 날짜 FlightSnapshot을 지우기 전에 옮겨 두는 이력 (모델 재학습용, FLIGHT_ARCHIVE=1 또는 prune_flights --archive)
+    # 갱신/예측 메타데이터(updated_at, delay_weather_base ...)는 빼고 결과만
+    airport_code = models.CharField(max_length=5)
+    kind = models.CharField(max_length=3)
+    flight_date = models.CharField(max_length=8)  # YYYYMMDD
+    std = models.CharField(max_length=4)          # hhmm
+
+    airline = models.CharField(max_length=50)
+    origin = models.CharField(max_length=50)
+    destination = models.CharField(max_length=50)
+    flight_no = models.CharField(max_length=10)
+
+    status = models.CharField(max_length=20)      # 마지막으로 본 상태 (지연/결항/출발 ...)
+    etd = models.CharField(max_length=4, blank=True, default="")
+    delay_prob = models.FloatField(null=True, blank=True)
+    predicted_delay_minutes = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["flight_date"], name="flight_archive_date_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["airport_code", "kind", "flight_date", "std", "flight_no", "origin", "destination"],
+                name="uniq_flight_archive",
+            )
         ]
-        unique_together = (
-            "airport_code", "kind", "flight_date", "std",
-            "flight_no", "origin", "destination",
-        )
 
 
 class WeatherSnapshot(models.Model):
-    airport_code = models.CharField(max_length=3, db_index=True)  # ICN, GMP...
+    # AMOS 1분 관측 원본 이력 (sync_weather가 계속 추가, prune_weather가 RAW 보관기간 지나면 10분/1시간 집계로 옮기고 삭제)
+    # (airport_code, observed_at) 유니크 제약이 곧 공항별 기간 조회 인덱스 → airport_code 단독 인덱스는 안 둠
+    airport_code = models.CharField(max_length=3)                 # ICN, GMP...
     stn = models.CharField(max_length=5)                          # 113, 110...
     observed_at = models.DateTimeField(db_index=True)             # 관측시각
 
@@ -67,3 +148,102 @@ class WeatherCurrent(models.Model):
     l_vis = models.IntegerField(null=True, blank=True)
     r_vis = models.IntegerField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+
+class WeatherAggregate(models.Model):
+    # WeatherSnapshot 원본을 10분/1시간 단위로 줄인 것 (dashboard/weather_history.py rollup)
+    RESOLUTION_CHOICES = (
+        ("10m", "10 minutes"),
+        ("1h", "1 hour"),
+    )
+
+    airport_code = models.CharField(max_length=3)
+    stn = models.CharField(max_length=5)
+    resolution = models.CharField(max_length=3, choices=RESOLUTION_CHOICES)
+    bucket_start = models.DateTimeField()          # 구간 시작 (10분/정시)
+    samples = models.IntegerField(default=0)       # 구간에 들어간 1분 관측 수
+
+    ta_avg = models.FloatField(null=True, blank=True)
+    ta_min = models.FloatField(null=True, blank=True)
+    ta_max = models.FloatField(null=True, blank=True)
+    ws02_avg = models.FloatField(null=True, blank=True)
+    ws02_max = models.FloatField(null=True, blank=True)   # 구간 내 WS02_MAX 최댓값
+    l_vis_min = models.IntegerField(null=True, blank=True)
+    r_vis_min = models.IntegerField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["airport_code", "resolution", "bucket_start"],
+                name="uniq_weather_agg_bucket",
+            )
+        ]
+
+    def __str__(self):
+        return f"[{self.airport_code}] {self.resolution} {self.bucket_start:%Y-%m-%d %H:%M} n={self.samples}"
+
+
+class StationSyncStatus(models.Model):
+    # sync_weather 지점별 최근 결과 (느리거나 계속 실패하는 지점 확인용)
+    airport_code = models.CharField(max_length=3, unique=True)
+    stn = models.CharField(max_length=5)
+
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    last_observed_at = models.DateTimeField(null=True, blank=True)   # 마지막으로 받은 관측시각
+    last_latency_ms = models.IntegerField(null=True, blank=True)     # 요청~파싱 시간 (마감 초과면 None)
+    last_rows = models.IntegerField(default=0)                       # 마지막 응답의 관측 행 수
+    last_error = models.CharField(max_length=200, blank=True, default="")
+
+    consecutive_failures = models.IntegerField(default=0)
+    success_count = models.IntegerField(default=0)
+    failure_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        if self.consecutive_failures:
+            return f"[{self.airport_code}] fail x{self.consecutive_failures} {self.last_error}"
+        return f"[{self.airport_code}] ok {self.last_latency_ms}ms"
+
+
+class SyncJobStatus(models.Model):
+    # run_scheduler 작업별 최근 실행 결과 (dashboard/scheduler.py, /api/sync/health/)
+    name = models.CharField(max_length=50, unique=True)      # 작업 이름 (sync_weather, sync_flights_near ...)
+    interval_seconds = models.IntegerField()
+    running = models.BooleanField(default=False)
+
+    last_started_at = models.DateTimeField(null=True, blank=True)
+    last_finished_at = models.DateTimeField(null=True, blank=True)
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    last_duration_ms = models.IntegerField(null=True, blank=True)
+    last_error = models.CharField(max_length=200, blank=True, default="")
+    next_run_at = models.DateTimeField(null=True, blank=True)
+
+    runs = models.IntegerField(default=0)
+    failures = models.IntegerField(default=0)
+    skipped_overlaps = models.IntegerField(default=0)   # 이전 실행이 안 끝나서 건너뛴 횟수
+
+    def __str__(self):
+        return f"{self.name} every {self.interval_seconds}s runs={self.runs} failures={self.failures}"
+
+
+class WeatherForecast(models.Model):
+    # 기상청 단기예보를 격자·발표시각별로 저장 (sync_forecast가 발표 직후 미리 받아 둠 → 예측 때는 DB만 읽음)
+    nx = models.IntegerField()
+    ny = models.IntegerField()
+    base_date = models.CharField(max_length=8)   # YYYYMMDD
+    base_time = models.CharField(max_length=4)   # hhmm (0200, 0500, ... 2300)
+    series = models.JSONField(default=list)      # [[YYYYMMDDHHMM, TMP, WSD], ...] 시간순
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["nx", "ny", "base_date", "base_time"],
+                name="uniq_forecast_grid_base",
+            )
+        ]
+
+    def __str__(self):
+        return f"({self.nx},{self.ny}) {self.base_date} {self.base_time} {len(self.series)} steps"
@@ -0,0 +1,103 @@
+import logging
+import os
+import time
+
+from django.db import connection, transaction
+
+from .flight_archive import archive_before
+from .models import FlightArchive, FlightSnapshot
+
+logger = logging.getLogger(__name__)
+
+# FlightSnapshot 날짜 기준 정리
+#  - QuerySet.delete()는 pk를 전부 모은 뒤 지우고(시그널/연쇄 삭제 확인) 한 트랜잭션이 길어짐
+#    → SQLite에서는 그동안 쓰기 잠금이 걸려 API 조회/동기화가 같이 멈춤
+#  - 여기서는 flight_date 인덱스로 id를 BATCH개씩 찾고 raw SQL로 (보관 →) 삭제, 배치마다 커밋
+#  - FlightSnapshot을 참조하는 FK가 없어서 raw DELETE로 지워도 됨
+BATCH = int(os.getenv("FLIGHT_PRUNE_BATCH", "500"))    # SQLite 변수 개수 제한(999) 안쪽
+ARCHIVE = os.getenv("FLIGHT_ARCHIVE", "0") == "1"      # 지난 날짜를 FlightArchive로 옮기고 지울지
+PAUSE = 0.01                                           # 배치 사이에 다른 연결이 잠금을 잡을 틈
+
+ARCHIVE_FIELDS = (
+    "airport_code", "kind", "flight_date", "std",
+    "airline", "origin", "destination", "flight_no",
+    "status", "etd", "delay_prob", "predicted_delay_minutes",
+)
+
+
+def _table(model) -> str:
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _pk(model) -> str:
+    return connection.ops.quote_name(model._meta.pk.column)
+
+
+def _archive_ids(ids: list[int]) -> int:
+    cols = ", ".join(connection.ops.quote_name(c) for c in ARCHIVE_FIELDS)
+    marks = ", ".join(["%s"] * len(ids))
+    # 같은 편이 이미 보관돼 있으면 건너뜀 (SQLite 3.24+ / PostgreSQL)
+    sql = (
+        f"INSERT INTO {_table(FlightArchive)} ({cols}) "
+        f"SELECT {cols} FROM {_table(FlightSnapshot)} WHERE {_pk(FlightSnapshot)} IN ({marks}) "
+        f"ON CONFLICT DO NOTHING"
+    )
+    with connection.cursor() as cur:
+        cur.execute(sql, ids)
+        return cur.rowcount
+
+
+def _delete_ids(model, ids: list[int]) -> int:
+    marks = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cur:
+        cur.execute(f"DELETE FROM {_table(model)} WHERE {_pk(model)} IN ({marks})", ids)
+        return cur.rowcount
+
+
+def delete_in_batches(model, qs, archive: bool = False, batch: int = BATCH) -> tuple[int, int]:
+    """qs에 걸리는 행을 batch개씩 (FlightArchive로 복사 후) 삭제. 반환: (새로 보관, 삭제)"""
+    archived = deleted = 0
+    while True:
+        with transaction.atomic():
+            ids = list(qs.order_by().values_list("pk", flat=True)[:batch])
+            if not ids:
+                break
+            if archive:
+                archived += _archive_ids(ids)
+            deleted += _delete_ids(model, ids)
+        if len(ids) < batch:
+            break
+        time.sleep(PAUSE)
+    return archived, deleted
+
+
+def prune_flights(min_date: str, max_date: str | None = None, archive: bool = ARCHIVE,
+                  batch: int = BATCH) -> dict:
+    """
+    flight_date < min_date 는 (archive면 보관 후) 삭제, flight_date > max_date 는 그냥 삭제 (잘못 들어온 먼 미래).
+    날짜는 YYYYMMDD. 지우기 전에 학습용 Parquet 이력(dashboard/flight_archive.py)에 날짜 단위로 먼저 씀
+    """
+    # Parquet 쓰기에 실패한 날짜부터는 남겨 두고 다음 정리 때 다시 시도
+    parquet_rows, failed = archive_before(min_date)
+    if failed:
+        min_date = min(failed)
+        logger.warning("flight prune held at %s: parquet archive failed for %s", min_date, ", ".join(failed))
+
+    past = FlightSnapshot.objects.filter(flight_date__lt=min_date)
+    archived, deleted = delete_in_batches(FlightSnapshot, past, archive=archive, batch=batch)
+    future = 0
+    if max_date:
+        _, future = delete_in_batches(FlightSnapshot, FlightSnapshot.objects.filter(flight_date__gt=max_date), batch=batch)
+    return {
+        "archived": archived,
+        "deleted": deleted,
+        "future_deleted": future,
+        "parquet_rows": parquet_rows,
+        "parquet_failed": failed,
+    }
+
+
+def prune_archive(min_date: str, batch: int = BATCH) -> int:
+    """보관 기간이 지난 FlightArchive 삭제"""
+    _, deleted = delete_in_batches(FlightArchive, FlightArchive.objects.filter(flight_date__lt=min_date), batch=batch)
+    return deleted
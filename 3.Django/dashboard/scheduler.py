@@ -0,0 +1,165 @@
+import io
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+
+from .flight_sync import TIER_INTERVALS
+from .models import SyncJobStatus
+
+# 동기화 관리 명령을 cron 대신 한 프로세스 안에서 주기 실행 (manage.py run_scheduler)
+#  - 장고 부팅/모듈 import/모델 로드는 한 번만, HTTP 연결(dashboard/http.py)과
+#    항공편 페이지 인덱스 캐시(airline.find_page_for_date, LocMem)는 실행 사이에 그대로 유지
+#  - 작업별 주기 + jitter(여러 작업이 같은 초에 몰리지 않게)
+#  - 같은 작업은 겹쳐 돌지 않음 (이전 실행이 안 끝났으면 이번 회차는 건너뜀)
+#  - 실행 결과/소요시간은 SyncJobStatus에 기록 → /api/sync/health/
+
+# (작업 이름, 주기 초, 관리 명령, 옵션) - 항공편은 가까운 편일수록 자주 (dashboard/flight_sync.py)
+DEFAULT_JOBS = (
+    ("sync_weather", 300, "sync_weather", {}),
+    ("sync_flights_near", TIER_INTERVALS["near"], "sync_flights", {"tier": "near"}),
+    ("sync_flights_today", TIER_INTERVALS["today"], "sync_flights", {"tier": "today"}),
+    ("sync_flights_future", TIER_INTERVALS["future"], "sync_flights", {"tier": "future"}),
+    ("sync_forecast", 3600, "sync_forecast", {}),
+    ("prune_weather", 86400, "prune_weather", {}),
+    ("prune_flights", 86400, "prune_flights", {}),
+)
+DEFAULT_JITTER = 0.1        # 주기의 최대 10%만큼 다음 실행을 늦춤
+STARTUP_SPREAD = 30.0       # 시작할 때 작업들을 0~30초에 흩어서 시작
+
+
+@dataclass
+class Job:
+    name: str
+    interval: int                                   # 초
+    command: str = ""                               # 관리 명령 (없으면 name)
+    options: dict = field(default_factory=dict)     # call_command에 넘길 옵션
+    jitter: float = DEFAULT_JITTER
+    next_run: float = 0.0                           # time.monotonic 기준
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def schedule_next(self, started: float):
+        # 시작 시각 기준 고정 주기 (실행이 오래 걸려도 주기가 밀리지 않음)
+        self.next_run = started + self.interval + random.uniform(0, self.interval * self.jitter)
+
+
+def _save_status(job: Job, **fields):
+    obj, _ = SyncJobStatus.objects.get_or_create(name=job.name, defaults={"interval_seconds": job.interval})
+    fields["interval_seconds"] = job.interval
+    SyncJobStatus.objects.filter(pk=obj.pk).update(**fields)
+
+
+class Scheduler:
+    def __init__(self, jobs: list[Job], workers: int = 2, log=print):
+        self.jobs = jobs
+        self.log = log
+        self.stop = threading.Event()
+        # SQLite는 쓰기 잠금이 DB 전체라서 동시 실행 수는 작게
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="sync")
+
+    def _wall_next(self, job: Job):
+        return timezone.now() + timedelta(seconds=max(0.0, job.next_run - time.monotonic()))
+
+    def run_job(self, job: Job) -> bool:
+        """작업 한 번 실행. 이미 도는 중이면 False (건너뜀)"""
+        if not job.lock.acquire(blocking=False):
+            SyncJobStatus.objects.filter(name=job.name).update(skipped_overlaps=F("skipped_overlaps") + 1)
+            self.log(f"[{job.name}] still running, skipped")
+            return False
+
+        t0 = time.perf_counter()
+        started_at = timezone.now()
+        out = io.StringIO()
+        error = ""
+        try:
+            _save_status(job, running=True, last_started_at=started_at)
+            call_command(job.command or job.name, stdout=out, stderr=out, **job.options)
+        except (Exception, SystemExit) as e:
+            # SystemExit: 키 없음 등으로 명령이 종료한 경우 → 데몬은 계속
+            error = f"{type(e).__name__}: {e}"[:200]
+        finally:
+            ms = round((time.perf_counter() - t0) * 1000)
+            try:
+                fields = {
+                    "running": False,
+                    "last_finished_at": timezone.now(),
+                    "last_duration_ms": ms,
+                    "last_error": error,
+                    "next_run_at": self._wall_next(job),
+                    "runs": F("runs") + 1,
+                }
+                if error:
+                    fields["failures"] = F("failures") + 1
+                else:
+                    fields["last_success_at"] = started_at
+                _save_status(job, **fields)
+            finally:
+                job.lock.release()
+                # 작업 스레드가 연 DB 연결은 여기서 닫음 (스레드는 풀에서 재사용됨)
+                connections.close_all()
+
+        lines = [ln for ln in out.getvalue().splitlines() if ln.strip()]
+        summary = error or (lines[-1] if lines else "ok")
+        self.log(f"[{job.name}] {ms}ms {summary}")
+        return not error
+
+    def _submit_due(self):
+        now = time.monotonic()
+        for job in self.jobs:
+            if now < job.next_run:
+                continue
+            job.schedule_next(now)
+            if job.lock.locked():
+                SyncJobStatus.objects.filter(name=job.name).update(skipped_overlaps=F("skipped_overlaps") + 1)
+                self.log(f"[{job.name}] still running, skipped")
+                continue
+            self._pool.submit(self.run_job, job)
+
+    def run_forever(self, tick: float = 1.0):
+        now = time.monotonic()
+        for job in self.jobs:
+            job.next_run = now + random.uniform(0, min(STARTUP_SPREAD, job.interval * job.jitter))
+            _save_status(job, running=False, next_run_at=self._wall_next(job))
+
+        try:
+            while not self.stop.is_set():
+                self._submit_due()
+                self.stop.wait(tick)
+        finally:
+            # 실행 중인 작업은 끝날 때까지 기다림 (중간에 끊으면 트랜잭션 밖 작업이 반쯤 반영될 수 있음)
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            connections.close_all()
+
+    def run_once(self) -> dict[str, bool]:
+        """모든 작업을 순서대로 한 번씩 (cron 한 번 호출 대체/점검용)"""
+        return {job.name: self.run_job(job) for job in self.jobs}
+
+
+def job_health(now=None) -> list[dict]:
+    """작업별 상태. 마지막 성공이 주기의 2배보다 오래됐으면 stale"""
+    now = now or timezone.now()
+    out = []
+    for s in SyncJobStatus.objects.order_by("name"):
+        limit = timedelta(seconds=s.interval_seconds * 2)
+        out.append({
+            "name": s.name,
+            "interval_seconds": s.interval_seconds,
+            "running": s.running,
+            "stale": s.last_success_at is None or now - s.last_success_at > limit,
+            "last_started_at": s.last_started_at.isoformat() if s.last_started_at else None,
+            "last_success_at": s.last_success_at.isoformat() if s.last_success_at else None,
+            "last_duration_ms": s.last_duration_ms,
+            "last_error": s.last_error,
+            "next_run_at": s.next_run_at.isoformat() if s.next_run_at else None,
+            "runs": s.runs,
+            "failures": s.failures,
+            "skipped_overlaps": s.skipped_overlaps,
+        })
+    return out
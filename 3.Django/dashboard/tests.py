@@ -1,3 +1,824 @@
-from django.test import TestCase
+import importlib.util
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from . import airline, fast_model, flight_archive, retention
+from .airports import all_airports, get_nxny
+from .amos import parse_amos
+from .delay import CLASSIFIER_PATH, REGRESSOR_PATH, predict_flights, score_snapshots
+from .flight_sync import near_rows, sync_tier, tier_windows, upsert_snapshots
+from .forecast import KST, fetch_forecast, pick_latest_vilage_base, published_vilage_base
+from .forecast_series import ForecastSeries
+from .scheduler import Job, Scheduler, job_health
+from .model_registry import ModelRegistry, ModelValidationError, validate_features
+from .models import FlightArchive, FlightSnapshot, StationSyncStatus, SyncJobStatus, WeatherAggregate, WeatherCurrent, WeatherForecast, WeatherSnapshot
+from .weather_history import append_observations, history, pick_resolution, prune
+
+
+class _FakeClassifier:
+    # 풍속 10m/s = 지연 확률 1.0 (호출 횟수로 배치 1번인지 확인)
+    def __init__(self):
+        self.calls = 0
+
+    def predict_proba(self, X):
+        self.calls += 1
+        p = (X["풍속_ms"].to_numpy(dtype=float) / 10).clip(0, 1)
+        return np.column_stack([1 - p, p])
+
+
+class _FakeRegressor:
+    def __init__(self):
+        self.rows = []
+
+    def predict(self, X):
+        self.rows.append(len(X))
+        return X["기온(°C)"].to_numpy(dtype=float) * 10 - 100
+
+
+def _fake_registry():
+    clf, reg = _FakeClassifier(), _FakeRegressor()
+    bundle = SimpleNamespace(
+        pick=lambda n: (clf, reg),
+        clf_features=("기온(°C)", "풍속_ms", "dep_hour", "항공사", "출발지", "flight_type"),
+        reg_features=("기온(°C)", "풍속_ms"),
+    )
+    return SimpleNamespace(get=lambda: bundle), clf, reg
+
+
+def _flight(airport_code, std, airline="대한항공", destination="제주"):
+    return {"airport_code": airport_code, "flight_date": "20261019", "std": std,
+            "airline": airline, "destination": destination}
+
+
+class PredictFlightsTests(TestCase):
+    def setUp(self):
+        nx, ny = get_nxny("GMP")
+        WeatherForecast.objects.create(nx=nx, ny=ny, base_date="20261019", base_time="0500", series=[
+            ["202610190900", 20.0, 2.0],
+            ["202610191000", 15.0, 8.0],
+        ])
+        WeatherCurrent.objects.create(
+            airport_code="CJU", stn="184", ta=25.0, ws02=9.0,
+            observed_at=timezone.make_aware(datetime(2026, 10, 19, 8, 30)),
+        )
+        registry, self.clf, self.reg = _fake_registry()
+        patcher = mock.patch("dashboard.delay.model_registry", return_value=registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_batch_and_regression_only_for_delayed(self):
+        out = predict_flights([
+            _flight("GMP", "0930"),     # 09:00 예보 → 풍속 2 → 정상
+            _flight("GMP", "1000"),     # 10:00 예보와 같은 시각 → 풍속 8 → 지연
+            _flight("CJU", "0930"),     # 예보 없음 → 현재 관측
+            _flight("GMP", "0800"),     # 첫 예보 이전 → 관측도 없어서 예측 불가
+        ])
+        self.assertEqual(self.clf.calls, 1)
+        self.assertEqual(self.reg.rows, [2])
+
+        self.assertEqual((out[0]["delay_prob"], out[0]["is_delay"]), (0.2, 0))
+        self.assertNotIn("predicted_delay_minutes", out[0])
+        self.assertEqual(out[0]["weather_base"], "F202610190500")
+
+        self.assertEqual((out[1]["delay_prob"], out[1]["is_delay"]), (0.8, 1))
+        self.assertEqual(out[1]["predicted_delay_minutes"], 50.0)
+
+        self.assertEqual(out[2]["weather"], {"기온(°C)": 25.0, "풍속_ms": 9.0})
+        self.assertEqual(out[2]["weather_base"], "O202610190830")
+        self.assertEqual(out[2]["predicted_delay_minutes"], 150.0)
+
+        self.assertEqual(out[3], {"ok": False, "reason": "날씨 데이터 없음"})
+
+    def test_unchanged_base_skips_model(self):
+        out = predict_flights([_flight("GMP", "0930")], known_bases=["F202610190500"])
+        self.assertEqual(out, [{"ok": True, "unchanged": True, "weather_base": "F202610190500"}])
+        self.assertEqual(self.clf.calls, 0)
+
+    def test_score_snapshots_stores_and_skips_same_base(self):
+        FlightSnapshot.objects.create(
+            airport_code="GMP", kind="dep", flight_date="20261019", std="1000",
+            airline="대한항공", origin="김포", destination="제주", flight_no="KE1201", ufid="A1",
+        )
+        self.assertEqual(score_snapshots(FlightSnapshot.objects.all()), 1)
+        obj = FlightSnapshot.objects.get()
+        self.assertEqual((obj.delay_prob, obj.predicted_delay_minutes), (0.8, 50.0))
+        self.assertEqual(obj.delay_weather_base, "F202610190500")
+
+        self.assertEqual(score_snapshots(FlightSnapshot.objects.all()), 0)
+        self.assertEqual(score_snapshots(FlightSnapshot.objects.all(), force=True), 1)
+
+
+class FastModelCacheTests(SimpleTestCase):
+    def test_cache_path_and_stale_caches(self):
+        with tempfile.TemporaryDirectory() as d:
+            base = Path(d) / "delay_models.npz"
+            keep = fast_model.cache_path(base, "bbbbbbbbbbbb")
+            self.assertEqual(keep.name, "delay_models-bbbbbbbbbbbb.npz")
+            old = fast_model.cache_path(base, "aaaaaaaaaaaa")
+            tmp = base.with_name("delay_models-bbbbbbbbbbbb.123.tmp.npz")   # 다른 프로세스가 쓰는 중
+            for p in (keep, old, tmp):
+                p.touch()
+
+            self.assertEqual(fast_model.remove_stale_caches(base, keep=keep), [old])
+            self.assertTrue(keep.exists() and tmp.exists())
+            self.assertFalse(old.exists())
+
+
+# 실제 학습 모델(joblib)과 lightgbm이 있을 때만 - fast 경로 결과가 joblib 모델과 같은지
+@unittest.skipUnless(
+    CLASSIFIER_PATH.exists() and REGRESSOR_PATH.exists() and importlib.util.find_spec("lightgbm"),
+    "delay model files or lightgbm not available",
+)
+class FastModelParityTests(SimpleTestCase):
+    def test_registry_builds_cache_matching_joblib(self):
+        with tempfile.TemporaryDirectory() as d:
+            base = Path(d) / "delay_models.npz"
+            bundle = ModelRegistry(CLASSIFIER_PATH, REGRESSOR_PATH, fast_path=base, backend="auto").get()
+            path = fast_model.cache_path(base, bundle.version)
+            self.assertIsNotNone(bundle.fast)
+            self.assertTrue(path.exists())
+
+            report = fast_model.compare(bundle.clf, bundle.reg, fast_model.load_fast_models(path), check_rows=500)
+            self.assertLessEqual(report["max_prob_diff"], fast_model.MAX_PROB_DIFF)
+            self.assertLessEqual(report["max_minutes_diff"], fast_model.MAX_MINUTES_DIFF)
+
+            # 캐시가 있으면 fast 백엔드는 joblib 없이 그 파일을 씀
+            fast = ModelRegistry(CLASSIFIER_PATH, REGRESSOR_PATH, fast_path=base, backend="fast").get()
+            self.assertEqual(fast.backend, "fast")
+            self.assertEqual(fast.clf_features, bundle.clf_features)
+
+
+class ForecastCacheTests(TestCase):
+    def test_base_time(self):
+        self.assertEqual(pick_latest_vilage_base(datetime(2026, 10, 19, 11, 5, tzinfo=KST)), ("20261019", "1100"))
+        self.assertEqual(pick_latest_vilage_base(datetime(2026, 10, 19, 1, 0, tzinfo=KST)), ("20261018", "2300"))
+        # 발표 후 10분 전에는 이전 발표분
+        self.assertEqual(published_vilage_base(datetime(2026, 10, 19, 11, 5, tzinfo=KST)), ("20261019", "0800"))
+
+    def test_fetch_forecast_uses_latest_base(self):
+        nx, ny = get_nxny("GMP")
+        WeatherForecast.objects.create(nx=nx, ny=ny, base_date="20261019", base_time="0500",
+                                       series=[["202610191200", 10.0, 1.0]])
+        WeatherForecast.objects.create(nx=nx, ny=ny, base_date="20261019", base_time="0800",
+                                       series=[["202610191200", 12.0, 3.0]])
+        series = fetch_forecast("GMP")
+        self.assertEqual(series.base, "202610190800")
+        self.assertEqual(series.at("202610191230"), {"기온(°C)": 12.0, "풍속_ms": 3.0})
+        self.assertEqual(len(fetch_forecast("XXX")), 0)
+
+    @mock.patch.dict("os.environ", {"KMA_SERVICE_KEY": "x"})
+    @mock.patch("dashboard.management.commands.sync_forecast.download_forecast",
+                return_value=[["202610191200", 12.0, 3.0]])
+    def test_sync_skips_stored_grids(self, download):
+        # 오래된 발표분 정리(keep-days)에 지워지지 않도록 오늘 날짜로
+        base = (timezone.localdate().strftime("%Y%m%d"), "0800")
+        grids = sorted({(a.nx, a.ny) for a in all_airports()})
+        WeatherForecast.objects.create(nx=grids[0][0], ny=grids[0][1], base_date=base[0], base_time=base[1], series=[])
+
+        with mock.patch("dashboard.management.commands.sync_forecast.published_vilage_base", return_value=base):
+            call_command("sync_forecast", stdout=io.StringIO(), stderr=io.StringIO())
+            self.assertEqual({c.args[:2] for c in download.call_args_list}, set(grids[1:]))
+            self.assertEqual(WeatherForecast.objects.filter(base_date=base[0], base_time=base[1]).count(), len(grids))
+
+            # 같은 발표분은 다시 받지 않음
+            download.reset_mock()
+            call_command("sync_forecast", stdout=io.StringIO(), stderr=io.StringIO())
+            download.assert_not_called()
+
+
+class ForecastSeriesTests(SimpleTestCase):
+    def setUp(self):
+        # 일부러 시간순이 아니게 + 10시 풍속 결측
+        self.series = ForecastSeries.from_rows([
+            ["202610191100", "14", "5.5"],
+            ["202610190900", 10.0, 2.0],
+            ["202610191000", 12.0, None],
+        ], base="202610190500")
+
+    def test_before_first(self):
+        self.assertIsNone(self.series.at("202610190859"))
+
+    def test_exact_hit_uses_that_step(self):
+        self.assertEqual(self.series.at("202610190900"), {"기온(°C)": 10.0, "풍속_ms": 2.0})
+        self.assertEqual(self.series.at("202610191000"), {"기온(°C)": 12.0, "풍속_ms": None})
+
+    def test_between_uses_previous_step(self):
+        self.assertEqual(self.series.at(datetime(2026, 10, 19, 10, 59)), {"기온(°C)": 12.0, "풍속_ms": None})
+
+    def test_after_last_keeps_last_step(self):
+        self.assertEqual(self.series.at("202610200300"), {"기온(°C)": 14.0, "풍속_ms": 5.5})
+
+    def test_at_many_matches_at(self):
+        deps = ["202610190800", "202610190930", "202610191100", "202610191230"]
+        self.assertEqual(self.series.at_many(deps), [self.series.at(d) for d in deps])
+        self.assertEqual(self.series.lookup(deps).tolist(), [-1, 0, 2, 2])
+
+    def test_from_items_and_round_trip(self):
+        items = [
+            {"category": "TMP", "fcstDate": "20261019", "fcstTime": "1000", "fcstValue": "12"},
+            {"category": "SKY", "fcstDate": "20261019", "fcstTime": "1000", "fcstValue": "1"},
+            {"category": "WSD", "fcstDate": "20261019", "fcstTime": "0900", "fcstValue": "2.1"},
+            {"category": "TMP", "fcstDate": "20261019", "fcstTime": "0900", "fcstValue": "10"},
+        ]
+        rows = ForecastSeries.from_items(items).to_rows()
+        self.assertEqual(rows, [["202610190900", 10.0, 2.1], ["202610191000", 12.0, None]])
+        self.assertEqual(ForecastSeries.from_rows(rows).to_rows(), rows)
+
+    def test_empty(self):
+        self.assertEqual(ForecastSeries([], [], []).at_many(["202610191000"]), [None])
+
+
+def _local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+def _obs(minute, ta=None, ws02=None, l_vis=None, hour=10, day=11):
+    return {"airport_code": "GMP", "stn": "110", "observed_at": _local(2026, 10, day, hour, minute),
+            "ta": ta, "ws02": ws02, "ws02_max": ws02, "l_vis": l_vis, "r_vis": l_vis}
+
+
+class WeatherHistoryTests(TestCase):
+    NOW = _local(2026, 10, 19, 12, 0)
+
+    def test_append_skips_existing_and_duplicates(self):
+        self.assertEqual(append_observations([_obs(0, 10.0), _obs(1, 11.0)]), 2)
+        self.assertEqual(append_observations([_obs(1, 99.0), _obs(2, 12.0), _obs(2, 12.0)]), 1)
+        self.assertEqual(WeatherSnapshot.objects.get(observed_at=_local(2026, 10, 11, 10, 1)).ta, 11.0)
+        self.assertEqual(append_observations([]), 0)
+
+    def test_rollup_to_10m_and_merge_late_rows(self):
+        append_observations([
+            _obs(0, 10.0, 2.0, 1000),
+            _obs(1, 12.0, 4.0, 800),
+            _obs(12),                           # 결측만 있는 관측도 샘플 수에는 들어감
+            _obs(0, 20.0, day=18),              # 보관 기간(7일) 안 → 그대로
+        ])
+        out = prune(now=self.NOW, hourly_days=0)
+        self.assertEqual(out["10m"], (2, 3))
+        self.assertEqual(WeatherSnapshot.objects.count(), 1)
+
+        b = WeatherAggregate.objects.get(resolution="10m", bucket_start=_local(2026, 10, 11, 10, 0))
+        self.assertEqual((b.samples, b.ta_avg, b.ta_min, b.ta_max), (2, 11.0, 10.0, 12.0))
+        self.assertEqual((b.ws02_avg, b.ws02_max, b.l_vis_min), (3.0, 4.0, 800))
+        b = WeatherAggregate.objects.get(resolution="10m", bucket_start=_local(2026, 10, 11, 10, 10))
+        self.assertEqual((b.samples, b.ta_avg, b.ta_min), (1, None, None))
+
+        # 늦게 들어온 관측은 기존 구간에 합쳐짐 (가중 평균)
+        append_observations([_obs(5, 14.0, 6.0, 500)])
+        prune(now=self.NOW, hourly_days=0)
+        b = WeatherAggregate.objects.get(resolution="10m", bucket_start=_local(2026, 10, 11, 10, 0))
+        self.assertEqual((b.samples, b.ta_avg, b.ta_max, b.ws02_max, b.l_vis_min), (3, 12.0, 14.0, 6.0, 500))
+
+    def test_rollup_to_1h_and_expire(self):
+        append_observations([_obs(0, 10.0, day=1, hour=3), _obs(30, 20.0, day=1, hour=3), _obs(0, 5.0, day=2, hour=3)])
+        out = prune(now=self.NOW, raw_days=1, tenmin_days=1, hourly_days=0)
+        self.assertEqual(out["1h"], (2, 3))
+        b = WeatherAggregate.objects.get(resolution="1h", bucket_start=_local(2026, 10, 1, 3, 0))
+        self.assertEqual((b.samples, b.ta_avg), (2, 15.0))
+
+        out = prune(now=self.NOW, raw_days=1, tenmin_days=1, hourly_days=18)
+        self.assertEqual(out["1h_deleted"], 1)
+        self.assertEqual(WeatherAggregate.objects.get().bucket_start, _local(2026, 10, 2, 3, 0))
+
+    def test_history_resolution(self):
+        self.assertEqual(pick_resolution(self.NOW - timedelta(hours=6), self.NOW, now=self.NOW), "raw")
+        self.assertEqual(pick_resolution(self.NOW - timedelta(days=3), self.NOW, now=self.NOW), "10m")
+        self.assertEqual(pick_resolution(self.NOW - timedelta(days=30), self.NOW, now=self.NOW), "1h")
+        # 짧은 구간이라도 원본이 이미 집계로 옮겨진 예전 구간이면 10m
+        self.assertEqual(pick_resolution(_local(2026, 10, 1), _local(2026, 10, 1, 6), now=self.NOW), "10m")
+
+        append_observations([_obs(0, 10.0), _obs(1, 12.0)])
+        prune(now=self.NOW, hourly_days=0)
+        res, rows = history("GMP", _local(2026, 10, 11), _local(2026, 10, 12), resolution="10m")
+        self.assertEqual(res, "10m")
+        self.assertEqual([(r["ta"], r["samples"]) for r in rows], [(11.0, 2)])
+        with self.assertRaises(ValueError):
+            history("GMP", _local(2026, 10, 11), _local(2026, 10, 12), resolution="5m")
+
+
+def _amos_line(tm, ta="123", ws02="30", ws02_max="40", l_vis="2000", r_vis="-99999", stn="110"):
+    # AMOS 응답 한 줄 (COLUMNS 위치: 시정 L/R 2·3, 기온 7, 풍속 18·19)
+    cols = [stn, tm, l_vis, r_vis, "0", "0", "0", ta] + ["0"] * 10 + [ws02, ws02_max, "0", "0"]
+    return " ".join(cols)
+
+
+class ParseAmosTests(SimpleTestCase):
+    def test_parse_window(self):
+        text = "\n".join([
+            "# STN TM L_VIS R_VIS ...",
+            _amos_line("202610191002", ta="-15"),
+            _amos_line("202610191000"),
+            "",
+            "110 2026101910 1 2",                                  # 잘린 줄
+            _amos_line("202610191001", ta="-99999", ws02="-9999"),
+            "#7777END",
+        ])
+        batch = parse_amos(text)
+        self.assertEqual(batch.tm.tolist(), [202610191000, 202610191001, 202610191002])
+        self.assertEqual(batch.row(0), {
+            "stn": "110", "observed_at": datetime(2026, 10, 19, 10, 0, tzinfo=KST),
+            "l_vis": 2000, "r_vis": None, "ta": 12.3, "ws02": 3.0, "ws02_max": 4.0,
+        })
+        self.assertEqual((batch.row(1)["ta"], batch.row(1)["ws02"]), (None, None))
+        self.assertEqual(batch.latest()["ta"], -1.5)
+        self.assertEqual(len(batch.rows()), 3)
+
+    def test_duplicate_time_keeps_later_line(self):
+        batch = parse_amos("\n".join([_amos_line("202610191000", ta="100"), _amos_line("202610191000", ta="200")]))
+        self.assertEqual(len(batch), 1)
+        self.assertEqual(batch.latest()["ta"], 20.0)
+
+    def test_empty(self):
+        batch = parse_amos("# nothing\n")
+        self.assertEqual(len(batch), 0)
+        self.assertIsNone(batch.latest())
+
+
+def _raw(flight_date, std, flight_no="KE1201", etd="", status="", ufid=None):
+    # 공공데이터 항공편 현황 원본 한 행 (김포 → 제주)
+    return {"FLIGHT_DATE": flight_date, "STD": std, "ETD": etd, "AIR_FLN": flight_no, "AIRLINE_KOREAN": "대한항공",
+            "BOARDING_KOR": "김포", "ARRIVED_KOR": "제주", "RMK_KOR": status,
+            "UFID": ufid if ufid is not None else f"{flight_date}GMPCJU{flight_no}"}
+
+
+def _snapshot(flight_date="20261019", std="1000", flight_no="KE1201", **kw):
+    fields = {"airport_code": "GMP", "kind": "dep", "airline": "대한항공", "origin": "김포", "destination": "제주",
+              "ufid": f"{flight_date}GMPCJU{flight_no}", **kw}
+    return FlightSnapshot.objects.create(flight_date=flight_date, std=std, flight_no=flight_no, **fields)
+
+
+class TierWindowTests(SimpleTestCase):
+    def test_near_spans_midnight(self):
+        self.assertEqual(tier_windows("near", _local(2026, 10, 19, 23, 10)), [
+            ("20261019", "1710", "2400"),
+            ("20261020", "0000", "0110"),
+        ])
+        # 자정 직후에는 어제 늦은 편(지연 대기)까지
+        self.assertEqual(tier_windows("near", _local(2026, 10, 20, 0, 10)), [
+            ("20261019", "1810", "2400"),
+            ("20261020", "0000", "0210"),
+        ])
+        self.assertEqual(tier_windows("near", _local(2026, 10, 19, 12, 0, 30)), [("20261019", "0600", "1400")])
+
+    def test_today_and_future(self):
+        self.assertEqual(tier_windows("today", _local(2026, 10, 19, 12, 0)), [("20261019", "1400", "2400")])
+        self.assertEqual(tier_windows("today", _local(2026, 10, 19, 23, 10)), [])
+        future = tier_windows("future", _local(2026, 10, 31, 12, 0))
+        self.assertEqual(len(future), 7)
+        self.assertEqual(future[0], ("20261101", "0000", "2400"))
+        with self.assertRaises(ValueError):
+            tier_windows("later")
+
+
+class DayPagesTests(SimpleTestCase):
+    # per_page=2, FLIGHT_DATE, STD 순 정렬
+    PAGES = {
+        1: [_raw("20261018", "2300"), _raw("20261019", "0100")],
+        2: [_raw("20261019", "0500"), _raw("20261019", "0900")],
+        3: [_raw("20261019", "1200"), _raw("20261019", "1500")],
+        4: [_raw("20261019", "2000"), _raw("20261020", "0100")],
+    }
+
+    def fetch(self, page, per_page):
+        self.fetched.append(page)
+        return {"data": self.PAGES.get(page, [])}
+
+    def setUp(self):
+        self.fetched = []
+        patcher = mock.patch.object(airline, "_fetch", side_effect=self.fetch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_whole_day(self):
+        list(airline._day_pages("20261019", 2, 2))
+        self.assertEqual(self.fetched, [2, 1, 3, 4])
+
+    def test_stops_outside_std_window(self):
+        list(airline._day_pages("20261019", 2, 2, std_from="0600", std_to="1300"))
+        self.assertEqual(self.fetched, [2, 3])
+
+    def test_iter_flights_keeps_only_target_date(self):
+        with mock.patch.object(airline, "find_page_for_date", return_value=2):
+            rows = list(airline.iter_flights_for_date(datetime(2026, 10, 19).date(), per_page=2))
+        self.assertEqual([r["STD"] for r in rows], ["0500", "0900", "0100", "1200", "1500", "2000"])
+
+    def test_std_out_of_order_falls_back_to_date_bound(self):
+        # 페이지 3에서 STD가 거꾸로 감(1000 → 0300) → STD로 멈췄던 앞쪽도 날짜 기준으로 다시 받아 0700을 놓치지 않음
+        self.PAGES = {
+            1: [_raw("20261019", "0700"), _raw("20261019", "1400")],
+            2: [_raw("20261019", "0500"), _raw("20261019", "1000")],
+            3: [_raw("20261019", "0300"), _raw("20261019", "1100")],
+            4: [_raw("20261019", "0800"), _raw("20261020", "0100")],
+        }
+        with mock.patch.object(airline, "find_page_for_date", return_value=2):
+            rows = list(airline.iter_flights_for_date(datetime(2026, 10, 19).date(), per_page=2,
+                                                      std_from="0600", std_to="1300"))
+        self.assertEqual(self.fetched, [2, 3, 4, 1])
+        self.assertIn("0700", [r["STD"] for r in rows])
+
+    def test_std_out_of_order_on_first_page(self):
+        self.PAGES = {**self.PAGES, 2: [_raw("20261019", "0900"), _raw("20261019", "0500")]}
+        list(airline._day_pages("20261019", 2, 2, std_from="0600", std_to="0700"))
+        self.assertEqual(self.fetched, [2, 1, 3, 4])
+
+
+class NearRowsTests(TestCase):
+    NOW = _local(2026, 10, 19, 10, 0)
+
+    def rows(self, *raws):
+        return airline.split_board(raws, "20261019", {"GMP": "김포"})
+
+    def test_pick_rows(self):
+        _snapshot(std="0600", flight_no="KE1", status="지연")
+        _snapshot(std="0700", flight_no="KE2", status="출발")
+        rows = self.rows(
+            _raw("20261019", "0600", "KE1", status="출발"),    # 저장된 상태가 최종이 아님 → 이번에 출발로 바뀐 것도 반영
+            _raw("20261019", "0700", "KE2", status="출발"),    # 이미 출발 → 제외
+            _raw("20261019", "0800", "KE3", etd="1005"),      # STD는 지났지만 ETD가 구간 안
+            _raw("20261019", "0820", "KE4", etd="0900"),      # ETD도 지남 → 제외
+            _raw("20261019", "0930", "KE5"),                  # 30분 전까지는 포함
+            _raw("20261019", "1159", "KE6"),
+            _raw("20261019", "1200", "KE7"),                  # 2시간 뒤부터는 today 단계
+        )
+        picked = near_rows(rows, "20261019", self.NOW)
+        self.assertEqual([r["flight_no"] for r in picked], ["KE1", "KE3", "KE5", "KE6"])
+
+    def test_etd_past_midnight(self):
+        rows = airline.split_board([_raw("20261019", "2330", etd="0015")], "20261019", {"GMP": "김포"})
+        self.assertEqual(len(near_rows(rows, "20261019", _local(2026, 10, 20, 0, 5))), 1)
+
+    def test_sync_tier_filters_window(self):
+        feed = {
+            "20261019": [_raw("20261019", "0300", "KE1"), _raw("20261019", "0945", "KE2"), _raw("20261019", "1300", "KE3")],
+        }
+        with mock.patch("dashboard.flight_sync.iter_flights_for_date",
+                        side_effect=lambda target, **kw: feed.get(target.strftime("%Y%m%d"), [])) as it:
+            counts = sync_tier("near", self.NOW)
+        self.assertEqual(it.call_args.kwargs, {"std_from": "0400", "std_to": "1200"})
+        # 김포 출발 + 제주 도착 두 행
+        self.assertEqual((counts["dates"], counts["created"]), (["20261019"], 2))
+        self.assertEqual(set(FlightSnapshot.objects.values_list("flight_no", "airport_code", "kind")),
+                         {("KE2", "GMP", "dep"), ("KE2", "CJU", "arr")})
+
+
+@mock.patch("dashboard.retention.PAUSE", 0)
+class PruneFlightsTests(TestCase):
+    def setUp(self):
+        for i in range(7):
+            _snapshot("20261010", std=f"{i:02d}00", flight_no=f"KE{i}")
+        _snapshot("20261012")
+        _snapshot("20261018")
+        _snapshot("20261201")
+
+    def remaining(self):
+        return sorted(set(FlightSnapshot.objects.values_list("flight_date", flat=True)))
+
+    @mock.patch("dashboard.retention.archive_before", return_value=(0, []))
+    def test_batches_and_archive(self, _):
+        with mock.patch.object(retention, "_delete_ids", wraps=retention._delete_ids) as d:
+            out = retention.prune_flights("20261015", max_date="20261120", archive=True, batch=3)
+        self.assertEqual([len(c.args[1]) for c in d.call_args_list], [3, 3, 2, 1])
+        self.assertEqual((out["archived"], out["deleted"], out["future_deleted"]), (8, 8, 1))
+        self.assertEqual(FlightArchive.objects.count(), 8)
+        self.assertEqual(self.remaining(), ["20261018"])
+
+        # 같은 편이 다시 들어와 지워져도 보관은 한 번만
+        _snapshot("20261010", std="0000", flight_no="KE0")
+        out = retention.prune_flights("20261015", archive=True, batch=3)
+        self.assertEqual((out["archived"], out["deleted"]), (0, 1))
+
+    @mock.patch("dashboard.retention.archive_before", return_value=(7, ["20261012"]))
+    def test_parquet_failure_keeps_that_day(self, _):
+        with self.assertLogs("dashboard.retention", "WARNING"):
+            out = retention.prune_flights("20261015", batch=3)
+        self.assertEqual(out["parquet_failed"], ["20261012"])
+        self.assertEqual(out["deleted"], 7)
+        self.assertEqual(self.remaining(), ["20261012", "20261018", "20261201"])
+
+
+class FlightArchiveTests(TestCase):
+    def setUp(self):
+        append_observations([
+            {"airport_code": "GMP", "stn": "110", "observed_at": _local(2026, 10, 10, 9, 30),
+             "ta": 12.5, "ws02": 3.0, "ws02_max": 4.0, "l_vis": 2000, "r_vis": 1800},
+        ])
+
+    def test_build_day_weather_and_bad_std(self):
+        _snapshot("20261010", std="1000", flight_no="KE1")
+        _snapshot("20261010", std="1200", flight_no="KE2")          # 직전 관측이 60분 넘게 전
+        _snapshot("20261010", std="2400", flight_no="KE3")          # 파싱 안 되는 std → 날씨 없이 보관
+        _snapshot("20261010", std="1000", flight_no="JL1", kind="arr", origin="도쿄")   # 해외 출발
+
+        rows = {r["flight_no"]: r for r in flight_archive.build_day("20261010")}
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows["KE1"]["dep_airport"], "GMP")
+        self.assertEqual(rows["KE1"]["weather_observed_at"], _local(2026, 10, 10, 9, 30))
+        self.assertEqual((rows["KE1"]["ta"], rows["KE1"]["l_vis"]), (12.5, 2000))
+        self.assertIsNone(rows["KE2"]["ta"])
+        self.assertEqual((rows["KE3"]["std"], rows["KE3"]["ta"]), ("2400", None))
+        self.assertIsNone(rows["JL1"]["dep_airport"])
+        self.assertEqual(flight_archive.build_day("20261011"), [])
+
+    def test_failed_day_is_reported_and_others_written(self):
+        for d in ("20261010", "20261011", "20261012"):
+            _snapshot(d)
+
+        def write_day(d):
+            if d == "20261011":
+                raise OSError("disk full")
+            return 1
+
+        with mock.patch.object(flight_archive, "parquet_available", return_value=True), \
+                mock.patch.object(flight_archive, "archived_dates", return_value={"20261010"}), \
+                mock.patch.object(flight_archive, "write_day", side_effect=write_day) as w, \
+                self.assertLogs("dashboard.flight_archive", "WARNING"):
+            self.assertEqual(flight_archive.archive_before("20261015"), (1, ["20261011"]))
+        self.assertEqual([c.args[0] for c in w.call_args_list], ["20261011", "20261012"])
+
+
+class FlightSnapshotKeyTests(TestCase):
+    def rows(self, *raws):
+        return airline.split_board(raws, "20261019", {"GMP": "김포"})
+
+    def test_with_delay(self):
+        _snapshot(std="2350", etd="0020", flight_no="KE1")
+        _snapshot(std="1000", etd="0950", flight_no="KE2")
+        _snapshot(std="1000", flight_no="KE3")
+        delays = dict(FlightSnapshot.objects.with_delay().values_list("flight_no", "delay_minutes"))
+        self.assertEqual(delays, {"KE1": 30, "KE2": -10, "KE3": None})
+
+    def test_upsert_by_ufid(self):
+        row = _raw("20261019", "1000", ufid="U1")
+        self.assertEqual(upsert_snapshots(self.rows(row), "20261019"), (1, 0))
+        first = FlightSnapshot.objects.get().updated_at
+        self.assertEqual(upsert_snapshots(self.rows(row), "20261019"), (0, 0))
+        self.assertGreater(FlightSnapshot.objects.get().updated_at, first)
+
+        # 예정 시각이 갱신 구간 밖으로 바뀌어도 같은 UFID면 같은 행
+        moved = dict(row, STD="2330", ETD="2345", RMK_KOR="지연", GATE="12")
+        self.assertEqual(upsert_snapshots(self.rows(moved), "20261019"), (0, 1))
+        obj = FlightSnapshot.objects.get()
+        self.assertEqual((obj.ufid, obj.std, obj.etd, obj.status, obj.gate), ("U1", "2330", "2345", "지연", "12"))
+
+    def test_rows_without_ufid_use_legacy_key(self):
+        row = _raw("20261019", "1000", ufid="")
+        self.assertIsNone(self.rows(row)[0]["ufid"])
+        self.assertEqual(upsert_snapshots(self.rows(row), "20261019"), (1, 0))
+        self.assertEqual(upsert_snapshots(self.rows(row), "20261019"), (0, 0))
+        self.assertEqual(upsert_snapshots(self.rows(dict(row, RMK_KOR="결항")), "20261019"), (0, 1))
+        self.assertEqual(FlightSnapshot.objects.get().status, "결항")
+
+        # 나중에 UFID가 들어오면 그 행에 채움
+        self.assertEqual(upsert_snapshots(self.rows(dict(row, UFID="U1")), "20261019"), (0, 1))
+        self.assertEqual(FlightSnapshot.objects.get().ufid, "U1")
+
+    def test_different_ufid_on_same_legacy_key_is_another_flight(self):
+        _snapshot(std="1000", ufid="U1")
+        self.assertEqual(upsert_snapshots(self.rows(_raw("20261019", "1000", ufid="U2")), "20261019"), (1, 0))
+        self.assertEqual(sorted(FlightSnapshot.objects.values_list("ufid", flat=True)), ["U1", "U2"])
+
+
+class _JoblibClassifier:
+    # joblib으로 저장/로드되는 최소 모델 (ModelRegistry는 feature_name_ / feature_names_in_만 봄)
+    def __init__(self, features, tag=""):
+        self.feature_name_ = list(features)
+        self.tag = tag
+
+
+class _JoblibRegressor:
+    def __init__(self, features):
+        self.feature_names_in_ = np.array(features, dtype=object)
+
+
+class ModelRegistryTests(TestCase):
+    FEATURES = ["기온(°C)", "풍속_ms", "dep_hour"]
+
+    def setUp(self):
+        import joblib
+
+        self.joblib = joblib
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.clf_path = Path(tmp.name) / "clf.joblib"
+        self.reg_path = Path(tmp.name) / "reg.joblib"
+        self.writes = 0
+        self.dump(_JoblibClassifier(self.FEATURES, "v1"), _JoblibRegressor(self.FEATURES[:2]))
+
+    def dump(self, clf=None, reg=None):
+        # 같은 시각에 다시 써도 변경(mtime)이 잡히도록 쓸 때마다 1초씩 뒤로
+        self.writes += 1
+        for obj, path in ((clf, self.clf_path), (reg, self.reg_path)):
+            if obj is not None:
+                self.joblib.dump(obj, path)
+                os.utime(path, (path.stat().st_atime, path.stat().st_mtime + self.writes))
+
+    def registry(self):
+        return ModelRegistry(self.clf_path, self.reg_path, check_interval=0, backend="joblib")
+
+    def test_hot_swap_on_file_change(self):
+        registry = self.registry()
+        first = registry.get()
+        self.assertEqual((first.clf.tag, first.backend, registry.reloads), ("v1", "joblib", 0))
+        self.assertIs(registry.get(), first)
+
+        self.dump(_JoblibClassifier(self.FEATURES + ["is_weekend"], "v2"))
+        second = registry.get()
+        self.assertEqual((second.clf.tag, registry.reloads), ("v2", 1))
+        self.assertNotEqual(second.version, first.version)
+        self.assertEqual(second.clf_features[-1], "is_weekend")
+
+    def test_failed_reload_keeps_old_models(self):
+        registry = self.registry()
+        first = registry.get()
+
+        # 검사에 실패하는 새 모델 (회귀 입력 컬럼이 분류 모델에 없음)
+        self.dump(reg=_JoblibRegressor(["없는_컬럼"]))
+        self.assertIs(registry.get(), first)
+        self.assertIn("ModelValidationError", registry.last_error)
+
+        # 깨진 파일 / 교체 중에 잠깐 없는 파일
+        self.clf_path.write_bytes(b"not a pickle")
+        self.assertIs(registry.get(), first)
+        self.clf_path.unlink()
+        self.assertIs(registry.get(), first)
+        self.assertIn("FileNotFoundError", registry.last_error)
+        self.assertEqual(registry.reloads, 0)
+
+        self.dump(_JoblibClassifier(self.FEATURES, "v3"), _JoblibRegressor(self.FEATURES[:2]))
+        self.assertEqual(registry.get().clf.tag, "v3")
+        self.assertIsNone(registry.last_error)
+
+    def test_validate_features(self):
+        clf = _JoblibClassifier(self.FEATURES)
+        self.assertEqual(validate_features(clf, _JoblibRegressor(["풍속_ms"])), (tuple(self.FEATURES), ("풍속_ms",)))
+        # 회귀 모델 컬럼 정보가 없으면 분류 모델 컬럼 그대로
+        self.assertEqual(validate_features(clf, object()), (tuple(self.FEATURES), tuple(self.FEATURES)))
+        with self.assertRaises(ModelValidationError):
+            validate_features(clf, _JoblibRegressor(["풍속_ms", "없는_컬럼"]))
+        with self.assertRaises(ModelValidationError):
+            validate_features(_JoblibClassifier([]), _JoblibRegressor(["풍속_ms"]))
+
+        # 처음 로드부터 검사에 실패하면 예외 그대로
+        self.dump(reg=_JoblibRegressor(["없는_컬럼"]))
+        with self.assertRaises(ModelValidationError):
+            self.registry().get()
+
+    def test_health_endpoint(self):
+        registry = self.registry()
+        with mock.patch("dashboard.delay.model_registry", return_value=registry):
+            res = self.client.get("/api/model/health/")
+            self.assertEqual(res.status_code, 200)
+            self.assertFalse(res.json()["loaded"])
+
+            res = self.client.get("/api/model/health/?load=1")
+            self.assertEqual(res.status_code, 200)
+            body = res.json()
+            self.assertTrue(body["loaded"])
+            self.assertEqual((body["backend"], body["features"]), ("joblib", self.FEATURES))
+            self.assertEqual(body["version"], registry.get().version)
+
+        broken = ModelRegistry(self.clf_path.with_name("missing.joblib"), self.reg_path, backend="joblib")
+        with mock.patch("dashboard.delay.model_registry", return_value=broken):
+            res = self.client.get("/api/model/health/?load=1")
+        self.assertEqual(res.status_code, 503)
+        self.assertFalse(res.json()["loaded"])
+        self.assertIn("FileNotFoundError", res.json()["last_error"])
+
+
+@mock.patch.dict("os.environ", {"KEY": "x"})
+class SyncWeatherTests(TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def fetch_amos(self, stn, key, dtm=10, session=None, timeout=None):
+        if stn == "113":           # ICN: 응답이 마감을 넘김
+            self.release.wait(30)
+            raise TimeoutError
+        if stn == "182":           # CJU: 연결 실패
+            raise ConnectionError("refused")
+        return parse_amos("\n".join(_amos_line(f"20261019100{i}", stn=stn) for i in range(3)))
+
+    def sync(self):
+        out, err = io.StringIO(), io.StringIO()
+        t0 = time.monotonic()
+        with mock.patch("dashboard.management.commands.sync_weather.fetch_amos", side_effect=self.fetch_amos):
+            call_command("sync_weather", only="ICN,GMP,CJU,PUS", deadline=0.5, stdout=out, stderr=err)
+        return time.monotonic() - t0, err.getvalue()
+
+    def test_deadline_partial_commit_and_counters(self):
+        elapsed, err = self.sync()
+        # 느린 지점을 기다리지 않고 마감에 맞춰 끝남
+        self.assertLess(elapsed, 3)
+        self.assertIn("[ICN] failed: deadline 0.5s", err)
+        self.assertIn("[CJU] failed: ConnectionError", err)
+
+        # 받은 지점만 반영
+        self.assertEqual(list(WeatherCurrent.objects.values_list("airport_code", flat=True)), ["GMP"])
+        self.assertEqual(WeatherSnapshot.objects.filter(airport_code="GMP").count(), 3)
+        self.assertEqual(WeatherCurrent.objects.get().observed_at, _local(2026, 10, 19, 10, 2))
+
+        status = {s.airport_code: s for s in StationSyncStatus.objects.all()}
+        self.assertEqual(set(status), {"ICN", "GMP", "CJU"})
+        gmp, icn = status["GMP"], status["ICN"]
+        self.assertEqual((gmp.success_count, gmp.consecutive_failures, gmp.last_rows, gmp.last_error), (1, 0, 3, ""))
+        self.assertIsNotNone(gmp.last_latency_ms)
+        self.assertEqual((icn.failure_count, icn.consecutive_failures, icn.last_error), (1, 1, "deadline 0.5s"))
+        self.assertIsNone(icn.last_success_at)
+
+        self.release.set()
+        self.sync()
+        cju = StationSyncStatus.objects.get(airport_code="CJU")
+        self.assertEqual((cju.failure_count, cju.consecutive_failures, cju.last_error), (2, 2, "ConnectionError"))
+        self.assertEqual(StationSyncStatus.objects.get(airport_code="GMP").success_count, 2)
+        self.assertEqual(WeatherSnapshot.objects.filter(airport_code="GMP").count(), 3)
+
+
+class SchedulerTests(TestCase):
+    def setUp(self):
+        self.logs = []
+        self.scheduler = Scheduler([], log=self.logs.append)
+        self.addCleanup(self.scheduler._pool.shutdown)
+
+    def test_overlap_is_skipped_and_counted(self):
+        job = Job(name="sync_weather", interval=300)
+        with mock.patch("dashboard.scheduler.call_command"):
+            self.assertTrue(self.scheduler.run_job(job))
+
+        # 이전 실행이 아직 잡고 있는 동안에는 실행도 제출도 하지 않음
+        job.lock.acquire()
+        self.addCleanup(job.lock.release)
+        self.scheduler.jobs = [job]
+        with mock.patch("dashboard.scheduler.call_command") as cmd, \
+                mock.patch.object(self.scheduler._pool, "submit") as submit:
+            self.assertFalse(self.scheduler.run_job(job))
+            self.scheduler._submit_due()
+        cmd.assert_not_called()
+        submit.assert_not_called()
+
+        status = SyncJobStatus.objects.get(name="sync_weather")
+        self.assertEqual((status.runs, status.skipped_overlaps), (1, 2))
+        self.assertIn("[sync_weather] still running, skipped", self.logs)
+        self.assertGreater(job.next_run, 0)
+
+    def test_system_exit_is_recorded_as_failure(self):
+        job = Job(name="sync_weather", interval=300)
+        with mock.patch("dashboard.scheduler.call_command", side_effect=SystemExit("KEY not set")):
+            self.assertFalse(self.scheduler.run_job(job))
+        # 데몬은 계속 돌고, 잠금은 풀려 있음
+        self.assertFalse(job.lock.locked())
+        status = SyncJobStatus.objects.get(name="sync_weather")
+        self.assertEqual((status.runs, status.failures, status.running), (1, 1, False))
+        self.assertEqual(status.last_error, "SystemExit: KEY not set")
+        self.assertIsNone(status.last_success_at)
+
+    def test_job_health_stale(self):
+        now = timezone.now()
+        SyncJobStatus.objects.create(name="fresh", interval_seconds=300, last_success_at=now - timedelta(seconds=599))
+        SyncJobStatus.objects.create(name="old", interval_seconds=300, last_success_at=now - timedelta(seconds=601))
+        SyncJobStatus.objects.create(name="never", interval_seconds=300)
+        stale = {j["name"]: j["stale"] for j in job_health(now)}
+        self.assertEqual(stale, {"fresh": False, "old": True, "never": True})
+
+    def test_sync_health_endpoint(self):
+        # 작업 기록이 없으면 스케줄러가 안 도는 것으로 봄
+        res = self.client.get("/api/sync/health/")
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(res.json(), {"ok": False, "jobs": []})
+
+        status = SyncJobStatus.objects.create(name="sync_weather", interval_seconds=300, last_success_at=timezone.now())
+        res = self.client.get("/api/sync/health/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([j["name"] for j in res.json()["jobs"]], ["sync_weather"])
+
+        status.last_success_at = timezone.now() - timedelta(hours=1)
+        status.save()
+        res = self.client.get("/api/sync/health/")
+        self.assertEqual(res.status_code, 503)
+        self.assertTrue(res.json()["jobs"][0]["stale"])
+
+    def test_run_once_fails_when_a_job_fails(self):
+        def command(name, **kw):
+            if name == "prune_weather":
+                raise RuntimeError("disk full")
+
+        out = io.StringIO()
+        with mock.patch("dashboard.scheduler.call_command", side_effect=command):
+            call_command("run_scheduler", once=True, only="sync_weather", stdout=out)
+            self.assertIn("Scheduler run done: 1 jobs", out.getvalue())
+            with self.assertRaisesMessage(CommandError, "1/2 jobs failed: prune_weather"):
+                call_command("run_scheduler", once=True, only="sync_weather,prune_weather", stdout=out)
+        self.assertEqual(SyncJobStatus.objects.get(name="prune_weather").failures, 1)
@@ -1,29 +1,15 @@
 from django.shortcuts import render
 
 # Create your views here.
-import os
-import requests
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET
 from django.utils import timezone
 from django.db.models import Max
 from dashboard.models import FlightSnapshot
-from .models import WeatherSnapshot
 from dashboard.models import WeatherCurrent
 
 
-AMOS_URL = "https://apihub.kma.go.kr/api/typ01/url/amos.php"
-
-# 공항 stn -> 이름
-AIRPORTS = { # 데이터는 7개소 공항만 존재(김해|부산은 X)
-    "113": "인천공항",
-    "110": "김포공항",
-    "182": "제주공항",
-    "163": "무안공항",
-    "151": "울산공항",
-    "167": "여수공항",
-    "92":  "양양공항",
-}
+# 공항 stn -> 이름은 dashboard/airports.py airport_by_stn(stn).name
 
 def _last_updated_kst():
     dt = FlightSnapshot.objects.aggregate(Max("updated_at"))["updated_at__max"]
@@ -31,62 +17,6 @@ def _last_updated_kst():
         return None
     return timezone.localtime(dt).strftime("%Y-%m-%d %H:%M:%S")
 
-def _parse_latest_amos_row(text: str) -> dict:
-    """
-    AMOS 응답에서 가장 마지막 데이터 1줄을 파싱해서
-    TA, WS02, WS02_MAX, L_VIS, R_VIS만 추출.
-    결측(-99999 등)은 None 처리.
-    단위: TA/WS02/WS02_MAX는 0.1 단위 → /10.0
-    """
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    data_lines = [ln for ln in lines if not ln.startswith("#")]
-    if not data_lines:
-        return {"error": "no data"}
-
-    cols = data_lines[-1].split()
-
-    # 헤더 기준 컬럼 순서:
-    # STN TM L_VIS R_VIS L_RVR R_RVR CH_MIN TA TD HM PS PA RN 예비1 예비2 WD02 WD02_MAX WD02_MIN WS02 WS02_MAX WS02_MIN ...
-    # 필요한 위치만 뽑기 (인덱스 주의!)
-    # 0:STN 1:TM 2:L_VIS 3:R_VIS ... 7:TA ... 18:WS02 19:WS02_MAX
-    def to_int(v):
-        try:
-            return int(v)
-        except:
-            return None
-
-    def clean_missing(v_int):
-        if v_int is None:
-            return None
-        if v_int in (-99999, -9999, 99999):
-            return None
-        return v_int
-
-    stn = cols[0]
-    tm = cols[1]
-
-    L_VIS = clean_missing(to_int(cols[2]))
-    R_VIS = clean_missing(to_int(cols[3]))
-
-    TA_raw = clean_missing(to_int(cols[7]))
-    TA = None if TA_raw is None else TA_raw / 10.0
-
-    WS02_raw = clean_missing(to_int(cols[18]))
-    WS02 = None if WS02_raw is None else WS02_raw / 10.0
-
-    WS02_MAX_raw = clean_missing(to_int(cols[19]))
-    WS02_MAX = None if WS02_MAX_raw is None else WS02_MAX_raw / 10.0
-
-    return {
-        "STN": stn,
-        "TM": tm,
-        "TA": TA,
-        "WS02": WS02,
-        "WS02_MAX": WS02_MAX,
-        "L_VIS": L_VIS,
-        "R_VIS": R_VIS,
-    }
-
 def dashboard_view(request):
     return render(request,"dashboard.html")
 
@@ -95,14 +25,11 @@ from django.http import JsonResponse
 from django.views.decorators.http import require_GET
 from .airline import get_board
 
-@require_GET
-def api_departures(request):
-    airport = request.GET.get("airport", "ICN")
-    limit = int(request.GET.get("limit", "5"))
+def _upcoming_departures(airport: str, limit: int):
     today = timezone.localdate().strftime("%Y%m%d")
     now_hhmm = timezone.localtime().strftime("%H%M")
 
-    qs = (
+    return (
         FlightSnapshot.objects
         .filter(
             airport_code=airport,
@@ -113,14 +40,77 @@ def api_departures(request):
         .order_by("std")[:limit]
     )
 
+@require_GET
+def api_departures(request):
+    airport = request.GET.get("airport", "ICN")
+    limit = int(request.GET.get("limit", "5"))
+    qs = _upcoming_departures(airport, limit)
+
     return JsonResponse({
         "airport": airport,
         "last_updated": _last_updated_kst(),
         "departures": list(qs.values(
-            "airline", "destination", "flight_no", "std", "status"
+            "airline", "destination", "flight_no", "std", "etd", "gate", "status",
+            "delay_prob", "predicted_delay_minutes",
         )),
     })
 
+@require_GET
+def api_departures_delay(request):
+    """출발 현황판 + 편별 지연 확률/예상 지연(분). 현황판 전체를 한 번에 배치 예측"""
+    from .delay import predict_flights
+
+    airport = request.GET.get("airport", "ICN")
+    limit = int(request.GET.get("limit", "5"))
+    threshold = float(request.GET.get("threshold", "0.4"))
+
+    rows = list(_upcoming_departures(airport, limit).values(
+        "airport_code", "flight_date", "airline", "destination", "flight_no", "std", "status"
+    ))
+    preds = predict_flights(rows, threshold=threshold)
+
+    departures = []
+    for row, pred in zip(rows, preds):
+        departures.append({
+            "airline": row["airline"],
+            "destination": row["destination"],
+            "flight_no": row["flight_no"],
+            "std": row["std"],
+            "status": row["status"],
+            "delay_prob": pred.get("delay_prob"),
+            "is_delay": pred.get("is_delay"),
+            "predicted_delay_minutes": pred.get("predicted_delay_minutes"),
+        })
+
+    return JsonResponse({
+        "airport": airport,
+        "last_updated": _last_updated_kst(),
+        "threshold": threshold,
+        "departures": departures,
+    })
+
+@require_GET
+def api_model_health(request):
+    """지연 예측 모델 버전/로드 시각. ?load=1 이면 아직 안 올라간 경우 로드까지"""
+    from .delay import model_registry
+
+    registry = model_registry()
+    if request.GET.get("load") == "1":
+        try:
+            registry.get()
+        except Exception as e:
+            return JsonResponse({**registry.health(), "last_error": f"{type(e).__name__}: {e}"}, status=503)
+    return JsonResponse(registry.health())
+
+@require_GET
+def api_sync_health(request):
+    """run_scheduler 작업별 마지막 실행/소요시간. stale(주기 2배 넘게 성공 없음)인 작업이 있으면 503"""
+    from .scheduler import job_health
+
+    jobs = job_health()
+    ok = bool(jobs) and not any(j["stale"] for j in jobs)
+    return JsonResponse({"ok": ok, "jobs": jobs}, status=200 if ok else 503)
+
 @require_GET
 def api_arrivals(request):
     airport = request.GET.get("airport", "ICN")
@@ -143,7 +133,8 @@ def api_arrivals(request):
         "airport": airport,
         "last_updated": _last_updated_kst(),
         "arrivals": list(qs.values(
-            "airline", "origin", "flight_no", "std", "status"
+            "airline", "origin", "flight_no", "std", "etd", "status",
+            "delay_prob", "predicted_delay_minutes",
         )),
     })
 
@@ -169,6 +160,40 @@ def api_airport_weather_simple(request):
         "updated_at": obj.updated_at.isoformat(),
     })
 
+@require_GET
+def api_weather_history(request):
+    """
+    공항별 관측 이력. ?airport=ICN&start=2026-10-18T00:00&end=2026-10-19T00:00&resolution=auto|raw|10m|1h
+    start/end 없으면 최근 24시간, auto는 기간/보관 단계에 맞춰 raw·10분·1시간 중 선택
+    """
+    from datetime import datetime, timedelta
+    from .weather_history import history
+
+    airport = request.GET.get("airport", "ICN").upper()
+    resolution = request.GET.get("resolution", "auto")
+
+    def parse(v):
+        dt = datetime.fromisoformat(v)
+        return timezone.make_aware(dt) if timezone.is_naive(dt) else dt
+
+    try:
+        end = parse(request.GET["end"]) if request.GET.get("end") else timezone.now()
+        start = parse(request.GET["start"]) if request.GET.get("start") else end - timedelta(days=1)
+        if start >= end:
+            raise ValueError("start must be before end")
+        resolution, rows = history(airport, start, end, resolution)
+    except ValueError as e:
+        return JsonResponse({"error": "bad_request", "detail": str(e)}, status=400)
+
+    return JsonResponse({
+        "airport": airport,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "resolution": resolution,
+        "count": len(rows),
+        "rows": rows,
+    })
+
 @require_GET
 def api_weather(request):
     airport = request.GET.get("airport", "ICN").upper()
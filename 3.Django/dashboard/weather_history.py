@@ -0,0 +1,246 @@
+import os
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import WeatherAggregate, WeatherSnapshot
+
+# AMOS 관측 이력 보관 단계
+#  - raw(1분)  : RAW_DAYS일
+#  - 10m       : TENMIN_DAYS일 (raw가 보관기간 지나면 10분 집계로 옮김)
+#  - 1h        : HOURLY_DAYS일 (10m이 보관기간 지나면 1시간 집계로 옮김, 0이면 계속 보관)
+RAW_DAYS = int(os.getenv("WEATHER_RAW_DAYS", "7"))
+TENMIN_DAYS = int(os.getenv("WEATHER_10M_DAYS", "90"))
+HOURLY_DAYS = int(os.getenv("WEATHER_1H_DAYS", "730"))
+
+STEPS = {"10m": 10, "1h": 60}          # 집계 단위(분)
+SOURCE = {"10m": "raw", "1h": "10m"}   # 어떤 단계에서 만들어지는지
+MAX_POINTS = 5000                      # 조회 API 한 번에 돌려주는 최대 행 수
+
+SNAPSHOT_FIELDS = ("stn", "observed_at", "ta", "ws02", "ws02_max", "l_vis", "r_vis")
+AGG_FIELDS = ("samples", "ta_avg", "ta_min", "ta_max", "ws02_avg", "ws02_max", "l_vis_min", "r_vis_min")
+
+
+def append_observations(rows: list[dict]) -> int:
+    """
+    [{"airport_code", "stn", "observed_at", "ta", ...}, ...] → WeatherSnapshot에 한 번에 추가.
+    이미 있는 (공항, 관측시각)은 건너뜀. 새로 들어간 행 수 반환
+    """
+    if not rows:
+        return 0
+
+    existing = set()
+    by_airport: dict[str, list] = {}
+    for r in rows:
+        by_airport.setdefault(r["airport_code"], []).append(r["observed_at"])
+    for airport, times in by_airport.items():
+        existing.update(
+            (airport, t) for t in WeatherSnapshot.objects
+            .filter(airport_code=airport, observed_at__gte=min(times), observed_at__lte=max(times))
+            .values_list("observed_at", flat=True)
+        )
+
+    new = []
+    seen = set()
+    for r in rows:
+        key = (r["airport_code"], r["observed_at"])
+        if key in existing or key in seen:
+            continue
+        seen.add(key)
+        new.append(WeatherSnapshot(airport_code=r["airport_code"], **{f: r.get(f) for f in SNAPSHOT_FIELDS}))
+
+    # 동시에 다른 sync가 같은 행을 넣었을 수 있음 → 충돌은 무시
+    WeatherSnapshot.objects.bulk_create(new, batch_size=500, ignore_conflicts=True)
+    return len(new)
+
+
+def floor_time(dt, minutes: int):
+    dt = timezone.localtime(dt).replace(second=0, microsecond=0)
+    return dt.replace(minute=dt.minute - dt.minute % minutes) if minutes < 60 else dt.replace(minute=0)
+
+
+class _Bucket:
+    # 1분 관측(또는 더 작은 단위 집계)을 모아서 평균/최소/최대 계산
+    __slots__ = ("stn", "samples", "ta_sum", "ta_n", "ta_min", "ta_max",
+                 "ws_sum", "ws_n", "ws_max", "l_vis_min", "r_vis_min")
+
+    def __init__(self, stn):
+        self.stn = stn
+        self.samples = 0
+        self.ta_sum = self.ws_sum = 0.0
+        self.ta_n = self.ws_n = 0
+        self.ta_min = self.ta_max = self.ws_max = None
+        self.l_vis_min = self.r_vis_min = None
+
+    @staticmethod
+    def _min(a, b):
+        return b if a is None else a if b is None else min(a, b)
+
+    @staticmethod
+    def _max(a, b):
+        return b if a is None else a if b is None else max(a, b)
+
+    def add(self, n, ta_avg, ta_min, ta_max, ws_avg, ws_max, l_vis, r_vis):
+        self.samples += n
+        if ta_avg is not None:
+            self.ta_sum += ta_avg * n
+            self.ta_n += n
+        if ws_avg is not None:
+            self.ws_sum += ws_avg * n
+            self.ws_n += n
+        self.ta_min = self._min(self.ta_min, ta_min)
+        self.ta_max = self._max(self.ta_max, ta_max)
+        self.ws_max = self._max(self.ws_max, ws_max)
+        self.l_vis_min = self._min(self.l_vis_min, l_vis)
+        self.r_vis_min = self._min(self.r_vis_min, r_vis)
+
+    def values(self) -> dict:
+        return {
+            "samples": self.samples,
+            "ta_avg": round(self.ta_sum / self.ta_n, 2) if self.ta_n else None,
+            "ta_min": self.ta_min,
+            "ta_max": self.ta_max,
+            "ws02_avg": round(self.ws_sum / self.ws_n, 2) if self.ws_n else None,
+            "ws02_max": self.ws_max,
+            "l_vis_min": self.l_vis_min,
+            "r_vis_min": self.r_vis_min,
+        }
+
+
+def _source_rows(source: str, cutoff):
+    # (공항, stn, 시각, 샘플 수, 기온 평균/최소/최대, 풍속 평균/최대, 시정 최소 L/R) 형태로 통일
+    if source == "raw":
+        qs = (
+            WeatherSnapshot.objects.filter(observed_at__lt=cutoff)
+            .values_list("airport_code", "stn", "observed_at", "ta", "ws02", "ws02_max", "l_vis", "r_vis")
+        )
+        for airport, stn, t, ta, ws, ws_max, l_vis, r_vis in qs.iterator(chunk_size=2000):
+            yield airport, stn, t, 1, ta, ta, ta, ws, ws_max, l_vis, r_vis
+    else:
+        qs = (
+            WeatherAggregate.objects.filter(resolution=source, bucket_start__lt=cutoff)
+            .values_list("airport_code", "stn", "bucket_start", *AGG_FIELDS)
+        )
+        yield from qs.iterator(chunk_size=2000)
+
+
+def rollup(target: str, cutoff) -> tuple[int, int]:
+    """
+    cutoff 이전 원본(raw 또는 10m)을 target(10m/1h) 구간으로 묶어서 저장하고 원본 삭제.
+    cutoff는 target 단위로 내림 → 구간 하나가 두 번에 나눠 집계되지 않음.
+    반환: (저장한 구간 수, 삭제한 원본 행 수)
+    """
+    step = STEPS[target]
+    source = SOURCE[target]
+    cutoff = floor_time(cutoff, step)
+
+    buckets: dict[tuple, _Bucket] = {}
+    for airport, stn, t, *vals in _source_rows(source, cutoff):
+        key = (airport, floor_time(t, step))
+        b = buckets.get(key)
+        if b is None:
+            b = buckets[key] = _Bucket(stn)
+        b.add(*vals)
+
+    if not buckets:
+        return 0, 0
+
+    # 늦게 들어온 관측 등으로 이미 있는 구간이면 기존 값과 합침
+    starts = [k[1] for k in buckets]
+    existing = (
+        WeatherAggregate.objects
+        .filter(resolution=target, bucket_start__gte=min(starts), bucket_start__lte=max(starts))
+        .values_list("airport_code", "bucket_start", *AGG_FIELDS)
+    )
+    for airport, start, *vals in existing:
+        b = buckets.get((airport, timezone.localtime(start)))
+        if b is not None:
+            b.add(*vals)
+
+    objs = [
+        WeatherAggregate(airport_code=airport, stn=b.stn, resolution=target, bucket_start=start, **b.values())
+        for (airport, start), b in buckets.items()
+    ]
+    with transaction.atomic():
+        WeatherAggregate.objects.bulk_create(
+            objs,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["airport_code", "resolution", "bucket_start"],
+            update_fields=["stn", *AGG_FIELDS],
+        )
+        if source == "raw":
+            deleted, _ = WeatherSnapshot.objects.filter(observed_at__lt=cutoff).delete()
+        else:
+            deleted, _ = WeatherAggregate.objects.filter(resolution=source, bucket_start__lt=cutoff).delete()
+    return len(objs), deleted
+
+
+def prune(now=None, raw_days=RAW_DAYS, tenmin_days=TENMIN_DAYS, hourly_days=HOURLY_DAYS) -> dict:
+    """보관 단계 전체 실행: raw → 10m → 1h → 오래된 1h 삭제"""
+    now = now or timezone.now()
+    out = {}
+    out["10m"] = rollup("10m", now - timedelta(days=raw_days))
+    out["1h"] = rollup("1h", now - timedelta(days=tenmin_days))
+    out["1h_deleted"] = 0
+    if hourly_days > 0:
+        out["1h_deleted"], _ = (
+            WeatherAggregate.objects
+            .filter(resolution="1h", bucket_start__lt=now - timedelta(days=hourly_days))
+            .delete()
+        )
+    return out
+
+
+def pick_resolution(start, end, now=None) -> str:
+    """
+    기간 길이와 시작 시점으로 조회 단위 선택.
+    원본이 이미 집계로 옮겨진 구간이면 더 굵은 단위로 (1일 이하 raw, 14일 이하 10m, 그 이상 1h)
+    """
+    now = now or timezone.now()
+    span = end - start
+    if span <= timedelta(days=1) and start >= now - timedelta(days=RAW_DAYS):
+        return "raw"
+    if span <= timedelta(days=14) and start >= now - timedelta(days=TENMIN_DAYS):
+        return "10m"
+    return "1h"
+
+
+def history(airport_code: str, start, end, resolution: str = "auto") -> tuple[str, list[dict]]:
+    """공항별 [start, end) 관측 이력. 집계 단위도 raw와 같은 키(observed_at, ta, ws02 ...)로 돌려줌"""
+    if resolution == "auto":
+        resolution = pick_resolution(start, end)
+
+    if resolution == "raw":
+        qs = (
+            WeatherSnapshot.objects
+            .filter(airport_code=airport_code, observed_at__gte=start, observed_at__lt=end)
+            .order_by("observed_at")
+            .values("observed_at", "ta", "ws02", "ws02_max", "l_vis", "r_vis")[:MAX_POINTS]
+        )
+        return resolution, [{**r, "observed_at": r["observed_at"].isoformat()} for r in qs]
+
+    if resolution not in STEPS:
+        raise ValueError(f"resolution must be auto/raw/10m/1h: {resolution}")
+
+    qs = (
+        WeatherAggregate.objects
+        .filter(airport_code=airport_code, resolution=resolution, bucket_start__gte=start, bucket_start__lt=end)
+        .order_by("bucket_start")
+        .values("bucket_start", *AGG_FIELDS)[:MAX_POINTS]
+    )
+    return resolution, [
+        {
+            "observed_at": r["bucket_start"].isoformat(),
+            "ta": r["ta_avg"],
+            "ta_min": r["ta_min"],
+            "ta_max": r["ta_max"],
+            "ws02": r["ws02_avg"],
+            "ws02_max": r["ws02_max"],
+            "l_vis": r["l_vis_min"],
+            "r_vis": r["r_vis_min"],
+            "samples": r["samples"],
+        }
+        for r in qs
+    ]
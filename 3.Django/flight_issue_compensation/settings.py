@@ -109,6 +109,24 @@ CACHES = {
     }
 }
 
+# 챗봇 LLM (Ollama) - 벤치마크 시 가짜 서버 주소로 바꿔 끼울 수 있도록 env로 받음
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://127.0.0.1:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "qwen2.5:14b")
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")  # 요청 사이에 모델이 내려가지 않도록
+
+# 서버 프로세스 시작 시 임베딩 모델/Chroma/Ollama 미리 로드 (첫 /api/chat/ 콜드스타트 방지)
+CHATBOT_WARMUP = os.getenv("CHATBOT_WARMUP", "1") == "1"
+
+# RAG 문서를 프롬프트에 넣을 때의 토큰 예산 (chatbot/llm/context_budget.py)
+RAG_CONTEXT_TOKENS = int(os.getenv("RAG_CONTEXT_TOKENS", "1200"))
+
+# 임베딩/생성 모델을 들고 있는 추론 사이드카 주소 (python manage.py run_inference_sidecar)
+# 비워두면 웹 워커마다 모델을 직접 로드함
+INFERENCE_SIDECAR_URL = os.getenv("INFERENCE_SIDECAR_URL", "")
+# HF 생성 모델(loader.py) 배치 생성기: 한 번에 같이 디코딩할 최대 요청 수 / "cpu"면 GPU 없이 실행
+HF_GENERATE_MAX_BATCH = int(os.getenv("HF_GENERATE_MAX_BATCH", "8"))
+HF_GENERATE_DEVICE = os.getenv("HF_GENERATE_DEVICE", "")
+
 
 
 # Internationalization
@@ -17,8 +17,8 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from dashboard.views import dashboard_view, api_airport_weather_simple
-from dashboard.views import api_departures, api_arrivals
-from dashboard.views import api_weather
+from dashboard.views import api_departures, api_arrivals, api_departures_delay, api_model_health, api_sync_health
+from dashboard.views import api_weather, api_weather_history
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -26,7 +26,11 @@ urlpatterns = [
     path("api/airport-weather/", api_airport_weather_simple),
     path("accounts/", include("django.contrib.auth.urls")), 
     path("api/departures/", api_departures),
+    path("api/departures/delay/", api_departures_delay),
     path("api/arrivals/", api_arrivals),
+    path("api/model/health/", api_model_health),
+    path("api/sync/health/", api_sync_health),
     path("", include("chatbot.urls")),
     path("api/weather/", api_weather),
+    path("api/weather/history/", api_weather_history),
 ]